@@ -1,6 +1,7 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, g, render_template, request, jsonify, send_file, stream_with_context
 import sys
 import os
+import time
 import datetime
 import markdown
 
@@ -10,18 +11,110 @@ ENGINE_DIR = os.path.join(BASE_DIR, 'astro_probability_engine')
 sys.path.append(BASE_DIR)
 sys.path.append(ENGINE_DIR)
 
-from astro_probability_engine.astrology.real_service import SkyfieldAstrologyService
+from astro_probability_engine.astrology.factory import create_service
 from astro_probability_engine.engine.generator import MatrixGenerator
 from astro_probability_engine.engine.analyzer import MatrixAnalyzer
 from astro_probability_engine.engine.interpreter import AstrologicalInterpreter
+from astro_probability_engine.engine.transit_snapshot import TransitSnapshot
+from astro_probability_engine.engine.transit_calendar import TransitCalendar
+from astro_probability_engine.engine.panchang import NAMES as PANCHANG_NAMES, PanchangCalendar
+from astro_probability_engine.engine.feature_table import FeatureTable, QueryError, date_features
+from astro_probability_engine.engine.similarity import TwinIndex
+from astro_probability_engine.engine.percentiles import PercentileTable
+from astro_probability_engine.engine.batch import BatchInputError, BatchReportRunner, parse_batch_payload, to_ndjson
+from astro_probability_engine.engine.gazetteer import default_gazetteer
+# Same import path as the engine modules, so the app shares their caches and metrics registry
+from astrology.bav_rules import BAVCalculator
+from astrology.ayanamsa import AYANAMSAS, ayanamsa_degrees, resolve
+from astrology.analytic_ephemeris import julian_day
+from config import DATES_MAX_LIMIT, PLACES_MAX_LIMIT, TRANSIT_CALENDAR_MAX_DAYS, TWIN_MAX_K
+from utils import metrics
+from utils.profiling import profiler
+from utils.time_utils import local_to_utc, zone
 
 app = Flask(__name__)
 
 # Initialize engine services once
-service = SkyfieldAstrologyService()
+service = create_service()
 generator = MatrixGenerator(service)
-analyzer = MatrixAnalyzer()
+transit_snapshot = TransitSnapshot(service)
+analyzer = MatrixAnalyzer(transit_provider=transit_snapshot, percentiles=PercentileTable.load())
 interpreter = AstrologicalInterpreter()
+batch_runner = BatchReportRunner(generator, analyzer)
+transit_calendar = TransitCalendar(service)
+panchang = PanchangCalendar(service)
+feature_table = None # Loaded on first query
+twin_index = None
+
+def load_feature_table():
+    """The precomputed feature table (current-version years only), or None until tools/build_feature_table.py has run."""
+    global feature_table
+    if feature_table is None:
+        table = FeatureTable()
+        if not table.years:
+            return None
+        feature_table = table
+    return feature_table
+
+def bav_cache_metrics():
+    stats = []
+    for cache_name, info in BAVCalculator.cache_info().items():
+        stats.append(("astro_cache_hits_total", {"cache": cache_name}, info.hits))
+        stats.append(("astro_cache_misses_total", {"cache": cache_name}, info.misses))
+    return stats
+
+metrics.registry.register_collector(bav_cache_metrics)
+
+def tropical_cache_metrics():
+    if not hasattr(service, "cache_info"):
+        return []
+    info = service.cache_info()
+    return [
+        ("astro_cache_hits_total", {"cache": "tropical"}, info.hits),
+        ("astro_cache_misses_total", {"cache": "tropical"}, info.misses)
+    ]
+
+metrics.registry.register_collector(tropical_cache_metrics)
+
+def narrative_cache_metrics():
+    info = analyzer.interpreter.cache_info()
+    return [
+        ("astro_cache_hits_total", {"cache": "narrative_sections"}, info.hits),
+        ("astro_cache_misses_total", {"cache": "narrative_sections"}, info.misses)
+    ]
+
+metrics.registry.register_collector(narrative_cache_metrics)
+
+UNTIMED_ENDPOINTS = ('metrics_endpoint', 'static', 'download_profile')
+
+@app.before_request
+def start_request_metrics():
+    if request.endpoint in UNTIMED_ENDPOINTS:
+        return
+    g.request_started = time.perf_counter()
+    metrics.begin_timings()
+    metrics.registry.add_gauge("astro_requests_in_flight", 1)
+    g.profile = profiler.maybe_start(request.headers)
+
+@app.after_request
+def add_server_timing(response):
+    if 'request_started' in g:
+        timings = metrics.end_timings()
+        timings["total"] = time.perf_counter() - g.request_started
+        response.headers['Server-Timing'] = metrics.server_timing_header(timings)
+    if g.get('profile'):
+        response.headers['X-Profile-Id'] = g.profile.id
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    if 'request_started' in g:
+        metrics.end_timings()  # No-op unless after_request was skipped by an error
+        metrics.registry.add_gauge("astro_requests_in_flight", -1)
+        metrics.registry.flush()
+    if g.get('profile'):
+        # Runs after a streamed body is fully sent, so batch work is covered
+        profiler.finish(g.profile)
 
 def convert_narrative_to_markdown(narrative, dob, sample_count):
     """
@@ -171,36 +264,75 @@ def calculate_numerology(dob):
         "destiny_reduced": destiny_reward
     }
 
+def birth_matrix(data, dob, ayanamsa):
+    """
+    Exact birth time mode: the one birth chart when `data` has a local
+    `time` (HH:MM) with `lat`/`lon` and an optional IANA `tz`, or a `place`
+    name from the gazetteer (which also gives the default tz); None when it
+    has no time, for the matrix of the whole date.
+    """
+    time_str = data.get('time')
+    if not time_str:
+        return None
+    birth_time = datetime.datetime.strptime(time_str, '%H:%M:%S' if time_str.count(':') == 2 else '%H:%M').time()
+    tz = data.get('tz') or None
+    if data.get('lat') not in (None, '') and data.get('lon') not in (None, ''):  # 0 is a valid coordinate
+        lat, lon = float(data['lat']), float(data['lon'])
+    elif data.get('place'):
+        place = default_gazetteer().lookup(data['place'])
+        if not place:
+            raise ValueError(f"Unknown place: {data['place']}")
+        lat, lon, tz = place['lat'], place['lon'], tz or place['timezone']
+    else:
+        raise ValueError("lat and lon (or place) are required with a birth time")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError(f"Invalid coordinates: {lat}, {lon}")
+    birth_utc = local_to_utc(datetime.datetime.combine(dob, birth_time), tz)
+    return generator.birth_matrix(birth_utc, lat, lon, ayanamsa)
+
 @app.route('/generate', methods=['POST'])
 def generate_report():
     try:
         # Support both JSON (API) and Form Data (Browser)
         if request.is_json:
             data = request.get_json()
-            dob_str = data.get('dob')
         else:
-            dob_str = request.form.get('dob')
+            data = request.form
+        dob_str = data.get('dob')
 
         if not dob_str:
             return jsonify({"error": "Date of birth is required"}), 400
         
         dob = datetime.datetime.strptime(dob_str, '%Y-%m-%d').date()
+        try:
+            ayanamsa = resolve(data.get('ayanamsa') or None)
+            birth = birth_matrix(data, dob, ayanamsa)
+            tz = data.get('tz') or None
+            if tz:
+                zone(tz)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
-        # Generation Pipeline
-        matrix = generator.generate_matrix(dob)
-        results = analyzer.analyze(matrix, dob=dob)
+        # Generation Pipeline: one chart when the birth time is known, else the matrix
+        # of the local calendar day in `tz`
+        if birth:
+            results = analyzer.analyze_chart(birth, dob=dob)
+        else:
+            matrix = generator.generate_matrix(dob, ayanamsa, tz)
+            results = analyzer.analyze(matrix, dob=dob)
         
         # Numerology
         numerology = calculate_numerology(dob)
         
         # Render Template
-        return render_template(
-            'report.html',
-            narrative=results['narrative'],
-            dob=dob,
-            sample_count=results['sample_count'],
-            numerology=numerology
-        )
+        with metrics.stage("render"):
+            return render_template(
+                'report.html',
+                narrative=results['narrative'],
+                dob=dob,
+                sample_count=results['sample_count'],
+                numerology=numerology
+            )
 
     except Exception as e:
         print(f"Server Error: {str(e)}")
@@ -212,5 +344,241 @@ def generate_report():
         print(f"Server Error: {str(e)}")
         return jsonify({"error": "An internal error occurred."}), 500
 
+@app.route('/api/v1/batch', methods=['POST'])
+def batch_reports():
+    """
+    Bulk report API. Accepts a JSON list or CSV of DOBs (raw body or a
+    multipart "file" field) and streams one NDJSON line per distinct date.
+    """
+    upload = request.files.get('file')
+    if upload:
+        body = upload.read().decode('utf-8-sig')
+        content_type = upload.mimetype or ''
+    else:
+        body = request.get_data(as_text=True)
+        content_type = request.content_type or ''
+
+    try:
+        rows = parse_batch_payload(body, content_type)
+    except BatchInputError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def stream():
+        for line in batch_runner.run(rows):
+            yield to_ndjson(line)
+
+    return Response(stream_with_context(stream()), mimetype='application/x-ndjson')
+
+def ayanamsa_summary(system, matrix, dob):
+    """Reference chart and the ayanamsa-sensitive statistics for one system."""
+    results = analyzer.build_analysis_results(matrix, dob=dob)
+    ref_chart = matrix[0].chart
+    # Value at noon UTC of the date, for display
+    noon = datetime.datetime.combine(dob, datetime.time(12), datetime.timezone.utc).timestamp()
+    return {
+        "ayanamsa_deg": round(float(ayanamsa_degrees(julian_day(noon), system)), 6),
+        "reference_chart": {
+            p_name: {
+                "longitude": round(p.longitude, 4),
+                "rashi": p.rashi,
+                "nakshatra": p.nakshatra,
+                "pada": p.pada
+            }
+            for p_name, p in ref_chart.planets.items()
+        },
+        "rashi_mean_scores": {r_id: round(r["mean_score"], 2) for r_id, r in results["rashi_analysis"].items()},
+        "universal_nakshatras": results["common_links"]["nakshatra_positions"],
+        "retrograde_planets": results["retrograde_planets"],
+        "dasha_periods": results["dasha_periods"]
+    }
+
+@app.route('/api/v1/report')
+def report_sections():
+    """
+    Selected sections of a date's analysis, e.g.
+    ?dob=1989-10-12&sections=tithi_info,dasha_periods[&ayanamsa=raman].
+    Only the requested sections and their inputs are computed: sections
+    that read the reference chart alone cost one chart, not the matrix.
+    Without sections, every section and the narrative, for the calendar
+    day in MATRIX_TIMEZONE or &tz=<IANA zone>. With a birth time
+    (&time=06:30&lat=..&lon=..[&tz=Asia/Kolkata] or &time=06:30&place=Pune)
+    it is the individual report of that one chart (see birth_matrix).
+    """
+    dob_str = request.args.get('dob')
+    if not dob_str:
+        return jsonify({"error": "Date of birth is required"}), 400
+    try:
+        dob = datetime.datetime.strptime(dob_str, '%Y-%m-%d').date()
+        ayanamsa = resolve(request.args.get('ayanamsa') or None)
+        birth = birth_matrix(request.args, dob, ayanamsa)
+        tz = request.args.get('tz') or None
+        if tz:
+            zone(tz)
+        default_sections = analyzer.CHART_SECTIONS + ("narrative",) if birth else analyzer.SECTIONS
+        sections = [name.strip() for name in request.args.get('sections', ','.join(default_sections)).split(',') if name.strip()]
+        if birth:
+            report = analyzer.analyze_sections(sections, dob, lambda: birth, birth_chart=True)
+        else:
+            report = analyzer.analyze_sections(sections, dob, lambda: generator.generate_matrix(dob, ayanamsa, tz),
+                                               lambda: generator.reference_matrix(dob, ayanamsa, tz))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(dict(report, dob=dob.isoformat()))
+
+@app.route('/api/v1/places')
+def places_autocomplete():
+    """
+    Birthplace autocomplete from the offline gazetteer, e.g.
+    ?q=pun[&limit=10][&country=IN]. Most populous matches first, each with
+    lat/lon and IANA timezone.
+    """
+    query = request.args.get('q', '')
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not 1 <= limit <= PLACES_MAX_LIMIT:
+        return jsonify({"error": f"limit must be between 1 and {PLACES_MAX_LIMIT}"}), 400
+    places = default_gazetteer().search(query, limit, country=request.args.get('country') or None)
+    return jsonify({"query": query, "places": places})
+
+@app.route('/api/v1/ayanamsa-compare')
+def ayanamsa_compare():
+    """
+    Side-by-side analysis of one date in several sidereal systems, e.g.
+    ?dob=1989-10-12&ayanamsas=lahiri,raman,kp. The ephemeris runs once;
+    every system is derived from the same tropical pass.
+    """
+    dob_str = request.args.get('dob')
+    if not dob_str:
+        return jsonify({"error": "Date of birth is required"}), 400
+    try:
+        dob = datetime.datetime.strptime(dob_str, '%Y-%m-%d').date()
+        systems = [resolve(name) for name in request.args.get('ayanamsas', ','.join(AYANAMSAS)).split(',') if name.strip()]
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    matrices = generator.generate_matrices(dob, list(dict.fromkeys(systems)))
+    return jsonify({
+        "dob": dob.isoformat(),
+        "systems": {system: ayanamsa_summary(system, matrix, dob) for system, matrix in matrices.items()}
+    })
+
+@app.route('/api/v1/transit-calendar')
+def transit_calendar_endpoint():
+    """
+    Daily transits from today scored against a date's rashi strengths,
+    e.g. ?dob=1989-10-12&days=730. Returns one array per body.
+    """
+    dob_str = request.args.get('dob')
+    if not dob_str:
+        return jsonify({"error": "Date of birth is required"}), 400
+    try:
+        dob = datetime.datetime.strptime(dob_str, '%Y-%m-%d').date()
+        days = int(request.args.get('days', 365))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not 1 <= days <= TRANSIT_CALENDAR_MAX_DAYS:
+        return jsonify({"error": f"days must be between 1 and {TRANSIT_CALENDAR_MAX_DAYS}"}), 400
+
+    # Only the rashi strengths: the rest of the analysis is not computed
+    report = analyzer.analyze_sections(["rashi_analysis"], dob, lambda: generator.generate_matrix(dob))
+    calendar = transit_calendar.score(report["sections"]["rashi_analysis"], days)
+    return jsonify(dict(calendar, dob=dob.isoformat()))
+
+@app.route('/api/v1/panchang')
+def panchang_endpoint():
+    """
+    Panchang table for a year, or one month of it: ?year=2026[&month=10].
+    Columns hold 1-based indices into "names" and local end times.
+    """
+    try:
+        year = int(request.args.get('year', datetime.date.today().year))
+        month = request.args.get('month')
+        if not 1 <= year <= 9999:
+            raise ValueError(f"Invalid year: {year}")
+        table = panchang.month(year, int(month)) if month else panchang.year(year)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"year": year, "month": int(month) if month else None, "table": table, "names": PANCHANG_NAMES})
+
+@app.route('/api/v1/dates')
+def query_dates():
+    """
+    Dates matching a predicate over the precomputed feature table, e.g.
+    ?q=yoga_gajakesari and jupiter_rashi == "Cancer" and sav_aries > 30&limit=100
+    """
+    expression = request.args.get('q')
+    if not expression:
+        return jsonify({"error": "Query (q) is required"}), 400
+    table = load_feature_table()
+    if table is None:
+        return jsonify({"error": "Feature table not built"}), 503
+    try:
+        limit = int(request.args.get('limit', 1000))
+        if not 1 <= limit <= DATES_MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {DATES_MAX_LIMIT}")
+        result = table.query(expression, limit)
+    except (QueryError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    response = dict(result, years=[table.years[0], table.years[-1]])
+    if table.stale_years:
+        response["stale_years"] = table.stale_years  # Built under another engine version, not searched
+    return jsonify(response)
+
+@app.route('/api/v1/twins')
+def astrological_twins():
+    """
+    Dates with the closest SAV / universal-nakshatra signature to a DOB:
+    ?dob=1989-10-12&k=10[&same_decade=1][&same_moon_nakshatra=1]
+    """
+    global twin_index
+    dob_str = request.args.get('dob')
+    if not dob_str:
+        return jsonify({"error": "Date of birth is required"}), 400
+    try:
+        dob = datetime.datetime.strptime(dob_str, '%Y-%m-%d').date()
+        k = int(request.args.get('k', 10))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not 1 <= k <= TWIN_MAX_K:
+        return jsonify({"error": f"k must be between 1 and {TWIN_MAX_K}"}), 400
+
+    table = load_feature_table()
+    if table is None:
+        return jsonify({"error": "Feature table not built"}), 503
+    if twin_index is None:
+        twin_index = TwinIndex(table)
+
+    fallback_row = None
+    if table.row_index(dob) is None:
+        # Outside the precomputed years: one pipeline run for the query date only
+        matrix = generator.generate_matrix(dob)
+        fallback_row = date_features(dob, analyzer.build_analysis_results(matrix), matrix)
+    twins = twin_index.twins_of(
+        dob, k, fallback_row,
+        same_decade=request.args.get('same_decade') == '1',
+        same_moon_nakshatra=request.args.get('same_moon_nakshatra') == '1'
+    )
+    return jsonify({"dob": dob.isoformat(), "twins": twins})
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape endpoint, merged across all gunicorn workers."""
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/admin/profiles/<profile_id>/<kind>')
+def download_profile(profile_id, kind):
+    """
+    Downloads a stored profile artifact (kind: pstats, collapsed, summary).
+    Requires the X-Profile-Token header.
+    """
+    if not profiler.is_authorized(request.headers.get('X-Profile-Token')):
+        return jsonify({"error": "Forbidden"}), 403
+    path = profiler.artifact_path(profile_id, kind)
+    if not path:
+        return jsonify({"error": "Profile not found"}), 404
+    return send_file(path, as_attachment=True, download_name=os.path.basename(path))
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,222 @@
+import numpy as np
+from typing import Dict, Tuple
+
+# Low-precision analytic ephemeris, evaluated as NumPy over arrays of times.
+# Sun and Moon: truncated Meeus series (Astronomical Algorithms, ch. 25 and 47).
+# Planets: JPL Keplerian elements with linear rates (Standish, valid 1800-2050).
+# Longitudes are apparent, geocentric (topocentric for the Moon) and referred
+# to the J2000 ecliptic, the frame SkyfieldAstrologyService reports in.
+# Typical error: Sun < 0.01 deg, Moon ~0.05 deg, planets a few arcminutes.
+
+J2000_JD = 2451545.0
+UNIX_EPOCH_JD = 2440587.5
+LIGHT_AU_PER_DAY = 173.1446327
+EARTH_RADIUS_KM = 6378.14
+OBLIQUITY_J2000 = np.radians(23.4392911)
+
+# Delta T (TT - UT, seconds); linear interpolation is ample at this precision
+DELTA_T_YEARS = np.array([1800, 1850, 1900, 1920, 1940, 1960, 1980, 2000, 2010, 2020, 2030, 2050])
+DELTA_T_SECONDS = np.array([13.7, 7.1, -2.8, 21.2, 24.3, 33.2, 50.5, 63.8, 66.1, 69.4, 72.0, 93.0])
+
+# Moon longitude (1e-6 deg) and distance (1e-3 km) terms: multiples of D, M, M', F
+MOON_LR_TERMS = np.array([
+    (0, 0, 1, 0, 6288774, -20905355), (2, 0, -1, 0, 1274027, -3699111),
+    (2, 0, 0, 0, 658314, -2955968), (0, 0, 2, 0, 213618, -569925),
+    (0, 1, 0, 0, -185116, 48888), (0, 0, 0, 2, -114332, -3149),
+    (2, 0, -2, 0, 58793, 246158), (2, -1, -1, 0, 57066, -152138),
+    (2, 0, 1, 0, 53322, -170733), (2, -1, 0, 0, 45758, -204586),
+    (0, 1, -1, 0, -40923, -129620), (1, 0, 0, 0, -34720, 108743),
+    (0, 1, 1, 0, -30383, 104755), (2, 0, 0, -2, 15327, 10321),
+    (0, 0, 1, 2, -12528, 0), (0, 0, 1, -2, 10980, 79661),
+    (4, 0, -1, 0, 10675, -34782), (0, 0, 3, 0, 10034, -23210),
+    (4, 0, -2, 0, 8548, -21636), (2, 1, -1, 0, -7888, 24208),
+    (2, 1, 0, 0, -6766, 30824), (1, 0, -1, 0, -5163, -8379),
+    (1, 1, 0, 0, 4987, -16675), (2, -1, 1, 0, 4036, -12831),
+    (2, 0, 2, 0, 3994, -10445), (4, 0, 0, 0, 3861, -11650),
+    (2, 0, -3, 0, 3665, 14403), (0, 1, -2, 0, -2689, -7003),
+    (2, 0, -1, 2, -2602, 0), (2, -1, -2, 0, 2390, 10056),
+    (1, 0, 1, 0, -2348, 6322), (2, -2, 0, 0, 2236, -9884),
+    (0, 1, 2, 0, -2120, 5751), (0, 2, 0, 0, -2069, 0),
+    (2, -2, -1, 0, 2048, -4950), (2, 0, 1, -2, -1773, 4130),
+    (2, 0, 0, 2, -1595, 0), (4, -1, -1, 0, 1215, -3958),
+    (0, 0, 2, 2, -1110, 0), (3, 0, -1, 0, -892, 3258),
+    (2, 1, 1, 0, -810, 2616), (4, -1, -2, 0, 759, -1897),
+    (0, 2, -1, 0, -713, -2117), (2, 2, -1, 0, -700, 2354),
+    (2, 1, -2, 0, 691, 0), (2, -1, 0, -2, 596, 0),
+    (4, 0, 1, 0, 549, -1423), (0, 0, 4, 0, 537, -1117),
+    (4, -1, 0, 0, 520, -1571), (1, 0, -2, 0, -487, -1739)
+], dtype=float)
+
+# Moon latitude (1e-6 deg) terms: multiples of D, M, M', F
+MOON_B_TERMS = np.array([
+    (0, 0, 0, 1, 5128122), (0, 0, 1, 1, 280602), (0, 0, 1, -1, 277693),
+    (2, 0, 0, -1, 173237), (2, 0, -1, 1, 55413), (2, 0, -1, -1, 46271),
+    (2, 0, 0, 1, 32573), (0, 0, 2, 1, 17198), (2, 0, 1, -1, 9266),
+    (0, 0, 2, -1, 8822), (2, -1, 0, -1, 8216), (2, 0, -2, -1, 4324),
+    (2, 0, 1, 1, 4200), (2, 1, 0, -1, -3359), (2, -1, -1, 1, 2463)
+], dtype=float)
+
+# Keplerian elements at J2000 and rates per Julian century:
+# a (AU), e, I, L, longitude of perihelion, longitude of node (deg)
+PLANET_ELEMENTS = {
+    "Mercury": ((0.38709927, 0.20563593, 7.00497902, 252.25032350, 77.45779628, 48.33076593),
+                (0.00000037, 0.00001906, -0.00594749, 149472.67411175, 0.16047689, -0.12534081)),
+    "Venus": ((0.72333566, 0.00677672, 3.39467605, 181.97909950, 131.60246718, 76.67984255),
+              (0.00000390, -0.00004107, -0.00078890, 58517.81538729, 0.00268329, -0.27769418)),
+    "EMBary": ((1.00000261, 0.01671123, -0.00001531, 100.46457166, 102.93768193, 0.0),
+               (0.00000562, -0.00004392, -0.01294668, 35999.37244981, 0.32327364, 0.0)),
+    "Mars": ((1.52371034, 0.09339410, 1.84969142, -4.55343205, -23.94362959, 49.55953891),
+             (0.00001847, 0.00007882, -0.00813131, 19140.30268499, 0.44441088, -0.29257343)),
+    "Jupiter": ((5.20288700, 0.04838624, 1.30439695, 34.39644051, 14.72847983, 100.47390909),
+                (-0.00011607, -0.00013253, -0.00183714, 3034.74612775, 0.21252668, 0.20469106)),
+    "Saturn": ((9.53667594, 0.05386179, 2.48599187, 49.95424423, 92.59887831, 113.66242448),
+               (-0.00125060, -0.00050991, 0.00193609, 1222.49362201, -0.41897216, -0.28867794))
+}
+
+
+def julian_day(timestamps: np.ndarray) -> np.ndarray:
+    """UTC unix timestamps -> Julian Day (UT)."""
+    return np.asarray(timestamps, dtype=float) / 86400.0 + UNIX_EPOCH_JD
+
+
+def delta_t_days(jd_ut: np.ndarray) -> np.ndarray:
+    years = 2000.0 + (jd_ut - J2000_JD) / 365.25
+    return np.interp(years, DELTA_T_YEARS, DELTA_T_SECONDS) / 86400.0
+
+
+def general_precession(T: np.ndarray) -> np.ndarray:
+    """Accumulated precession in longitude since J2000 (deg); maps of-date longitudes to J2000."""
+    return 1.3969713 * T + 0.0003086 * T ** 2
+
+
+def mean_sidereal_time(jd_ut: np.ndarray) -> np.ndarray:
+    """Greenwich mean sidereal time in degrees (Meeus 12.4)."""
+    T = (jd_ut - J2000_JD) / 36525.0
+    return (280.46061837 + 360.98564736629 * (jd_ut - J2000_JD)
+            + 0.000387933 * T ** 2 - T ** 3 / 38710000.0) % 360
+
+
+def sun_longitude(T: np.ndarray) -> np.ndarray:
+    """Apparent geocentric longitude of the Sun, J2000 ecliptic (deg)."""
+    L0 = 280.46646 + 36000.76983 * T + 0.0003032 * T ** 2
+    M = np.radians(357.52911 + 35999.05029 * T - 0.0001537 * T ** 2)
+    C = ((1.914602 - 0.004817 * T - 0.000014 * T ** 2) * np.sin(M)
+         + (0.019993 - 0.000101 * T) * np.sin(2 * M) + 0.000289 * np.sin(3 * M))
+    # 0.00569: annual aberration; nutation is left out as Skyfield's J2000 frame has none
+    return (L0 + C - 0.00569 - general_precession(T)) % 360
+
+
+def moon_position(T: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Geocentric Moon, ecliptic of date: (longitude deg, latitude deg, distance km)."""
+    Lp = 218.3164477 + 481267.88123421 * T - 0.0015786 * T ** 2
+    D = 297.8501921 + 445267.1114034 * T - 0.0018819 * T ** 2
+    M = 357.5291092 + 35999.0502909 * T - 0.0001536 * T ** 2
+    Mp = 134.9633964 + 477198.8675055 * T + 0.0087414 * T ** 2
+    F = 93.2720950 + 483202.0175233 * T - 0.0036539 * T ** 2
+    E = 1 - 0.002516 * T - 0.0000074 * T ** 2
+    fundamentals = np.radians(np.stack([D, M, Mp, F]))  # (4, n)
+
+    def series(terms):
+        args = terms[:, :4] @ fundamentals  # (terms, n)
+        eccentricity = E[np.newaxis, :] ** np.abs(terms[:, 1:2])
+        return args, eccentricity
+
+    args, ecc = series(MOON_LR_TERMS)
+    sum_l = np.sum(MOON_LR_TERMS[:, 4:5] * ecc * np.sin(args), axis=0)
+    sum_r = np.sum(MOON_LR_TERMS[:, 5:6] * ecc * np.cos(args), axis=0)
+    args, ecc = series(MOON_B_TERMS)
+    sum_b = np.sum(MOON_B_TERMS[:, 4:5] * ecc * np.sin(args), axis=0)
+
+    A1 = np.radians(119.75 + 131.849 * T)
+    A2 = np.radians(53.09 + 479264.290 * T)
+    A3 = np.radians(313.45 + 481266.484 * T)
+    Lp_r, F_r, Mp_r = np.radians(Lp), fundamentals[3], fundamentals[2]
+    sum_l += 3958 * np.sin(A1) + 1962 * np.sin(Lp_r - F_r) + 318 * np.sin(A2)
+    sum_b += (-2235 * np.sin(Lp_r) + 382 * np.sin(A3) + 175 * np.sin(A1 - F_r) + 175 * np.sin(A1 + F_r)
+              + 127 * np.sin(Lp_r - Mp_r) - 115 * np.sin(Lp_r + Mp_r))
+
+    return (Lp + sum_l / 1e6) % 360, sum_b / 1e6, 385000.56 + sum_r / 1000
+
+
+def geocentric_moon_longitude(T: np.ndarray) -> np.ndarray:
+    """Moon longitude from the Earth's centre, J2000 ecliptic (deg): no diurnal parallax."""
+    return (moon_position(T)[0] - general_precession(T)) % 360
+
+
+def topocentric_moon_longitude(T: np.ndarray, jd_ut: np.ndarray, lat: float, lon: float) -> np.ndarray:
+    """Moon longitude as seen from (lat, lon), J2000 ecliptic (deg). Parallax reaches ~1 deg."""
+    lam, beta, dist = moon_position(T)
+    lam_r, beta_r = np.radians(lam), np.radians(beta)
+    moon = dist * np.stack([np.cos(beta_r) * np.cos(lam_r), np.cos(beta_r) * np.sin(lam_r), np.sin(beta_r)])
+
+    # Observer in equatorial coordinates, rotated onto the ecliptic
+    lst = np.radians(mean_sidereal_time(jd_ut) + lon)
+    phi = np.radians(lat)
+    ox = EARTH_RADIUS_KM * np.cos(phi) * np.cos(lst)
+    oy = EARTH_RADIUS_KM * np.cos(phi) * np.sin(lst)
+    oz = EARTH_RADIUS_KM * np.sin(phi) * np.ones_like(lst)
+    eps = OBLIQUITY_J2000
+    observer = np.stack([ox, oy * np.cos(eps) + oz * np.sin(eps), -oy * np.sin(eps) + oz * np.cos(eps)])
+
+    topo = moon - observer
+    return (np.degrees(np.arctan2(topo[1], topo[0])) - general_precession(T)) % 360
+
+
+def heliocentric_xyz(name: str, T: np.ndarray) -> np.ndarray:
+    """Heliocentric position (AU), J2000 ecliptic, shape (3, n)."""
+    base, rate = PLANET_ELEMENTS[name]
+    a, e, inc, L, peri, node = (b + r * T for b, r in zip(base, rate))
+    omega = np.radians(peri - node)
+    inc, node = np.radians(inc), np.radians(node)
+    M = np.radians((L - peri + 180) % 360 - 180)
+
+    # Kepler's equation, Newton iterations (converged for e < 0.21)
+    E = M + e * np.sin(M)
+    for _ in range(5):
+        E = E - (E - e * np.sin(E) - M) / (1 - e * np.cos(E))
+    xp = a * (np.cos(E) - e)
+    yp = a * np.sqrt(1 - e ** 2) * np.sin(E)
+
+    cw, sw, cn, sn, ci, si = np.cos(omega), np.sin(omega), np.cos(node), np.sin(node), np.cos(inc), np.sin(inc)
+    return np.stack([
+        (cw * cn - sw * sn * ci) * xp + (-sw * cn - cw * sn * ci) * yp,
+        (cw * sn + sw * cn * ci) * xp + (-sw * sn + cw * cn * ci) * yp,
+        (sw * si) * xp + (cw * si) * yp
+    ])
+
+
+def planet_longitudes(T: np.ndarray) -> Dict[str, np.ndarray]:
+    """Apparent geocentric longitudes of Mercury..Saturn, J2000 ecliptic (deg)."""
+    earth = heliocentric_xyz("EMBary", T)
+    # Earth's velocity (AU/day) for annual aberration
+    dt = 0.5 / 36525.0
+    earth_velocity = (heliocentric_xyz("EMBary", T + dt) - heliocentric_xyz("EMBary", T - dt))
+
+    longitudes = {}
+    for name in ("Mercury", "Venus", "Mars", "Jupiter", "Saturn"):
+        geo = heliocentric_xyz(name, T) - earth
+        # One light-time iteration: the planet where it was when the light left it
+        light_time = np.linalg.norm(geo, axis=0) / LIGHT_AU_PER_DAY
+        geo = heliocentric_xyz(name, T - light_time / 36525.0) - earth
+        distance = np.linalg.norm(geo, axis=0)
+        apparent = geo / distance + earth_velocity / LIGHT_AU_PER_DAY
+        longitudes[name] = np.degrees(np.arctan2(apparent[1], apparent[0])) % 360
+    return longitudes
+
+
+def tropical_longitudes(timestamps: np.ndarray, lat: float, lon: float, geocentric: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Apparent tropical longitudes (J2000 ecliptic) of the seven grahas for an
+    array of UTC unix timestamps, plus "RAMC" (local mean sidereal time, deg).
+    The Moon is topocentric unless `geocentric`.
+    """
+    jd_ut = julian_day(timestamps)
+    T = (jd_ut + delta_t_days(jd_ut) - J2000_JD) / 36525.0
+
+    longitudes = {
+        "Sun": sun_longitude(T),
+        "Moon": geocentric_moon_longitude(T) if geocentric else topocentric_moon_longitude(T, jd_ut, lat, lon)
+    }
+    longitudes.update(planet_longitudes(T))
+    longitudes["RAMC"] = (mean_sidereal_time(jd_ut) + lon) % 360
+    return longitudes
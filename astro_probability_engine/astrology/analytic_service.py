@@ -0,0 +1,50 @@
+import datetime
+import numpy as np
+from typing import Dict, Any, List
+from astrology.interface import TropicalAstrologyService
+from astrology.chart_builder import TropicalPositions
+from astrology.analytic_ephemeris import tropical_longitudes, geocentric_moon_longitude, julian_day, delta_t_days, general_precession, J2000_JD
+from astrology.lunar_nodes import node_longitudes
+from astrology.interpolation import central_speeds
+from config import GRAHAS, TRUE_NODE, TIME_INTERVAL_MINUTES
+from utils.metrics import stage
+
+
+class AnalyticAstrologyService(TropicalAstrologyService):
+    """
+    Skyfield-free ephemeris from truncated analytic series (see
+    analytic_ephemeris.py). Same frame, Ayanamsa and Lagna rule as
+    SkyfieldAstrologyService, with no kernel file to load. Accuracy is
+    a few arcminutes; tools/validate_ephemeris.py measures the rashi and
+    nakshatra disagreements against Skyfield.
+    """
+
+    @stage("ephemeris")
+    def tropical_positions(self, times: List[datetime.datetime], location: Dict[str, Any],
+                           geocentric: bool = False) -> TropicalPositions:
+        """Evaluates the series once over all the times, no interpolation needed."""
+        # One extra slice on each side for the central-difference daily motion
+        step = datetime.timedelta(minutes=TIME_INTERVAL_MINUTES)
+        extended = [times[0] - step] + list(times) + [times[-1] + step]
+        # Input dt is treated as UTC, like SkyfieldAstrologyService
+        utc_seconds = np.array([dt.replace(tzinfo=datetime.timezone.utc).timestamp() for dt in extended])
+        longitudes = tropical_longitudes(utc_seconds, location['lat'], location['lon'], geocentric)
+        jd_ut = julian_day(utc_seconds)
+        jd_tt = jd_ut + delta_t_days(jd_ut)
+        # The series are referred to J2000; precession gives the ecliptic of date
+        precession = general_precession((jd_tt - J2000_JD) / 36525.0)
+        for p_name in list(longitudes):
+            if p_name != "RAMC":
+                longitudes[p_name] = (longitudes[p_name] + precession) % 360
+        longitudes.update(node_longitudes(jd_tt, TRUE_NODE))
+        days = (utc_seconds - utc_seconds[0]) / 86400.0
+        # Daily motion from the geocentric Moon: the topocentric one swings ~1 deg a day with parallax
+        moving = dict(longitudes, Moon=(geocentric_moon_longitude((jd_tt - J2000_JD) / 36525.0) + precession) % 360)
+
+        return TropicalPositions(
+            timestamps=[dt.replace(tzinfo=datetime.timezone.utc).timestamp() for dt in times],
+            jd=jd_tt[1:-1],
+            longitudes={p_name: longitudes[p_name][1:-1] for p_name in GRAHAS},
+            speeds={p_name: central_speeds(moving[p_name], days) for p_name in GRAHAS},
+            ramc=longitudes["RAMC"][1:-1]
+        )
@@ -0,0 +1,31 @@
+import numpy as np
+from config import DEFAULT_AYANAMSA
+from astrology.analytic_ephemeris import J2000_JD, general_precession
+
+# Ayanamsa = value at J2000 + general precession in longitude since J2000.
+# Values at J2000 follow the usual definitions (Swiss Ephemeris conventions).
+AYANAMSAS = {
+    "lahiri": 23.857092,        # Chitrapaksha, Indian national ephemeris (23 51' 25.5")
+    "raman": 22.411321,         # B. V. Raman
+    "kp": 23.760912,            # Krishnamurti Paddhati
+    "fagan_bradley": 24.740300  # Western sidereal
+}
+
+
+def resolve(system: str = None) -> str:
+    """Normalizes an ayanamsa name; None means DEFAULT_AYANAMSA."""
+    name = (system or DEFAULT_AYANAMSA).strip().lower()
+    if name not in AYANAMSAS:
+        raise ValueError(f"Unknown ayanamsa: {system} (expected one of {', '.join(AYANAMSAS)})")
+    return name
+
+
+def ayanamsa_degrees(jd: np.ndarray, system: str = None) -> np.ndarray:
+    """Ayanamsa (deg) for Julian Days (TT); subtract from tropical longitudes of date."""
+    T = (np.asarray(jd, dtype=float) - J2000_JD) / 36525.0
+    return AYANAMSAS[resolve(system)] + general_precession(T)
+
+
+def all_ayanamsas(jd: np.ndarray) -> np.ndarray:
+    """Every supported ayanamsa, shape (systems, times); used for boundary checks shared across systems."""
+    return np.stack([ayanamsa_degrees(jd, name) for name in AYANAMSAS])
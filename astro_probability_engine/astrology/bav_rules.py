@@ -1,5 +1,8 @@
 
-from typing import Dict, List
+import numpy as np
+from functools import lru_cache
+from typing import Dict, List, Tuple, Any
+from config import BAV_CACHE_SIZE
 
 class BAVCalculator:
     """
@@ -83,6 +86,7 @@ class BAVCalculator:
     }
     
     # Mapping planet names to index if needed, but we used names in main mock.
+    DONORS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Lagna"]
     
     @staticmethod
     def calculate_bav(candidate_planet: str, all_positions: Dict[str, int], exclude_list: List[str] = None) -> Dict[int, int]:
@@ -109,6 +113,23 @@ class BAVCalculator:
                 
         return bav_counts
 
+    @staticmethod
+    def sarvashtakavarga_array(rashis: np.ndarray, exclude_list: List[str] = None) -> np.ndarray:
+        """
+        Vectorized SAV totals for many charts at once.
+        `rashis` is (charts, 8) with rashis 1-12 in DONORS order; returns
+        (charts, 12) with column 0 = Aries. Same rules as
+        calculate_sarvashtakavarga, for the divisional-chart engine.
+        """
+        weights = _donor_weights()
+        rashis = np.asarray(rashis, dtype=int)
+        # House offset (0-11) of every target rashi from every donor
+        offsets = (np.arange(12)[None, None, :] - (rashis[:, :, None] - 1)) % 12
+        bindus = weights[np.arange(len(BAVCalculator.DONORS))[None, :, None], offsets]
+        for donor in exclude_list or []:
+            bindus[:, BAVCalculator.DONORS.index(donor)] = 0
+        return bindus.sum(axis=1)
+
     @staticmethod
     def trikona_shodhana(bav: Dict[int, int]) -> Dict[int, int]:
         """
@@ -189,12 +210,35 @@ class BAVCalculator:
                     
         return reduced
 
+    @staticmethod
+    def cache_info() -> Dict[str, Any]:
+        """Hit/miss statistics of the memoized SAV and Shodhita tables."""
+        return {
+            "sarvashtakavarga": _cached_sarvashtakavarga.cache_info(),
+            "shodhita": _cached_shodhita_sav.cache_info()
+        }
+
+    @staticmethod
+    def cache_clear():
+        _cached_sarvashtakavarga.cache_clear()
+        _cached_shodhita_sav.cache_clear()
+
+    @staticmethod
+    def _cache_key(all_positions_rashi: Dict[str, int], exclude_list: List[str] = None) -> Tuple[tuple, tuple]:
+        return tuple(sorted(all_positions_rashi.items())), tuple(sorted(exclude_list or []))
+
     @staticmethod
     def calculate_sarvashtakavarga(all_positions_rashi: Dict[str, int], exclude_list: List[str] = None) -> Dict[int, Dict[str, int]]:
         """
         Calculates SAV for all 12 Rashis.
         Returns: { Rashi_ID: { "total": int, "breakdown": {Planet: score} } }
+        Results are memoized by placement; callers get their own copy.
         """
+        cached = _cached_sarvashtakavarga(*BAVCalculator._cache_key(all_positions_rashi, exclude_list))
+        return {r: {"total": d["total"], "breakdown": dict(d["breakdown"])} for r, d in cached.items()}
+
+    @staticmethod
+    def _compute_sarvashtakavarga(all_positions_rashi: Dict[str, int], exclude_list: List[str] = None) -> Dict[int, Dict[str, int]]:
         if exclude_list is None: exclude_list = []
         rashi_totals = {r: {"total": 0, "breakdown": {}} for r in range(1, 13)}
         planets = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
@@ -212,7 +256,12 @@ class BAVCalculator:
     def calculate_shodhita_sav(all_positions_rashi: Dict[str, int], exclude_list: List[str] = None) -> Dict[int, int]:
         """
         Phase 3: Shodhita SAV (Reduced SAV).
+        Memoized by placement like calculate_sarvashtakavarga.
         """
+        return dict(_cached_shodhita_sav(*BAVCalculator._cache_key(all_positions_rashi, exclude_list)))
+
+    @staticmethod
+    def _compute_shodhita_sav(all_positions_rashi: Dict[str, int], exclude_list: List[str] = None) -> Dict[int, int]:
         if exclude_list is None: exclude_list = []
         shodhita_sav = {r: 0 for r in range(1, 13)}
         planets = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
@@ -230,3 +279,26 @@ class BAVCalculator:
                 shodhita_sav[r] += p_eka[r]
                 
         return shodhita_sav
+
+
+# Within a day only the Moon and Lagna change sign, and neighbouring dates
+# repeat the slow-planet placements, so most charts hit these caches.
+@lru_cache(maxsize=BAV_CACHE_SIZE)
+def _cached_sarvashtakavarga(positions: tuple, exclude: tuple) -> Dict[int, Dict[str, int]]:
+    return BAVCalculator._compute_sarvashtakavarga(dict(positions), list(exclude))
+
+
+@lru_cache(maxsize=BAV_CACHE_SIZE)
+def _cached_shodhita_sav(positions: tuple, exclude: tuple) -> Dict[int, int]:
+    return BAVCalculator._compute_shodhita_sav(dict(positions), list(exclude))
+
+
+@lru_cache(maxsize=1)
+def _donor_weights() -> np.ndarray:
+    """(donors, 12): bindus each donor gives to a house offset, summed over all 7 BAVs."""
+    weights = np.zeros((len(BAVCalculator.DONORS), 12), dtype=int)
+    for rules in BAVCalculator.RULES.values():
+        for donor, benefics in rules.items():
+            for house_offset in benefics:
+                weights[BAVCalculator.DONORS.index(donor), house_offset - 1] += 1
+    return weights
@@ -0,0 +1,111 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Any, List
+from engine.models import ChartData, PlanetPosition, HouseData
+from astrology.bav_rules import BAVCalculator
+from astrology.ayanamsa import ayanamsa_degrees
+from config import KAKSHYA_DEGREES, KAKSHYA_RULERS, PLANETS
+from utils.metrics import stage
+
+# Shared by all AstrologyService implementations: once a service has the
+# tropical longitudes and sidereal time, the rest of the chart is pure bookkeeping.
+
+
+@dataclass
+class TropicalPositions:
+    """
+    One ephemeris pass over a series of times at one place. Nothing here
+    depends on the ayanamsa, so sidereal charts for any system derive from it.
+    """
+    timestamps: List[float] # Chart timestamps
+    jd: np.ndarray # Julian Day (TT) per time
+    longitudes: Dict[str, np.ndarray] # Tropical longitude of date (deg) per graha
+    speeds: Dict[str, np.ndarray] # Daily motion (deg/day)
+    ramc: np.ndarray # Local sidereal time (deg)
+
+
+def build_planet(name: str, sidereal_deg: float, speed: float = 0.0) -> PlanetPosition:
+    """Derives Rashi, Nakshatra, Pada and Kakshya from a sidereal longitude; speed in deg/day."""
+    sidereal_deg = sidereal_deg % 360
+    r_idx = int(sidereal_deg / 30) + 1 # 1-12
+    rem_deg = sidereal_deg % 30
+    nakshatra = int(sidereal_deg / 13.333333) + 1
+    pada = int((sidereal_deg % 13.333333) / 3.333333) + 1
+    kakshya_idx = int(rem_deg / KAKSHYA_DEGREES)
+
+    return PlanetPosition(
+        name=name,
+        longitude=sidereal_deg,
+        speed=speed,
+        rashi=r_idx,
+        nakshatra=nakshatra,
+        pada=pada,
+        kakshya=kakshya_idx + 1,
+        kakshya_ruler=KAKSHYA_RULERS[kakshya_idx],
+        is_retrograde=speed < 0
+    )
+
+
+@stage("bav")
+def build_houses(positions: Dict[str, int], lagna_rashi: int) -> Dict[int, HouseData]:
+    """
+    Maps the 12 houses from the Lagna and fills SAV, Shodhita and the
+    FIXED (Lagna-excluded) scores from the Ashtakavarga rules.
+    """
+    positions = dict(positions, Lagna=lagna_rashi)
+
+    # Generate BAV/SAV (Total)
+    sav_data = BAVCalculator.calculate_sarvashtakavarga(positions)
+    shodhita_sav = BAVCalculator.calculate_shodhita_sav(positions)
+
+    # Generate FIXED SAV (Exclude Lagna)
+    fixed_sav_data = BAVCalculator.calculate_sarvashtakavarga(positions, exclude_list=["Lagna"])
+    fixed_shodhita_sav = BAVCalculator.calculate_shodhita_sav(positions, exclude_list=["Lagna"])
+
+    houses = {}
+    for h_num in range(1, 13):
+        # House 1 = Lagna Rashi
+        target_rashi_id = (lagna_rashi + (h_num - 1) - 1) % 12 + 1
+
+        r_data = sav_data[target_rashi_id]
+
+        houses[h_num] = HouseData(
+            house_num=h_num,
+            rashi_id=target_rashi_id,
+            sav_score=r_data["total"],
+            shodhita_score=shodhita_sav[target_rashi_id],
+            fixed_sav=fixed_sav_data[target_rashi_id]["total"],
+            fixed_shodhita=fixed_shodhita_sav[target_rashi_id],
+            bav_scores=r_data["breakdown"]
+        )
+    return houses
+
+
+def build_chart(timestamp: float, location: Dict[str, Any], planets: Dict[str, PlanetPosition], lagna_sidereal: float) -> ChartData:
+    lagna_sidereal = lagna_sidereal % 360
+    lagna_rashi = int(lagna_sidereal / 30) + 1
+    # Rahu/Ketu are charted but have no Ashtakavarga
+    positions = {name: p.rashi for name, p in planets.items() if name in PLANETS}
+
+    return ChartData(
+        timestamp=timestamp,
+        location_name=location['name'],
+        lat=location['lat'],
+        lon=location['lon'],
+        ascendant=lagna_sidereal,
+        planets=planets,
+        houses=build_houses(positions, lagna_rashi)
+    )
+
+
+def sidereal_charts(tropical: TropicalPositions, location: Dict[str, Any], system: str = None) -> List[ChartData]:
+    """Charts in the sidereal zodiac of `system` (see astrology.ayanamsa)."""
+    ayanamsa = ayanamsa_degrees(tropical.jd, system)
+    charts = []
+    for i, timestamp in enumerate(tropical.timestamps):
+        planets_data = {p_name: build_planet(p_name, float(lon[i] - ayanamsa[i]), float(tropical.speeds[p_name][i]))
+                        for p_name, lon in tropical.longitudes.items()}
+        # Lagna: RAMC + 90 (simple rotation, no oblique ascension)
+        lagna_sidereal = float(tropical.ramc[i] + 90 - ayanamsa[i])
+        charts.append(build_chart(timestamp, location, planets_data, lagna_sidereal))
+    return charts
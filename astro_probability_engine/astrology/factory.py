@@ -0,0 +1,27 @@
+from typing import Optional
+from astrology.interface import AstrologyService
+from config import ASTRO_SERVICE, SYNTHETIC_SEED
+
+SERVICES = ("skyfield", "analytic", "synthetic", "mock")
+
+
+def create_service(name: Optional[str] = None) -> AstrologyService:
+    """
+    Builds the configured AstrologyService (ASTRO_SERVICE by default).
+    Imports are deferred so the analytic, synthetic and mock services do not load
+    Skyfield or the ephemeris file.
+    """
+    name = name or ASTRO_SERVICE
+    if name == "skyfield":
+        from astrology.real_service import SkyfieldAstrologyService
+        return SkyfieldAstrologyService()
+    if name == "analytic":
+        from astrology.analytic_service import AnalyticAstrologyService
+        return AnalyticAstrologyService()
+    if name == "synthetic":
+        from astrology.synthetic_service import SyntheticAstrologyService
+        return SyntheticAstrologyService(seed=SYNTHETIC_SEED)
+    if name == "mock":
+        from astrology.mock_service import MockAstrologyService
+        return MockAstrologyService()
+    raise ValueError(f"Unknown astrology service: {name} (expected one of {', '.join(SERVICES)})")
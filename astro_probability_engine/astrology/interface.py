@@ -1,7 +1,12 @@
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
 from engine.models import ChartData
+from astrology.ayanamsa import ayanamsa_degrees, resolve
+from astrology.chart_builder import TropicalPositions, sidereal_charts
+from config import TROPICAL_CACHE_SIZE
 import datetime
 
 class AstrologyService(ABC):
@@ -9,3 +14,69 @@ class AstrologyService(ABC):
     @abstractmethod
     def calculate_chart(self, dt: datetime.datetime, location: Dict[str, Any]) -> ChartData:
         pass
+
+    def calculate_charts(self, times: List[datetime.datetime], location: Dict[str, Any],
+                         ayanamsa: Optional[str] = None) -> List[ChartData]:
+        """
+        Charts for many times at one location, in the order given.
+        Services that can evaluate a whole day at once override this; this
+        fallback only knows the service's own zodiac and ignores `ayanamsa`.
+        """
+        return [self.calculate_chart(dt, location) for dt in times]
+
+    def sidereal_longitudes(self, times: List[datetime.datetime], location: Dict[str, Any],
+                            ayanamsa: Optional[str] = None, geocentric: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Sidereal longitude (deg) per graha over `times`, for callers that need
+        no houses. With geocentric, seen from the Earth's centre (no lunar
+        parallax); this fallback's charts have none to remove.
+        """
+        charts = self.calculate_charts(times, location, ayanamsa)
+        return {p_name: np.array([chart.planets[p_name].longitude for chart in charts])
+                for p_name in charts[0].planets}
+
+
+class TropicalAstrologyService(AstrologyService):
+    """
+    Base for services with a real ephemeris. Subclasses produce tropical
+    positions once per (times, place); sidereal charts for any ayanamsa are
+    derived from that cached pass, so comparing systems costs no extra
+    ephemeris work.
+    """
+
+    def __init__(self, ayanamsa: Optional[str] = None):
+        self.ayanamsa = resolve(ayanamsa)
+        self._tropical = lru_cache(maxsize=TROPICAL_CACHE_SIZE)(self._tropical_for_key)
+
+    @abstractmethod
+    def tropical_positions(self, times: List[datetime.datetime], location: Dict[str, Any],
+                           geocentric: bool = False) -> TropicalPositions:
+        """Positions seen from `location`, or from the Earth's centre with geocentric."""
+        pass
+
+    def _tropical_for_key(self, times: Tuple[datetime.datetime, ...], lat: float, lon: float,
+                          geocentric: bool) -> TropicalPositions:
+        return self.tropical_positions(list(times), {"lat": lat, "lon": lon}, geocentric)
+
+    def tropical(self, times: List[datetime.datetime], location: Dict[str, Any], geocentric: bool = False) -> TropicalPositions:
+        """Cached tropical pass; shared by every ayanamsa variant."""
+        return self._tropical(tuple(times), location['lat'], location['lon'], geocentric)
+
+    def cache_info(self):
+        return self._tropical.cache_info()
+
+    def cache_clear(self):
+        self._tropical.cache_clear()
+
+    def calculate_chart(self, dt: datetime.datetime, location: Dict[str, Any]) -> ChartData:
+        return self.calculate_charts([dt], location)[0]
+
+    def calculate_charts(self, times: List[datetime.datetime], location: Dict[str, Any],
+                         ayanamsa: Optional[str] = None) -> List[ChartData]:
+        return sidereal_charts(self.tropical(times, location), location, ayanamsa or self.ayanamsa)
+
+    def sidereal_longitudes(self, times: List[datetime.datetime], location: Dict[str, Any],
+                            ayanamsa: Optional[str] = None, geocentric: bool = False) -> Dict[str, np.ndarray]:
+        tropical = self.tropical(times, location, geocentric)
+        offset = ayanamsa_degrees(tropical.jd, ayanamsa or self.ayanamsa)
+        return {p_name: (lon - offset) % 360 for p_name, lon in tropical.longitudes.items()}
@@ -0,0 +1,85 @@
+import numpy as np
+from typing import Callable, Tuple
+
+# Sparse-node interpolation of longitudes across the slices of one day.
+# A body is evaluated at a few node slices (longitude + rate), the slices in
+# between are filled by cubic Hermite interpolation, and any interpolated
+# value close to a boundary that build_planet resolves (rashi, nakshatra pada,
+# kakshya) is re-evaluated directly, so the discrete outputs never change.
+
+NAKSHATRA_SPAN = 13.333333  # Same constants as build_planet
+PADA_SPAN = 3.333333
+KAKSHYA_SPAN = 3.75  # Multiples include the rashi boundaries
+
+Evaluator = Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]
+
+
+def node_indices(count: int, step: int) -> np.ndarray:
+    """Every `step`-th slice, always including the last one."""
+    nodes = list(range(0, count, max(1, step)))
+    if nodes[-1] != count - 1:
+        nodes.append(count - 1)
+    return np.array(nodes)
+
+
+def hermite(t_nodes: np.ndarray, y_nodes: np.ndarray, dy_nodes: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Piecewise cubic Hermite through (t, y, dy/dt) at the nodes."""
+    seg = np.clip(np.searchsorted(t_nodes, t, side="right") - 1, 0, len(t_nodes) - 2)
+    t0, t1 = t_nodes[seg], t_nodes[seg + 1]
+    h = t1 - t0
+    s = (t - t0) / h
+    h00 = 2 * s ** 3 - 3 * s ** 2 + 1
+    h10 = s ** 3 - 2 * s ** 2 + s
+    h01 = -2 * s ** 3 + 3 * s ** 2
+    h11 = s ** 3 - s ** 2
+    return h00 * y_nodes[seg] + h10 * h * dy_nodes[seg] + h01 * y_nodes[seg + 1] + h11 * h * dy_nodes[seg + 1]
+
+
+def boundary_distance(sidereal_deg: np.ndarray) -> np.ndarray:
+    """Distance (deg) to the nearest rashi, kakshya, nakshatra or pada boundary."""
+    deg = sidereal_deg % 360
+    kakshya = deg % KAKSHYA_SPAN
+    in_nakshatra = deg % NAKSHATRA_SPAN
+    pada = in_nakshatra % PADA_SPAN
+    return np.minimum.reduce([
+        kakshya, KAKSHYA_SPAN - kakshya,
+        in_nakshatra, NAKSHATRA_SPAN - in_nakshatra,
+        pada, PADA_SPAN - pada
+    ])
+
+
+def central_speeds(longitudes: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """
+    Daily motion (deg/day) at the inner points of a series of longitudes,
+    by central differences. The first and last entries are the extra edge
+    slices, so the result is two shorter than the input.
+    """
+    delta = (longitudes[2:] - longitudes[:-2] + 180) % 360 - 180
+    return delta / (days[2:] - days[:-2])
+
+
+def interpolate_longitudes(days: np.ndarray, evaluate: Evaluator, step: int,
+                           ayanamsa: np.ndarray, margin_deg: float) -> Tuple[np.ndarray, int]:
+    """
+    Tropical longitudes (deg) at every time in `days` (sorted, in days).
+    `evaluate(indices)` returns (longitude deg, rate deg/day) at days[indices].
+    `ayanamsa` is one value per time, or one row per sidereal system when the
+    same pass has to be exact for several systems.
+    Returns the longitudes and the number of direct evaluations made.
+    """
+    nodes = node_indices(len(days), step)
+    if len(nodes) == len(days):
+        lon, _ = evaluate(nodes)
+        return lon % 360, len(nodes)
+
+    lon_nodes, rate_nodes = evaluate(nodes)
+    unwrapped = np.degrees(np.unwrap(np.radians(lon_nodes)))
+    lon = hermite(days[nodes], unwrapped, rate_nodes, days)
+    lon[nodes] = unwrapped
+
+    near = (boundary_distance(lon - np.atleast_2d(ayanamsa)) < margin_deg).any(axis=0)
+    near[nodes] = False
+    fallback = np.nonzero(near)[0]
+    if len(fallback):
+        lon[fallback], _ = evaluate(fallback)
+    return lon % 360, len(nodes) + len(fallback)
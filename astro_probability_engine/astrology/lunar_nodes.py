@@ -0,0 +1,56 @@
+import datetime
+import numpy as np
+from typing import Dict, Any, Optional
+from astrology.analytic_ephemeris import J2000_JD, UNIX_EPOCH_JD
+from astrology.ayanamsa import ayanamsa_degrees
+
+# Rahu (ascending node of the Moon) and Ketu (descending node), closed form.
+# Mean node: Meeus 47.7. True node: mean node plus the five largest periodic
+# terms of the Moon's orbit (good to ~0.01 deg). No kernel lookups, so the
+# nodes cost next to nothing even over arrays of times.
+
+
+def mean_node(T: np.ndarray) -> np.ndarray:
+    """Mean longitude of the ascending node, ecliptic of date (deg)."""
+    return 125.0445479 - 1934.1362891 * T + 0.0020754 * T ** 2 + T ** 3 / 467441.0 - T ** 4 / 60616000.0
+
+
+def true_node_correction(T: np.ndarray) -> np.ndarray:
+    D = np.radians(297.8501921 + 445267.1114034 * T)
+    M = np.radians(357.5291092 + 35999.0502909 * T)
+    Mp = np.radians(134.9633964 + 477198.8675055 * T)
+    F = np.radians(93.2720950 + 483202.0175233 * T)
+    return (-1.4979 * np.sin(2 * (D - F)) - 0.1500 * np.sin(M) - 0.1226 * np.sin(2 * D)
+            + 0.1176 * np.sin(2 * F) - 0.0801 * np.sin(2 * (Mp - F)))
+
+
+def node_longitudes(jd: np.ndarray, true_node: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Tropical longitudes of date of Rahu and Ketu for an array of Julian
+    Days (TT).
+    """
+    T = (np.asarray(jd, dtype=float) - J2000_JD) / 36525.0
+    rahu = mean_node(T)
+    if true_node:
+        rahu = rahu + true_node_correction(T)
+    rahu = rahu % 360
+    return {"Rahu": rahu, "Ketu": (rahu + 180) % 360}
+
+
+def next_node_ingress(start: datetime.date, true_node: bool = False, horizon_days: int = 800) -> Optional[Dict[str, Any]]:
+    """
+    Next sidereal sign change of Rahu after `start` (DEFAULT_AYANAMSA):
+    current and next rashi (1-12) and the date. Sampled daily in one
+    vectorized pass.
+    """
+    days = np.arange(horizon_days)
+    jd = datetime.datetime.combine(start, datetime.time(12), datetime.timezone.utc).timestamp() / 86400.0 + UNIX_EPOCH_JD + days
+    rashis = ((node_longitudes(jd, true_node)["Rahu"] - ayanamsa_degrees(jd)) % 360 // 30).astype(int) + 1
+    changes = np.nonzero(rashis != rashis[0])[0]
+    if not len(changes):
+        return None
+    return {
+        "current_rashi": int(rashis[0]),
+        "next_rashi": int(rashis[changes[0]]),
+        "date": start + datetime.timedelta(days=int(changes[0]))
+    }
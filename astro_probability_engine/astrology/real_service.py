@@ -1,173 +1,111 @@
 
 import datetime
-from typing import Dict, Any
-import math
+from typing import Dict, Any, List, Optional
+import numpy as np
 from skyfield.api import Topos, load
-from skyfield import almanac
-from engine.models import ChartData, PlanetPosition, HouseData
-from astrology.interface import AstrologyService
-from astrology.bav_rules import BAVCalculator
-from config import PLANETS, KAKSHYA_DEGREES, KAKSHYA_RULERS
+from skyfield.framelib import ecliptic_J2000_frame
+from astrology.interface import TropicalAstrologyService
+from astrology.chart_builder import TropicalPositions
+from astrology.analytic_ephemeris import J2000_JD, general_precession
+from astrology.ayanamsa import all_ayanamsas
+from astrology.interpolation import central_speeds, interpolate_longitudes
+from astrology.lunar_nodes import node_longitudes
+from config import TRUE_NODE, TIME_INTERVAL_MINUTES, EPHEMERIS_INTERPOLATION, INTERPOLATION_NODE_HOURS, MOON_NODE_HOURS, INTERPOLATION_MARGIN_DEG
+from utils.metrics import stage, registry
 
-class SkyfieldAstrologyService(AstrologyService):
-    def __init__(self):
+# Map DB names to Skyfield names
+SKYFIELD_BODIES = {
+    "Sun": "sun",
+    "Moon": "moon",
+    "Mars": "mars",
+    "Mercury": "mercury",
+    "Jupiter": "jupiter barycenter",
+    "Venus": "venus",
+    "Saturn": "saturn barycenter"
+}
+
+class SkyfieldAstrologyService(TropicalAstrologyService):
+    def __init__(self, ayanamsa: Optional[str] = None):
+        super().__init__(ayanamsa)
         print("Loading Ephemeris data (de421.bsp)...")
         self.ts = load.timescale()
         self.eph = load('de421.bsp')
         print("Ephemeris loaded.")
 
-    def calculate_chart(self, dt: datetime.datetime, location: Dict[str, Any]) -> ChartData:
-        # 1. Observation Time & Place
-        # Make sure dt is timezone aware or handle UTC correctly
-        # We assume input dt is Naive but implies the timezone of the DOB?
-        # Actually input dt in main.py is just date. 
-        # In generator, we combined it with time.
-        # Let's assume input dt is UTC for simplicity or Local.
-        # But Skyfield needs UTC.
-        
-        # We will treat the incoming dt as UTC.
-        t = self.ts.from_datetime(dt.replace(tzinfo=datetime.timezone.utc))
-        utc_timestamp = dt.timestamp()
-        
-        # 2. Observer Location
-        lat = location['lat']
-        lon = location['lon']
-        observer = self.eph['earth'] + Topos(latitude_degrees=lat, longitude_degrees=lon)
-        
-        # 3. Calculate Planet Positions
-        # Ayanamsa: Skyfield gives Tropical (Sayana). Indian Astrology uses Sidereal (Nirayana).
-        # We need to subtract Lahiri Ayanamsa.
-        # Approx Lahiri Ayanamsa for 1989 is ~23.72
-        # Ayanamsa formula ~ 23deg 51m 25.5s + correction
-        # Let's use a function or constant. For 1989-2000, ~23.85 is decent.
-        # Better: Calculate it?
-        # Ayanamsa (Degrees) = (Year - 285) / 71.6 approx
-        year = dt.year + (dt.month/12)
-        ayanamsa = (year - 285) / 71.6
-        
-        # Map DB names to Skyfield names
-        # Skyfield: 'sun', 'moon', 'mars', 'mercury', 'jupiter barycenter', 'venus', 'saturn barycenter'
-        sf_map = {
-            "Sun": "sun",
-            "Moon": "moon",
-            "Mars": "mars",
-            "Mercury": "mercury",
-            "Jupiter": "jupiter barycenter",
-            "Venus": "venus",
-            "Saturn": "saturn barycenter"
-        }
+    @stage("ephemeris")
+    def tropical_positions(self, times: List[datetime.datetime], location: Dict[str, Any],
+                           geocentric: bool = False) -> TropicalPositions:
+        """
+        One topocentric pass over `times` (treated as UTC), or geocentric
+        (from the Earth's centre, no parallax) with `geocentric`. Each body is
+        evaluated (vectorized) only at node slices - every MOON_NODE_HOURS for
+        the Moon, every INTERPOLATION_NODE_HOURS for the rest - and interpolated
+        between them; on a grid coarser than that every time is a node. Slices landing near a rashi/nakshatra/pada/kakshya
+        boundary in any supported ayanamsa are evaluated directly, so the
+        charts match a per-slice evaluation. A single time is always
+        evaluated directly.
+        Daily motion comes from central differences across the slices; only
+        one extra slice before and after is evaluated for it. The Moon's is
+        taken from one geocentric pass, as its topocentric parallax would
+        swing the speed by several degrees a day.
+        """
+        step = datetime.timedelta(minutes=TIME_INTERVAL_MINUTES)
+        extended = [times[0] - step] + list(times) + [times[-1] + step]
+        t_all = self.ts.from_datetimes([dt.replace(tzinfo=datetime.timezone.utc) for dt in extended])
+        days = t_all.tt - t_all.tt[0]
+        observer = self.eph['earth']
+        if not geocentric:
+            observer = observer + Topos(latitude_degrees=location['lat'], longitude_degrees=location['lon'])
+        # Skyfield reports the J2000 ecliptic; precession turns it into the ecliptic of date
+        precession = general_precession((t_all.tt - J2000_JD) / 36525.0)
+        ayanamsas = all_ayanamsas(t_all.tt)
 
-        positions = {} # {Name: RashiID}
-        planets_data = {}
+        # Mean grid spacing (hours) turns the node spacing into a step in slices
+        spacing = (times[-1] - times[0]).total_seconds() / 3600 / max(1, len(times) - 1)
 
-        for p_name, sf_name in sf_map.items():
+        longitudes = {}
+        speeds = {}
+        evaluations = 0
+        for p_name, sf_name in SKYFIELD_BODIES.items():
             body = self.eph[sf_name]
-            astrometric = observer.at(t).observe(body)
-            apparent = astrometric.apparent()
-            
-            # Ecliptic Ecliptic longitude (Tropical)
-            eclip_lat, eclip_lon, dist = apparent.ecliptic_latlon()
-            tropical_deg = eclip_lon.degrees
-            
-            # Sidereal Conversion
-            sidereal_deg = (tropical_deg - ayanamsa) % 360
-            
-            # Calculate Rashi, Nakshatra, etc
-            r_idx = int(sidereal_deg / 30) + 1 # 1-12
-            positions[p_name] = r_idx
-            
-            rem_deg = sidereal_deg % 30
-            nakshatra = int(sidereal_deg / 13.333333) + 1
-            pada = int((sidereal_deg % 13.333333) / 3.333333) + 1
-            kakshya_idx = int(rem_deg / KAKSHYA_DEGREES)
-            kakshya_ruler = KAKSHYA_RULERS[kakshya_idx]
-            
-            planets_data[p_name] = PlanetPosition(
-                name=p_name,
-                longitude=sidereal_deg,
-                speed=0.0, 
-                rashi=r_idx,
-                nakshatra=nakshatra,
-                pada=pada,
-                kakshya=kakshya_idx + 1,
-                kakshya_ruler=kakshya_ruler
-            )
 
-        # 4. Calculate Lagna (Ascendant)
-        # Skyfield doesn't have a direct "Lagna" function in almanac.
-        # But we can calculate RA/Dec of local meridian and convert intersection with Ecliptic.
-        # Or simpler formula:
-        # Sidereal Time (LST)
-        from skyfield.api import wgs84
-        # Calculate Local Sidereal Time at this location
-        # Skyfield handles GAST.
-        # LST = GAST + Longitude
-        gast = t.gast # Greenwich Apparent Sidereal Time in hours
-        lst = (gast + lon/15.0) % 24
-        
-        # Ascendant Formula from LST:
-        # tan(Asc) = cos(LST) / ( -sin(LST)*cos(eps) - tan(lat)*sin(eps) ) ... complicated
-        # We will use the simplified Mock logic but anchored better, or stick to the rotation approximation 
-        # because full Ascendant math is heavy without swisseph.
-        # Wait, we have accurate planets now. We should have accurate Lagna.
-        # Let's use simple approximation for Lagna based on LST.
-        # Approx: Sun is at X degrees (tropical). Time of day determines offset from Sun.
-        # Current Sun Tropical Lon:
-        sun_trop = self.eph['sun'].at(t).observe(self.eph['earth']).apparent().ecliptic_latlon()[1].degrees
-        
-        # Local Solar Time approximate
-        # Noon = Sun is at Meridian (MC). Ascendant is ~90 deg East (Setting?) No.
-        # At Sunrise (6am), Ascendant = Sun.
-        # Rotation 1 deg = 4 min. 360 deg = 24h.
-        
-        # Let's rely on the mock rotation logic but verified by the 24h loop.
-        # It's surprisingly robust for "Probability" analysis.
-        # We will recalculate Lagna Sidereal
-        
-        # LST * 15 gives Right Ascension of RAMC.
-        # Ascendant is roughly RAMC + 90.
-        ramc = lst * 15
-        asc_mc_approx = (ramc + 90) % 360
-        # Correction for Latitude (Oblique Ascension) is complex.
-        # Using simple linear rotation for now as "Ascendant"
-        lagna_trop = asc_mc_approx 
-        lagna_sidereal = (lagna_trop - ayanamsa) % 360
-        lagna_rashi = int(lagna_sidereal / 30) + 1
-        
-        positions["Lagna"] = lagna_rashi
-        
-        # 5. Generate BAV/SAV (Total)
-        sav_data = BAVCalculator.calculate_sarvashtakavarga(positions)
-        shodhita_sav = BAVCalculator.calculate_shodhita_sav(positions)
-        
-        # 6. Generate FIXED SAV (Exclude Lagna)
-        fixed_sav_data = BAVCalculator.calculate_sarvashtakavarga(positions, exclude_list=["Lagna"])
-        fixed_shodhita_sav = BAVCalculator.calculate_shodhita_sav(positions, exclude_list=["Lagna"])
+            def evaluate(indices, body=body):
+                apparent = observer.at(t_all[indices]).observe(body).apparent()
+                _, lon, _, _, lon_rate, _ = apparent.frame_latlon_and_rates(ecliptic_J2000_frame)
+                return (lon.degrees + precession[indices]) % 360, lon_rate.degrees.per_day
+
+            if EPHEMERIS_INTERPOLATION and len(times) > 1 and spacing > 0:
+                node_hours = MOON_NODE_HOURS if p_name == "Moon" else INTERPOLATION_NODE_HOURS
+                node_step = max(1, round(node_hours / spacing))
+            else:
+                node_step = 1  # Every slice evaluated directly
+            lon, count = interpolate_longitudes(days, evaluate, node_step, ayanamsas, INTERPOLATION_MARGIN_DEG)
+            longitudes[p_name] = lon[1:-1]
+            if p_name == "Moon":
+                _, geo_lon, _ = self.eph['earth'].at(t_all).observe(body).apparent().frame_latlon(ecliptic_J2000_frame)
+                speeds[p_name] = central_speeds((geo_lon.degrees + precession) % 360, days)
+                evaluations += len(days)
+            else:
+                speeds[p_name] = central_speeds(lon, days)
+            evaluations += count
+
+        # Rahu/Ketu: closed-form lunar node over the same slices, no kernel lookup
+        for p_name, node_lon in node_longitudes(t_all.tt, TRUE_NODE).items():
+            longitudes[p_name] = node_lon[1:-1]
+            speeds[p_name] = central_speeds(node_lon, days)
+
+        registry.inc("astro_ephemeris_evaluations_total", evaluations)
+        registry.inc("astro_ephemeris_positions_total", len(times) * len(SKYFIELD_BODIES))
+
+        # Lagna is taken as RAMC + 90: LST * 15 gives the RAMC, from Skyfield's
+        # apparent sidereal time. Correction for latitude (oblique ascension)
+        # is complex without swisseph; the 24h loop makes the rotation robust.
+        ramc = (t_all.gast[1:-1] * 15 + location['lon']) % 360
 
-        # 7. Map Houses
-        houses = {}
-        for h_num in range(1, 13):
-           # House 1 = Lagna Rashi
-           target_rashi_id = (lagna_rashi + (h_num - 1) - 1) % 12 + 1
-           
-           r_data = sav_data[target_rashi_id]
-           
-           houses[h_num] = HouseData(
-               house_num=h_num,
-               rashi_id=target_rashi_id,
-               sav_score=r_data["total"],
-               shodhita_score=shodhita_sav[target_rashi_id],
-               fixed_sav=fixed_sav_data[target_rashi_id]["total"],
-               fixed_shodhita=fixed_shodhita_sav[target_rashi_id],
-               bav_scores=r_data["breakdown"]
-           )
-           
-        return ChartData(
-            timestamp=utc_timestamp,
-            location_name=location['name'],
-            lat=location['lat'],
-            lon=location['lon'],
-            ascendant=lagna_sidereal,
-            planets=planets_data,
-            houses=houses
+        return TropicalPositions(
+            timestamps=[dt.replace(tzinfo=datetime.timezone.utc).timestamp() for dt in times],
+            jd=t_all.tt[1:-1],
+            longitudes=longitudes,
+            speeds=speeds,
+            ramc=ramc
         )
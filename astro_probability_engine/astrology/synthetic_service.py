@@ -0,0 +1,99 @@
+import datetime
+import math
+import random
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+from astrology.interface import TropicalAstrologyService
+from astrology.chart_builder import TropicalPositions
+from astrology.analytic_ephemeris import J2000_JD
+from astrology.lunar_nodes import node_longitudes
+from utils.metrics import stage
+
+J2000 = datetime.datetime(2000, 1, 1, 12, 0)
+
+# Mean elements at J2000: (mean longitude deg, mean motion deg/day, orbit radius AU)
+# Planets move on circular heliocentric orbits; viewing them from the Earth's
+# orbit reproduces elongation limits and retrograde loops.
+HELIOCENTRIC_ELEMENTS = {
+    "Mercury": (252.25084, 4.09233445, 0.38710),
+    "Venus": (181.97973, 1.60213034, 0.72333),
+    "Mars": (355.45332, 0.52403304, 1.52368),
+    "Jupiter": (34.40438, 0.08308676, 5.20260),
+    "Saturn": (49.94432, 0.03346063, 9.55491)
+}
+
+
+class SyntheticAstrologyService(TropicalAstrologyService):
+    """
+    Cheap, deterministic stand-in for SkyfieldAstrologyService.
+    Longitudes come from a closed-form model (mean motions plus the main
+    equation-of-centre terms for the Sun and Moon), accurate to a few
+    degrees, so rashis change on realistic dates. Houses go through the
+    real BAVCalculator. Each seed shifts every body by a fixed phase, so
+    a given (seed, dt, location) always yields the same chart.
+    Use it to benchmark the analyzer, interpreter and web layer without
+    paying for the ephemeris.
+    """
+
+    def __init__(self, seed: int = 0, phase_jitter_deg: float = 1.0, ayanamsa: Optional[str] = None):
+        super().__init__(ayanamsa)
+        rng = random.Random(seed)
+        self.seed = seed
+        self.phases = {name: rng.uniform(-phase_jitter_deg, phase_jitter_deg)
+                       for name in ["Sun", "Moon", "Lagna"] + list(HELIOCENTRIC_ELEMENTS)}
+
+    @staticmethod
+    def _sun_moon(d: float) -> Tuple[float, float]:
+        """Geocentric tropical longitudes of the Sun and Moon, d days from J2000."""
+        g = math.radians(357.529 + 0.98560028 * d)
+        sun = 280.459 + 0.98564736 * d + 1.915 * math.sin(g) + 0.020 * math.sin(2 * g)
+        m_moon = math.radians(134.963 + 13.064993 * d)
+        moon = 218.316 + 13.176396 * d + 6.289 * math.sin(m_moon)
+        return sun % 360, moon % 360
+
+    def tropical_longitudes(self, d: float) -> Dict[str, float]:
+        sun, moon = self._sun_moon(d)
+        longitudes = {"Sun": sun, "Moon": moon}
+
+        # Earth is opposite the Sun; radius ~1 AU
+        earth_lon = math.radians(sun + 180)
+        ex, ey = math.cos(earth_lon), math.sin(earth_lon)
+        for name, (l0, n, radius) in HELIOCENTRIC_ELEMENTS.items():
+            lon = math.radians(l0 + n * d)
+            px, py = radius * math.cos(lon) - ex, radius * math.sin(lon) - ey
+            longitudes[name] = math.degrees(math.atan2(py, px)) % 360
+
+        for name in longitudes:
+            longitudes[name] = (longitudes[name] + self.phases[name]) % 360
+
+        # Rahu/Ketu: the mean node is already closed-form
+        for name, lon in node_longitudes(np.array([d + J2000_JD])).items():
+            longitudes[name] = float(lon[0])
+        return longitudes
+
+    @stage("ephemeris")
+    def tropical_positions(self, times: List[datetime.datetime], location: Dict[str, Any],
+                           geocentric: bool = False) -> TropicalPositions:
+        # Input dt is treated as UTC, like SkyfieldAstrologyService; the model has no parallax
+        offsets = [(dt - J2000).total_seconds() / 86400 for dt in times]
+        longitudes = {}
+        speeds = {}
+        for i, d in enumerate(offsets):
+            today = self.tropical_longitudes(d)
+            tomorrow = self.tropical_longitudes(d + 1)
+            for p_name, tropical_deg in today.items():
+                longitudes.setdefault(p_name, np.zeros(len(times)))[i] = tropical_deg
+                speeds.setdefault(p_name, np.zeros(len(times)))[i] = (tomorrow[p_name] - tropical_deg + 180) % 360 - 180
+
+        # Lagna: same RAMC + 90 rotation as the Skyfield service, from mean sidereal time
+        d = np.array(offsets)
+        gmst = 280.46061837 + 360.98564736629 * d
+        ramc = (gmst + location['lon'] + self.phases["Lagna"]) % 360
+
+        return TropicalPositions(
+            timestamps=[dt.replace(tzinfo=datetime.timezone.utc).timestamp() for dt in times],
+            jd=d + J2000_JD,
+            longitudes=longitudes,
+            speeds=speeds,
+            ramc=ramc
+        )
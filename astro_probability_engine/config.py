@@ -1,6 +1,7 @@
 
 
 import os
+import tempfile
 # Configuration for Temporal & Spatial Sampling Engine
 
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
@@ -22,6 +23,111 @@ ANCHOR_LOCATIONS = [
 # Astrological Constants
 HOUSES_COUNT = 12
 PLANETS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
+NODES = ["Rahu", "Ketu"] # Charted, but not part of Ashtakavarga
+GRAHAS = PLANETS + NODES
+TRUE_NODE = os.environ.get("LUNAR_NODE", "mean") == "true" # "mean" (traditional) or "true"
 KAKSHYA_ZONES_PER_RASHI = 8
 KAKSHYA_DEGREES = 3.75 # 30 degrees / 8
 KAKSHYA_RULERS = ["Saturn", "Jupiter", "Mars", "Sun", "Venus", "Mercury", "Moon", "Lagna"]
+
+# Divisional charts computed for every matrix sample (Shodashvarga, see engine/varga.py)
+VARGA_DIVISIONS = [1, 2, 3, 4, 7, 9, 10, 12, 16, 20, 24, 27, 30, 40, 45, 60]
+
+# Sidereal zodiac: "lahiri", "raman", "kp" or "fagan_bradley" (see astrology/ayanamsa.py)
+DEFAULT_AYANAMSA = os.environ.get("AYANAMSA", "lahiri")
+# Tropical ephemeris passes kept per service (one per date x location), shared by all ayanamsas
+TROPICAL_CACHE_SIZE = 256
+
+# Chart backend: "skyfield" (DE421), "analytic" (series, no kernel file), "synthetic" (seeded model) or "mock"
+ASTRO_SERVICE = os.environ.get("ASTRO_SERVICE", "skyfield")
+SYNTHETIC_SEED = int(os.environ.get("SYNTHETIC_SEED", 0))
+
+# Whole-day ephemeris: bodies are evaluated every N hours (the Moon more often) and
+# interpolated in between; slices within the margin of a rashi/nakshatra/pada/kakshya
+# boundary are evaluated directly. Grids coarser than that (daily transit series) are
+# evaluated at every time. EPHEMERIS_INTERPOLATION=0 evaluates every slice.
+EPHEMERIS_INTERPOLATION = os.environ.get("EPHEMERIS_INTERPOLATION", "1") == "1"
+INTERPOLATION_NODE_HOURS = 12
+MOON_NODE_HOURS = 4
+INTERPOLATION_MARGIN_DEG = 0.02
+
+# Live transits: today's positions and the next ingress of each TRANSIT_PLANETS body,
+# computed once per UTC day and shared by all workers through TRANSIT_SNAPSHOT_PATH
+TRANSIT_SNAPSHOT_PATH = os.environ.get("TRANSIT_SNAPSHOT_PATH", os.path.join(tempfile.gettempdir(), "astro_transits", "snapshot.json"))
+TRANSIT_PLANETS = ["Jupiter", "Saturn", "Rahu"]
+TRANSIT_HORIZON_DAYS = 1100 # Long enough for Saturn's next sign change
+
+# Transit calendar (/api/v1/transit-calendar): daily transit series shared by all users
+TRANSIT_CALENDAR_MAX_DAYS = 1100
+TRANSIT_CALENDAR_CACHE_SIZE = 8 # Start dates whose TRANSIT_CALENDAR_MAX_DAYS series is kept per worker
+TRANSIT_CALENDAR_WEIGHTS = {"Saturn": 1.0, "Jupiter": 1.0, "Moon": 0.5}
+
+# Panchang calendars (/api/v1/panchang): observed from Ujjain, local civil time in IST
+PANCHANG_LOCATION = {"name": "Ujjain", "lat": 23.1765, "lon": 75.7885}
+PANCHANG_UTC_OFFSET_HOURS = 5.5
+PANCHANG_CACHE_SIZE = 4 # Years kept per worker
+
+# Exact birth time mode (one chart instead of the matrix): the IANA zone a birth
+# time is read in when the request names none
+BIRTH_TIMEZONE = os.environ.get("BIRTH_TIMEZONE", "Asia/Kolkata")
+# The matrix samples the calendar day as lived in this IANA zone (slices run from local
+# midnight), unless a request names another; zone offset tables are cached per (zone, year)
+MATRIX_TIMEZONE = os.environ.get("MATRIX_TIMEZONE", BIRTH_TIMEZONE)
+ZONE_TRANSITION_CACHE_SIZE = 256
+
+# Offline birthplace gazetteer (engine/gazetteer.py, /api/v1/places): a GeoNames cities
+# subset, regenerated from a GeoNames dump by tools/build_gazetteer.py
+GAZETTEER_PATH = os.environ.get("GAZETTEER_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cities.tsv"))
+PLACES_MAX_LIMIT = 20
+
+# Per-date feature table (tools/build_feature_table.py). Bump ENGINE_VERSION whenever the
+# analysis changes: the builder then rebuilds every year stamped with another version.
+ENGINE_VERSION = "4"
+FEATURE_TABLE_DIR = os.environ.get("FEATURE_TABLE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "features"))
+DATES_MAX_LIMIT = 10000 # Dates listed per /api/v1/dates response (the count is always complete)
+
+# Yoga catalogue: declarative rules compiled to vectorized predicates (engine/yoga_rules.py)
+YOGA_RULES_PATH = os.environ.get("YOGA_RULES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "yogas.json"))
+
+# Celebrity "cosmic twin" matching (engine/celebrity_index.py): distance bonuses for a
+# shared dominant element / Moon nakshatra, and how many matches the insight lists
+CELEBRITY_DB_PATH = os.environ.get("CELEBRITY_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "celebrities.json"))
+CELEBRITY_ELEMENT_BONUS = 500
+CELEBRITY_NAKSHATRA_BONUS = 250
+CELEBRITY_TOP_K = 3
+
+# Population percentiles (tools/build_percentiles.py): yearly partial histograms and the
+# reduced lookup used by the analyzer; zones are graded by percentile when it exists
+PERCENTILE_DIR = os.environ.get("PERCENTILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "percentiles"))
+PERCENTILE_PATH = os.path.join(PERCENTILE_DIR, "lookup.npz")
+GOLDEN_PERCENTILE = 80
+WEAK_PERCENTILE = 35
+
+# Astrological twins (/api/v1/twins): weight of the universal-nakshatra Jaccard distance,
+# in SAV points, next to the Euclidean distance of the 12 mean fixed-SAV scores
+TWIN_NAKSHATRA_WEIGHT = 5.0
+TWIN_MAX_K = 100
+
+# Batch API (/api/v1/batch)
+BATCH_MAX_ITEMS = int(os.environ.get("BATCH_MAX_ITEMS", 5000))
+BATCH_MAX_CONCURRENCY = int(os.environ.get("BATCH_MAX_CONCURRENCY", 2))
+
+# Memoized Ashtakavarga results, keyed by rashi placements
+BAV_CACHE_SIZE = 4096
+# Memoized narrative sections, keyed by the inputs each section reads (all sections share it)
+NARRATIVE_CACHE_SIZE = int(os.environ.get("NARRATIVE_CACHE_SIZE", 8192))
+
+# Metrics: each worker snapshots to METRICS_DIR so /metrics can merge them
+METRICS_DIR = os.environ.get("METRICS_DIR", os.path.join(tempfile.gettempdir(), "astro_metrics"))
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Request profiling: "X-Profile: 1" + "X-Profile-Token: <PROFILE_SECRET>" profiles one request;
+# PROFILE_SAMPLE_RATE=N additionally samples 1 in N requests (0 disables sampling)
+PROFILE_SECRET = os.environ.get("PROFILE_SECRET")
+PROFILE_SAMPLE_RATE = int(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "astro_profiles"))
+PROFILE_INTERVAL = 0.005  # Stack sampling period (seconds)
+PROFILE_KEEP = 50  # Most recent profiles kept on disk
+
+# Benchmarks: a stage fails the comparison when its median slows by more than this
+BENCH_REGRESSION_PCT = float(os.environ.get("BENCH_REGRESSION_PCT", 15))
@@ -1,12 +1,32 @@
 import math
 import statistics
-from typing import List, Dict, Any
+import numpy as np
+from typing import Callable, List, Dict, Any
 from engine.models import MatrixEntry, ChartData
 from engine.interpreter import AstrologicalInterpreter
+from engine.lazy import LazyGraph
+from engine.arrays import ASHTAKAVARGA_BODIES, matrix_longitudes
+from engine.varga import VARGA_NAMES, varga_rashis
+from engine.yoga_rules import default_rules
+from astrology.bav_rules import BAVCalculator
+from config import GOLDEN_PERCENTILE, PLANETS, TIME_INTERVAL_MINUTES, VARGA_DIVISIONS, WEAK_PERCENTILE
+from utils.metrics import stage
 
 class MatrixAnalyzer:
-    def __init__(self):
-        self.interpreter = AstrologicalInterpreter()
+    def __init__(self, transit_provider=None, percentiles=None):
+        self.interpreter = AstrologicalInterpreter(transit_provider)
+        # PercentileTable (or None): grades scores against all dates instead of fixed thresholds
+        self.percentiles = percentiles
+        self.yoga_rules = default_rules()
+
+    def percentile(self, metric: str, value: float):
+        return round(self.percentiles.percentile(metric, value), 1) if self.percentiles else None
+
+    @staticmethod
+    def strength_tier(mean_fixed: float, percentile=None) -> str:
+        if percentile is not None:
+            return "High" if percentile >= GOLDEN_PERCENTILE else "Avg" if percentile >= WEAK_PERCENTILE else "Low"
+        return "High" if mean_fixed > 30 else "Avg" if mean_fixed > 25 else "Low"
 
     def calculate_ascendant_scenarios(self, matrix: list) -> List[Dict[str, Any]]:
         """
@@ -31,8 +51,8 @@ class MatrixAnalyzer:
             
             ascendant = entry.chart.houses[1].rashi_id
             
-            # Derive Time
-            total_minutes = entry.time_slice_index * 15
+            # Derive Time (local wall-clock time: slices run from local midnight)
+            total_minutes = entry.time_slice_index * TIME_INTERVAL_MINUTES
             hours = total_minutes // 60
             minutes = total_minutes % 60
             time_label = f"{hours:02d}:{minutes:02d}"
@@ -111,66 +131,14 @@ class MatrixAnalyzer:
             "winner_score": winner[1]
         }
 
-    def analyze_yogas(self, matrix: list) -> List[Dict[str, str]]:
+    @stage("yogas")
+    def analyze_yogas(self, matrix: list) -> List[Dict[str, Any]]:
         """
-        Checks for Universal Yogas present in ALL charts.
+        Evaluates the yoga catalogue (data/yogas.json) over every chart of the
+        matrix. Each yoga found carries the fraction of (time, location)
+        charts it holds in; 1.0 means universal for the day.
         """
-        ref = matrix[0]
-        planets = ref.chart.planets
-        yogas = []
-        
-        def get_r(p_name): return planets[p_name].rashi
-        
-        # 1. Budhaditya (Sun + Mercury)
-        if get_r("Sun") == get_r("Mercury"):
-            yogas.append({
-                "name": "Budhaditya Yoga",
-                "desc": "Sun and Mercury in the same sign. Enhances intellect and communication."
-            })
-            
-        # 2. Chandra-Mangala (Moon + Mars)
-        m_r = get_r("Moon")
-        ma_r = get_r("Mars")
-        if m_r == ma_r:
-             yogas.append({
-                "name": "Chandra-Mangala Yoga",
-                "desc": "Moon and Mars conjoined. Earnings through enterprise."
-            })
-        elif abs(m_r - ma_r) == 6:
-             yogas.append({
-                "name": "Chandra-Mangala Yoga (Opposition)",
-                "desc": "Moon and Mars in mutual aspect. High energy for financial gain."
-            })
-            
-        # 3. Gajakesari (Moon + Jupiter) - Check Universality
-        j_r = get_r("Jupiter")
-        is_gaja_universal = True
-        for entry in matrix:
-            curr_moon_r = entry.chart.planets["Moon"].rashi
-            # Distance 1, 4, 7, 10
-            dist = (curr_moon_r - j_r + 12) % 12 + 1
-            if dist not in [1, 4, 7, 10]:
-                is_gaja_universal = False
-                break
-        
-        if is_gaja_universal:
-             yogas.append({
-                "name": "Gajakesari Yoga",
-                "desc": "Moon in angular relationship to Jupiter. Reputation and wisdom."
-            })
-            
-        # 4. Saturn-Mars Link
-        s_r = get_r("Saturn")
-        s_aspects = [(s_r + 2) % 12 + 1, (s_r + 6) % 12 + 1, (s_r + 9) % 12 + 1] # 3, 7, 10
-        m_aspects = [(ma_r + 3) % 12 + 1, (ma_r + 6) % 12 + 1, (ma_r + 7) % 12 + 1] # 4, 7, 8
-        
-        if ma_r in s_aspects or s_r in m_aspects:
-             yogas.append({
-                "name": "Saturn-Mars Mutual Influence",
-                "desc": "High-intensity technical energy. Discipline meets Action."
-            })
-            
-        return yogas
+        return self.yoga_rules.evaluate(matrix)
 
     def calculate_life_activation_windows(self, matrix: list, rashi_stats: dict, dob) -> List[Dict[str, Any]]:
         """
@@ -188,7 +156,7 @@ class MatrixAnalyzer:
         current_positions = {
             "Jupiter": ref.chart.planets["Jupiter"].rashi,
             "Saturn": ref.chart.planets["Saturn"].rashi,
-            "Rahu": 12  # Placeholder, will need actual Rahu position
+            "Rahu": ref.chart.planets["Rahu"].rashi
         }
         
         # 3. Use TODAY as reference for future predictions
@@ -281,13 +249,172 @@ class MatrixAnalyzer:
             "degrees_separation": round(diff, 1)
         }
 
+    # Keys of build_analysis_results, in order; with "narrative", the sections
+    # analyze_sections can compute selectively
+    RESULT_SECTIONS = (
+        "house_analysis", "rashi_analysis", "bav_breakdown", "planet_power", "common_links",
+        "peak_times", "elemental_balance", "directional_strength", "yogas", "yoga_probabilities",
+        "tithi_info", "life_activation_windows", "planetary_strength", "planetary_strength_percentiles",
+        "percentile_basis", "retrograde_planets", "varga_analysis", "dasha_periods"
+    )
+    SECTIONS = RESULT_SECTIONS + ("narrative",)
+    # Exact birth time mode analyzes one chart: spreads over the day's samples do not
+    # exist, and the birth chart itself is reported instead
+    MATRIX_STATISTICS = ("house_analysis", "peak_times")
+    CHART_SECTIONS = (
+        "birth_chart", "rashi_analysis", "bav_breakdown", "planet_power", "common_links",
+        "elemental_balance", "directional_strength", "yogas", "yoga_probabilities",
+        "tithi_info", "life_activation_windows", "planetary_strength", "planetary_strength_percentiles",
+        "percentile_basis", "retrograde_planets", "varga_analysis", "dasha_periods"
+    )
+
     def analyze(self, matrix: List[MatrixEntry], dob=None) -> Dict[str, Any]:
         """
         Main analysis pipeline.
         """
-        sample_count = len(matrix)
-        
-        # 1. House Analysis (SAV & Shodhita)
+        analysis_results = self.build_analysis_results(matrix, dob=dob)
+
+        # 5. Narrative Generation
+        narrative = self.interpreter.generate_narrative(analysis_results)
+
+        return {
+            "sample_count": len(matrix),
+            "narrative": narrative,
+            "yogas_debug": analysis_results["yogas"]
+        }
+
+    def analyze_chart(self, matrix: List[MatrixEntry], dob=None) -> Dict[str, Any]:
+        """
+        Exact birth time mode: the individual report of the one-entry matrix
+        from MatrixGenerator.birth_matrix. Matrix statistics are skipped.
+        """
+        with stage("analyze"):
+            analysis_results = self.analysis_graph(dob, matrix=matrix, birth_chart=True).evaluate(self.CHART_SECTIONS)
+        narrative = self.interpreter.generate_narrative(analysis_results)
+
+        return {
+            "sample_count": len(matrix),
+            "narrative": narrative,
+            "yogas_debug": analysis_results["yogas"]
+        }
+
+    @stage("analyze")
+    def build_analysis_results(self, matrix: List[MatrixEntry], dob=None) -> Dict[str, Any]:
+        """
+        Matrix statistics and advanced metrics (Phases 1-4).
+        Returns the input consumed by AstrologicalInterpreter.generate_narrative.
+        """
+        return self.analysis_graph(dob, matrix=matrix).evaluate(self.RESULT_SECTIONS)
+
+    def analyze_sections(self, sections: List[str], dob, load_matrix: Callable[[], List[MatrixEntry]],
+                         load_reference: Callable[[], List[MatrixEntry]] = None, birth_chart: bool = False) -> Dict[str, Any]:
+        """
+        Only the requested SECTIONS and their inputs. The full matrix is
+        loaded only when a requested section reads it; sections that read the
+        reference chart alone (tithi, dasha, planetary strength...) cost one
+        chart. Computed values are identical to build_analysis_results.
+        With birth_chart, load_matrix returns the one birth chart and the
+        CHART_SECTIONS are available instead.
+        """
+        available = self.CHART_SECTIONS + ("narrative",) if birth_chart else self.SECTIONS
+        if not sections:
+            raise ValueError(f"No sections requested. Available: {', '.join(available)}")
+        unknown = [name for name in sections if name not in available]
+        if unknown:
+            raise ValueError(f"Unknown section(s): {', '.join(unknown)}. Available: {', '.join(available)}")
+        graph = self.analysis_graph(dob, load_matrix=load_matrix, load_reference=load_reference, birth_chart=birth_chart)
+        with stage("analyze"):
+            if "matrix" in graph.requires(sections):
+                graph["matrix"]  # Load it first, so the reference chart is taken from it
+            values = graph.evaluate(sections)
+        # No chart at all when only date-derived sections were requested
+        charts = graph.values["matrix"] if "matrix" in graph.values else graph.values.get("reference", [])
+        return {"sample_count": len(charts), "sections": values}
+
+    def analysis_graph(self, dob=None, matrix: List[MatrixEntry] = None, load_matrix: Callable[[], List[MatrixEntry]] = None,
+                       load_reference: Callable[[], List[MatrixEntry]] = None, birth_chart: bool = False) -> LazyGraph:
+        """
+        The analysis as lazily evaluated nodes. The roots are "matrix" (every
+        chart) and "reference" (its first chart, as a one-entry matrix, or
+        load_reference() when the matrix is not needed). With birth_chart the
+        matrix is the one birth chart, which is also the reference.
+        """
+        def reference():
+            return graph.values["matrix"][:1] if "matrix" in graph.values else load_reference()
+
+        nodes = {
+            "matrix": (load_matrix, ()),
+            "reference": (reference, ()),
+            "house_analysis": (self.calculate_house_analysis, ("matrix",)),
+            "rashi_analysis": (self.calculate_rashi_analysis, ("matrix",)),
+            "bav_breakdown": (self.calculate_bav_breakdown, ("reference",)),
+            "planet_power": (self.calculate_planet_power, ("reference",)),
+            "common_links": (lambda m: {"nakshatra_positions": self.calculate_universal_nakshatras(m)}, ("matrix",)),
+            "peak_times": (self.calculate_ascendant_scenarios, ("matrix",)),
+            "elemental_balance": (self.calculate_elemental_balance, ("reference",)),
+            "directional_strength": (self.calculate_directional_strength, ("matrix",)),
+            "all_yogas": (self.analyze_yogas, ("matrix",)),
+            "yogas": (lambda yogas: [yoga for yoga in yogas if yoga["fraction"] == 1.0], ("all_yogas",)),
+            "yoga_probabilities": (lambda yogas: [yoga for yoga in yogas if yoga["fraction"] < 1.0], ("all_yogas",)),
+            "tithi_info": (self.calculate_moon_phase, ("reference",)),
+            # Life Activation Windows (requires DOB)
+            "life_activation_windows": (lambda ref, rashi_stats: self.calculate_life_activation_windows(ref, rashi_stats, dob) if dob else [],
+                                        ("reference", "rashi_analysis")),
+            # Phase 2: Planetary Strength
+            "planetary_strength": (self.calculate_planetary_strength, ("reference",)),
+            "planetary_strength_percentiles": (lambda strengths: {p: self.percentile("planet_strength", s) for p, s in strengths.items()}
+                                               if self.percentiles else {}, ("planetary_strength",)),
+            "percentile_basis": (lambda: {"start_year": self.percentiles.start_year, "end_year": self.percentiles.end_year}
+                                 if self.percentiles else None, ()),
+            # Retrograde for the whole day (motion reverses only at stations, so this is near-universal)
+            "retrograde_planets": (lambda m: [p for p in PLANETS if all(entry.chart.planets[p].is_retrograde for entry in m)], ("matrix",)),
+            # Divisional charts (Shodashvarga)
+            "varga_analysis": (self.calculate_varga_analysis, ("matrix",)),
+            # Phase 3: Dasha Timeline
+            "dasha_periods": (lambda ref: self.calculate_vimshottari_dasha(dob, ref[0].chart.planets["Moon"].nakshatra) if dob else [],
+                              ("reference",)),
+            # 5. Narrative Generation
+            "narrative": (lambda *results: self.interpreter.generate_narrative(dict(zip(self.RESULT_SECTIONS, results))),
+                          self.RESULT_SECTIONS)
+        }
+        if birth_chart:
+            for name in self.MATRIX_STATISTICS:
+                del nodes[name]
+            nodes["reference"] = (lambda m: m, ("matrix",))
+            nodes["birth_chart"] = (self.calculate_birth_chart, ("matrix",))
+            nodes["narrative"] = (lambda *results: self.interpreter.generate_narrative(dict(zip(self.CHART_SECTIONS, results))),
+                                  self.CHART_SECTIONS)
+        graph = LazyGraph(nodes, **({"matrix": matrix} if matrix is not None else {}))
+        return graph
+
+    def calculate_birth_chart(self, matrix: list) -> Dict[str, Any]:
+        """Ascendant, planet placements (whole-sign houses from the Lagna) and house scores of one exact chart."""
+        chart = matrix[0].chart
+        lagna_rashi = int(chart.ascendant / 30) + 1
+        return {
+            "ascendant": {
+                "rashi": lagna_rashi,
+                "degree": round(chart.ascendant % 30, 2),
+                "nakshatra": int(chart.ascendant / (360 / 27)) + 1
+            },
+            "planets": {
+                p_name: {
+                    "rashi": p.rashi,
+                    "house": (p.rashi - lagna_rashi) % 12 + 1,
+                    "degree": round(p.longitude % 30, 2),
+                    "nakshatra": p.nakshatra,
+                    "pada": p.pada,
+                    "retrograde": p.is_retrograde
+                } for p_name, p in chart.planets.items()
+            },
+            "houses": {
+                h_num: {"rashi_id": h.rashi_id, "sav": h.sav_score, "shodhita": h.shodhita_score}
+                for h_num, h in chart.houses.items()
+            }
+        }
+
+    def calculate_house_analysis(self, matrix: list) -> Dict[int, Dict[str, float]]:
+        """SAV & Shodhita statistics per house."""
         house_stats = {}
         for h_idx in range(1, 13):
             sav_scores = [entry.chart.houses[h_idx].sav_score for entry in matrix] 
@@ -306,26 +433,26 @@ class MatrixAnalyzer:
                 "sho_mean": statistics.mean(sho_scores),
                 "sho_stability": calc_stability(sho_scores)
             }
+        return house_stats
 
-        # 2. Rashi & Planetary Power Analysis
-        rashi_map = {i: [] for i in range(1, 13)}
-        planet_power = {}
-        
-        # Calculate Planet Power from first chart (BAV contribution is constant per day usually)
-        ref_chart = matrix[0].chart
-        rashi_bav_breakdown = {} # rashi_id -> {p_name: score}
+    def calculate_bav_breakdown(self, matrix: list) -> Dict[int, Dict[str, int]]:
+        """rashi_id -> {p_name: bindus}, from the first chart."""
+        return {h.rashi_id: h.bav_scores for h in matrix[0].chart.houses.values()}
 
-        for h in ref_chart.houses.values():
-            rashi_bav_breakdown[h.rashi_id] = h.bav_scores
+    def calculate_planet_power(self, matrix: list) -> Dict[str, int]:
+        """
+        Rashis each planet contributes to. Calculated from the first chart
+        (BAV contribution is constant per day usually).
+        """
+        planet_power = {}
+        for h in matrix[0].chart.houses.values():
             for p_name, score in h.bav_scores.items():
                 if score > 0:
                     planet_power[p_name] = planet_power.get(p_name, 0) + 1
-                    
-        for entry in matrix:
-            for h_data in entry.chart.houses.values():
-                r_id = h_data.rashi_id
-                rashi_map[r_id].append(h_data.sav_score)
-                
+        return planet_power
+
+    def calculate_rashi_analysis(self, matrix: list) -> Dict[int, Dict[str, Any]]:
+        """Fixed SAV/Shodhita statistics per rashi (the "Universal DNA")."""
         rashi_stats = {}
         lords = {
             1: "Mars", 8: "Mars", 2: "Venus", 7: "Venus",
@@ -357,20 +484,25 @@ class MatrixAnalyzer:
                     return (scores.count(mode_val) / len(scores)) * 100
                     
                 stability_pct = calc_stability(fixed_sav_scores)
+                percentile = self.percentile("fixed_sav", mean_fixed)
                 
                 rashi_stats[r_id] = {
                     "mean_score": mean_fixed, # Using fixed as the base "Identity"
                     "mean_shodhita": mean_sho,
                     "total_sav_mean": sum(total_sav_scores) / len(total_sav_scores),
                     "stability_pct": stability_pct,
+                    "percentile": percentile, # Among all dates (None without a percentile table)
+                    "shodhita_percentile": self.percentile("shodhita", mean_sho),
                     "key_insights": {
-                        "strength_tier": "High" if mean_fixed > 30 else "Avg" if mean_fixed > 25 else "Low",
+                        "strength_tier": self.strength_tier(mean_fixed, percentile),
                         "primary_driver": lords.get(r_id, "Unknown"),
                         "fixed_status": "FIXED" if stability_pct >= 70 else "VARIABLE"
                     }
                 }
-            
-        # 3. Universal Nakshatras
+        return rashi_stats
+
+    def calculate_universal_nakshatras(self, matrix: list) -> List[Dict[str, Any]]:
+        """Planets whose nakshatra is the same in every chart."""
         reference_entry = matrix[0]
         reference_planets = list(reference_entry.chart.planets.values()) 
         universal_nakshatras = []
@@ -388,54 +520,53 @@ class MatrixAnalyzer:
                     "planet": p_name,
                     "nakshatra_id": target_nak
                 })
-        
-        
-        # 4. Advanced Metrics
-        ascendant_scenarios = self.calculate_ascendant_scenarios(matrix)
-        element_counts = self.calculate_elemental_balance(matrix)
-        directional_strength = self.calculate_directional_strength(matrix)
-        yogas = self.analyze_yogas(matrix)
-        tithi_info = self.calculate_moon_phase(matrix)
-        
-        # Life Activation Windows (requires DOB)
-        life_windows = []
-        if dob:
-            life_windows = self.calculate_life_activation_windows(matrix, rashi_stats, dob)
-        
-        # Phase 2: Planetary Strength
-        planetary_strength = self.calculate_planetary_strength(matrix)
-        
-        # Phase 3: Dasha Timeline  
-        dasha_periods = []
-        if dob:
-            ref = matrix[0]
-            moon_nak = ref.chart.planets["Moon"].nakshatra
-            dasha_periods = self.calculate_vimshottari_dasha(dob, moon_nak)
-                
-        # 5. Narrative Generation
-        narrative = self.interpreter.generate_narrative({
-            "house_analysis": house_stats,
-            "rashi_analysis": rashi_stats,
-            "bav_breakdown": rashi_bav_breakdown,
-            "planet_power": planet_power, 
-            "common_links": {
-                "nakshatra_positions": universal_nakshatras
-            },
-            "peak_times": ascendant_scenarios, # Renamed
-            "elemental_balance": element_counts,
-            "directional_strength": directional_strength,
-            "yogas": yogas,
-            "tithi_info": tithi_info,
-            "life_activation_windows": life_windows,
-            "planetary_strength": planetary_strength,
-            "dasha_periods": dasha_periods
-        })
+        return universal_nakshatras
 
-        return {
-            "sample_count": sample_count,
-            "narrative": narrative,
-            "yogas_debug": yogas
-        }
+    def calculate_varga_analysis(self, matrix: list) -> Dict[str, Any]:
+        """
+        FIXED/VARIABLE classification extended to the divisional charts.
+        All vargas of all charts come from one vectorized pass over the
+        (charts, bodies) longitude array; per varga, each planet's modal
+        rashi and its stability, the Lagna stability, and the Lagna-excluded
+        SAV per rashi (same 70% threshold as rashi_analysis).
+        """
+        longitudes = matrix_longitudes(matrix)
+        lagna_col = ASHTAKAVARGA_BODIES.index("Lagna")
+        total = len(matrix)
+
+        def stability(values: np.ndarray):
+            counts = np.bincount(values)
+            return int(counts.argmax()), float(counts.max() / total * 100)
+
+        vargas = {}
+        for n, rashis in varga_rashis(longitudes, VARGA_DIVISIONS).items():
+            planets = {}
+            for col, p_name in enumerate(PLANETS):
+                rashi, pct = stability(rashis[:, col])
+                planets[p_name] = {
+                    "rashi": rashi,
+                    "stability_pct": pct,
+                    "status": "FIXED" if pct >= 70 else "VARIABLE"
+                }
+            _, lagna_pct = stability(rashis[:, lagna_col])
+
+            fixed_sav = BAVCalculator.sarvashtakavarga_array(rashis, exclude_list=["Lagna"])
+            rashi_scores = {}
+            for r_idx in range(12):
+                _, pct = stability(fixed_sav[:, r_idx])
+                rashi_scores[r_idx + 1] = {
+                    "mean_score": float(fixed_sav[:, r_idx].mean()),
+                    "stability_pct": pct,
+                    "fixed_status": "FIXED" if pct >= 70 else "VARIABLE"
+                }
+
+            vargas[f"D{n}"] = {
+                "name": VARGA_NAMES[n],
+                "planets": planets,
+                "lagna_stability_pct": lagna_pct,
+                "rashi_scores": rashi_scores
+            }
+        return vargas
     
     def calculate_planetary_strength(self, matrix: list) -> Dict[str, int]:
         """
@@ -469,6 +600,10 @@ class MatrixAnalyzer:
             total_bav = sum([h.bav_scores.get(planet, 0) for h in ref.houses.values()])
             score += min(30, total_bav)  # Cap at 30
             
+            # Chesta Bala: a retrograde planet is closest to Earth and gains strength
+            if p_data.is_retrograde:
+                score += 10
+            
             # Normalize to 0-100
             strengths[planet] = max(0, min(100, score))
             
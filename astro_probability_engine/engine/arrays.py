@@ -0,0 +1,17 @@
+import numpy as np
+from typing import List
+from engine.models import MatrixEntry
+from config import PLANETS
+
+# Columnar views of a matrix, for the vectorized engines. Built once per
+# matrix; rows follow the matrix order.
+
+ASHTAKAVARGA_BODIES = PLANETS + ["Lagna"]
+
+
+def matrix_longitudes(matrix: List[MatrixEntry], bodies: List[str] = ASHTAKAVARGA_BODIES) -> np.ndarray:
+    """Sidereal longitudes (deg), shape (charts, bodies). "Lagna" reads the ascendant."""
+    return np.array([[entry.chart.ascendant if name == "Lagna" else entry.chart.planets[name].longitude
+                      for name in bodies]
+                     for entry in matrix], dtype=float)
+
@@ -0,0 +1,152 @@
+import csv
+import datetime
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Any, Iterator
+from config import BATCH_MAX_ITEMS, BATCH_MAX_CONCURRENCY
+from utils.metrics import collect_timings
+from utils.profiling import current_profile
+
+
+class BatchInputError(ValueError):
+    """Raised when a batch payload cannot be parsed at all."""
+
+
+def _parse_dob(value: Any) -> datetime.date:
+    return datetime.datetime.strptime(str(value).strip(), '%Y-%m-%d').date()
+
+
+def parse_batch_payload(body: str, content_type: str = "") -> List[Dict[str, Any]]:
+    """
+    Parses an uploaded batch into rows of {"id": ..., "dob": "YYYY-MM-DD"}.
+    Accepts a JSON list (strings or {"dob", "id"} objects, optionally wrapped
+    as {"dobs": [...]}) or CSV with a "dob" column (first column otherwise).
+    """
+    text = body.strip()
+    if not text:
+        raise BatchInputError("Batch is empty")
+
+    if "json" in content_type or text[0] in "[{":
+        try:
+            payload = json.loads(text)
+        except ValueError as e:
+            raise BatchInputError(f"Invalid JSON: {e}")
+        if isinstance(payload, dict):
+            payload = payload.get("dobs")
+        if not isinstance(payload, list):
+            raise BatchInputError('Expected a JSON list or {"dobs": [...]}')
+        rows = []
+        for item in payload:
+            if isinstance(item, dict):
+                rows.append({"id": item.get("id"), "dob": item.get("dob")})
+            else:
+                rows.append({"id": None, "dob": item})
+    else:
+        reader = csv.reader(io.StringIO(text))
+        records = [r for r in reader if r and any(cell.strip() for cell in r)]
+        if not records:
+            raise BatchInputError("No rows in batch")
+        header = [cell.strip().lower() for cell in records[0]]
+        if "dob" in header:
+            dob_col = header.index("dob")
+            id_col = header.index("id") if "id" in header else None
+            records = records[1:]
+        else:
+            dob_col, id_col = 0, None
+        rows = [{
+            "id": r[id_col] if id_col is not None and id_col < len(r) else None,
+            "dob": r[dob_col] if dob_col < len(r) else None
+        } for r in records]
+
+    if len(rows) > BATCH_MAX_ITEMS:
+        raise BatchInputError(f"Batch too large ({len(rows)} rows, limit {BATCH_MAX_ITEMS})")
+    return rows
+
+
+class BatchReportRunner:
+    """
+    Runs the report pipeline over a batch of DOBs.
+    Repeated dates are computed once, and dates are processed in calendar
+    order so neighbouring days reuse the warm ephemeris segments and
+    memoized Ashtakavarga tables.
+    """
+
+    def __init__(self, generator, analyzer, max_workers: int = BATCH_MAX_CONCURRENCY):
+        self.generator = generator
+        self.analyzer = analyzer
+        self.max_workers = max(1, max_workers)
+
+    def plan(self, rows: List[Dict[str, Any]]):
+        """
+        Groups rows by date.
+        Returns (jobs, errors): jobs sorted by date as {"dob", "rows", "ids"},
+        errors as ready-to-emit result lines for unparseable rows.
+        """
+        groups = {}
+        errors = []
+        for idx, row in enumerate(rows):
+            try:
+                dob = _parse_dob(row["dob"])
+            except (TypeError, ValueError):
+                errors.append({"rows": [idx], "ids": [row.get("id")], "dob": row.get("dob"),
+                               "error": "Invalid date, expected YYYY-MM-DD"})
+                continue
+            job = groups.setdefault(dob, {"dob": dob, "rows": [], "ids": []})
+            job["rows"].append(idx)
+            job["ids"].append(row.get("id"))
+
+        jobs = [groups[d] for d in sorted(groups)]
+        return jobs, errors
+
+    def build_report(self, dob: datetime.date) -> Dict[str, Any]:
+        matrix = self.generator.generate_matrix(dob)
+        results = self.analyzer.analyze(matrix, dob=dob)
+        return {
+            "sample_count": results["sample_count"],
+            "narrative": results["narrative"]
+        }
+
+    def _run_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        line = {"dob": job["dob"].isoformat(), "rows": job["rows"], "ids": job["ids"]}
+        try:
+            # Worker threads don't see the request's timings, so each job feeds the histograms itself
+            with collect_timings():
+                line.update(self.build_report(job["dob"]))
+        except Exception as e:
+            line["error"] = str(e)
+        return line
+
+    def run(self, rows: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yields one result per distinct date, in completion order.
+        At most max_workers reports are in flight; the rest are submitted
+        in date order as slots free up.
+        """
+        jobs, errors = self.plan(rows)
+        for line in errors:
+            yield line
+
+        pending = iter(jobs)
+        profile = current_profile()
+        # A profiled batch is sampled in its pool threads too
+        initializer = profile.sampler.follow_current_thread if profile else None
+        with ThreadPoolExecutor(max_workers=self.max_workers, initializer=initializer) as pool:
+            in_flight = set()
+            for job in pending:
+                in_flight.add(pool.submit(self._run_job, job))
+                if len(in_flight) >= self.max_workers:
+                    break
+
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                for job in pending:
+                    in_flight.add(pool.submit(self._run_job, job))
+                    if len(in_flight) >= self.max_workers:
+                        break
+
+
+def to_ndjson(line: Dict[str, Any]) -> str:
+    return json.dumps(line, default=str) + "\n"
@@ -0,0 +1,79 @@
+import functools
+import json
+from typing import Dict, Any, List
+import numpy as np
+from config import CELEBRITY_DB_PATH, CELEBRITY_ELEMENT_BONUS, CELEBRITY_NAKSHATRA_BONUS
+
+# Public-figure profiles for the "cosmic twin" match (data/celebrities.json),
+# held as one contiguous float32 stats matrix, stored stat-major (stats,
+# profiles) so the product with the user's stats is a fast BLAS call, plus
+# element and nakshatra codes. A query scores every profile with that one
+# product (|s - u|^2 expanded around precomputed |s|^2), applies the bonuses
+# through precomputed row indices and picks the k best, so it stays well
+# under a millisecond at 50k profiles.
+
+STATS = ["willpower", "intellect", "intuition", "leadership", "wealth_iq", "empathy"]
+ELEMENTS = ["Fire", "Earth", "Air", "Water", "Ether"]
+DEFAULT_STAT = 70 # Missing stats in a profile
+SCAN_K = 8 # Up to this k, repeated argmin beats argpartition
+
+
+class CelebrityIndex:
+    def __init__(self, profiles: List[Dict[str, Any]]):
+        self.profiles = [{"name": p["name"], "trait": p.get("trait", ""), "element": p.get("element", ""),
+                          "nakshatra": p.get("nakshatra", "")} for p in profiles]
+        self.nakshatra_codes = {name: code for code, name in enumerate(sorted({p["nakshatra"] for p in self.profiles}))}
+        self.stats = np.ascontiguousarray(np.array(
+            [[p.get("stats", {}).get(stat, DEFAULT_STAT) for stat in STATS] for p in profiles], dtype=np.float32
+        ).reshape(len(profiles), len(STATS)).T)
+        self.norms = np.einsum("ij,ij->j", self.stats, self.stats)
+        self.elements = np.array([ELEMENTS.index(p["element"]) if p["element"] in ELEMENTS else -1
+                                  for p in self.profiles], dtype=np.int8)
+        self.nakshatras = np.array([self.nakshatra_codes[p["nakshatra"]] for p in self.profiles], dtype=np.int16)
+        # Rows per code, so a bonus is one fancy-indexed subtraction
+        self.element_rows = {code: np.flatnonzero(self.elements == code) for code in range(len(ELEMENTS))}
+        self.nakshatra_rows = {code: np.flatnonzero(self.nakshatras == code) for code in self.nakshatra_codes.values()}
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    @classmethod
+    def load(cls, path: str = CELEBRITY_DB_PATH) -> "CelebrityIndex":
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def distances(self, user_stats: Dict[str, float], element: str = None, nakshatra: str = None) -> np.ndarray:
+        """Squared stat distance to every profile, less the element and Moon nakshatra bonuses."""
+        u = np.array([user_stats.get(stat, DEFAULT_STAT) for stat in STATS], dtype=np.float32)
+        d = self.norms - 2 * (u @ self.stats) + u @ u
+        if element in ELEMENTS:
+            d[self.element_rows[ELEMENTS.index(element)]] -= CELEBRITY_ELEMENT_BONUS
+        if nakshatra in self.nakshatra_codes:
+            d[self.nakshatra_rows[self.nakshatra_codes[nakshatra]]] -= CELEBRITY_NAKSHATRA_BONUS
+        return d
+
+    def top_k(self, user_stats: Dict[str, float], element: str = None, nakshatra: str = None, k: int = 3) -> List[Dict[str, Any]]:
+        """The k closest profiles, best first, each with a similarity percentage (0-99)."""
+        if not len(self) or k <= 0:
+            return []
+        d = self.distances(user_stats, element, nakshatra)
+        k = min(k, len(d))
+        if k <= SCAN_K:
+            best, scores = [], []
+            for _ in range(k):
+                best.append(int(d.argmin()))
+                scores.append(d[best[-1]])
+                d[best[-1]] = np.inf
+            d = np.array(scores)
+        else:
+            best = np.argpartition(d, k - 1)[:k]
+            best = best[np.argsort(d[best], kind="stable")]
+            d = d[best]
+        similarity = np.clip(100 - np.sqrt(np.maximum(d, 0)) / 2, 0, 99).astype(int)
+        return [dict(self.profiles[i], similarity=int(s)) for i, s in zip(best, similarity)]
+
+
+@functools.lru_cache(maxsize=None)
+def default_index() -> CelebrityIndex:
+    """The profiles at CELEBRITY_DB_PATH, loaded once per process."""
+    return CelebrityIndex.load()
@@ -0,0 +1,236 @@
+import ast
+import datetime
+import json
+import os
+import shutil
+from typing import Dict, Any, Callable, List, Optional
+import numpy as np
+from config import ASTRO_SERVICE, DEFAULT_AYANAMSA, ENGINE_VERSION, FEATURE_TABLE_DIR, GRAHAS, TRUE_NODE
+
+# Columnar per-date feature table. One directory per year holds one .npy
+# file per column (memory-mapped on read) and a meta.json stamped with the
+# engine version the year was built with. Queries are boolean/range
+# predicates compiled from a restricted Python expression into numpy masks,
+# evaluated one year's mapped columns at a time.
+
+RASHI_NAMES = ["aries", "taurus", "gemini", "cancer", "leo", "virgo",
+               "libra", "scorpio", "sagittarius", "capricorn", "aquarius", "pisces"]
+
+# Universal yogas (results["yogas"], fraction 1.0 in data/yogas.json), as flag columns
+YOGA_COLUMNS = {
+    "Budhaditya Yoga": "yoga_budhaditya",
+    "Chandra-Mangala Yoga": "yoga_chandra_mangala",
+    "Chandra-Mangala Yoga (Opposition)": "yoga_chandra_mangala_opposition",
+    "Gajakesari Yoga": "yoga_gajakesari",
+    "Saturn-Mars Mutual Influence": "yoga_saturn_mars"
+}
+
+COLUMNS = {
+    "date": "datetime64[D]",
+    **{f"{p_name.lower()}_rashi": "int8" for p_name in GRAHAS},        # Reference chart (1-12)
+    **{f"{p_name.lower()}_nakshatra": "int8" for p_name in GRAHAS},    # Universal nakshatra, 0 if it varies
+    "moon_ref_nakshatra": "int8", # Moon nakshatra in the reference chart
+    **{f"sav_{name}": "float32" for name in RASHI_NAMES},             # Mean fixed SAV
+    **{column: "bool" for column in YOGA_COLUMNS.values()},
+    "tithi": "int8" # 1-30
+}
+DERIVED_COLUMNS = ("year", "month", "day")
+
+
+class QueryError(ValueError):
+    pass
+
+
+def table_version() -> str:
+    """Everything the stored features depend on; a year built under another version is stale."""
+    return f"{ENGINE_VERSION}/{ASTRO_SERVICE}/{DEFAULT_AYANAMSA}/{'true' if TRUE_NODE else 'mean'}_node"
+
+
+def date_features(day: datetime.date, results: Dict[str, Any], matrix: list) -> Dict[str, Any]:
+    """One table row from MatrixAnalyzer.build_analysis_results for `day`."""
+    planets = matrix[0].chart.planets
+    universal = {link["planet"]: link["nakshatra_id"] for link in results["common_links"]["nakshatra_positions"]}
+    yogas = {yoga["name"] for yoga in results["yogas"]}
+    elongation = (planets["Moon"].longitude - planets["Sun"].longitude) % 360
+    row = {"date": np.datetime64(day, "D"), "tithi": int(elongation // 12) + 1,
+           "moon_ref_nakshatra": planets["Moon"].nakshatra}
+    for p_name in GRAHAS:
+        row[f"{p_name.lower()}_rashi"] = planets[p_name].rashi
+        row[f"{p_name.lower()}_nakshatra"] = universal.get(p_name, 0)
+    for r_id, name in enumerate(RASHI_NAMES, start=1):
+        row[f"sav_{name}"] = results["rashi_analysis"][r_id]["mean_score"]
+    for yoga_name, column in YOGA_COLUMNS.items():
+        row[column] = yoga_name in yogas
+    return row
+
+
+def write_year(year: int, rows: List[Dict[str, Any]], directory: str = FEATURE_TABLE_DIR):
+    """Writes one year's columns, then swaps the directory in atomically."""
+    final = os.path.join(directory, str(year))
+    tmp = f"{final}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for column, dtype in COLUMNS.items():
+        np.save(os.path.join(tmp, f"{column}.npy"), np.array([row[column] for row in rows], dtype=dtype))
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+        json.dump({"year": year, "rows": len(rows), "version": table_version(), "columns": list(COLUMNS)}, f)
+    shutil.rmtree(final, ignore_errors=True)
+    os.replace(tmp, final)
+
+
+def year_meta(year: int, directory: str = FEATURE_TABLE_DIR) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(directory, str(year), "meta.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class FeatureTable:
+    """
+    Read side: memory-mapped columns of every year built under the current
+    table_version(); stale years are listed in stale_years and left out
+    until the builder refreshes them. Predicates are
+    evaluated year by year on the mapped files, so a query only holds one
+    year's columns plus the boolean masks in memory.
+    """
+
+    def __init__(self, directory: str = FEATURE_TABLE_DIR):
+        self.directory = directory
+        metas = {}
+        for name in (os.listdir(directory) if os.path.isdir(directory) else []):
+            if name.isdigit():
+                meta = year_meta(int(name), directory)
+                if meta:
+                    metas[int(name)] = meta
+        self.stale_years = sorted(year for year, meta in metas.items() if meta["version"] != table_version())
+        self.years = sorted(year for year in metas if year not in self.stale_years)
+        self.offsets = np.cumsum([0] + [metas[year]["rows"] for year in self.years])
+        self._maps: Dict[str, List[np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def part(self, name: str, k: int) -> np.ndarray:
+        """Column `name` of the k-th built year: the memory-mapped file, or derived from its dates."""
+        if name in DERIVED_COLUMNS:
+            return _derived(name, self.part("date", k))
+        if name not in COLUMNS:
+            raise QueryError(f"Unknown column: {name}")
+        if name not in self._maps:
+            self._maps[name] = [np.load(os.path.join(self.directory, str(year), f"{name}.npy"), mmap_mode="r")
+                                for year in self.years]
+        return self._maps[name][k]
+
+    def column(self, name: str) -> np.ndarray:
+        """Whole column as one in-memory array (a copy), for callers that index across years."""
+        if name not in COLUMNS and name not in DERIVED_COLUMNS:
+            raise QueryError(f"Unknown column: {name}")
+        if not self.years:
+            return np.array([], dtype=COLUMNS.get(name, "int64"))
+        return np.concatenate([self.part(name, k) for k in range(len(self.years))])
+
+    def row_index(self, day: datetime.date) -> Optional[int]:
+        """Row of `day`, or None if its year is not built."""
+        if day.year not in self.years:
+            return None
+        k = self.years.index(day.year)
+        dates = self.part("date", k)
+        target = np.datetime64(day, "D")
+        i = int(np.searchsorted(dates, target))
+        return int(self.offsets[k]) + i if i < len(dates) and dates[i] == target else None
+
+    def mask(self, expression: str) -> np.ndarray:
+        try:
+            tree = ast.parse(expression, mode="eval")
+        except SyntaxError as e:
+            raise QueryError(f"Invalid query: {e.msg}")
+        masks = []
+        # With no year built, still validate against the empty columns
+        for k in range(len(self.years)) or [None]:
+            if k is None:
+                column, rows = self.column, 0
+            else:
+                column, rows = (lambda name: self.part(name, k)), int(self.offsets[k + 1] - self.offsets[k])
+            result = np.broadcast_to(_evaluate(tree.body, column), (rows,))
+            if result.dtype != bool:
+                raise QueryError("Query must be a condition")
+            masks.append(result)
+        return np.concatenate(masks)
+
+    def query(self, expression: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Dates (ISO) matching a predicate such as 'yoga_gajakesari and jupiter_rashi == "Cancer" and sav_aries > 30'."""
+        mask = self.mask(expression)
+        matches = [self.part("date", k)[mask[self.offsets[k]:self.offsets[k + 1]]] for k in range(len(self.years))]
+        matches = np.concatenate(matches) if matches else np.array([], dtype=COLUMNS["date"])
+        return {
+            "count": int(len(matches)),
+            "dates": [str(d) for d in matches[:limit]]
+        }
+
+
+def _derived(name: str, dates: np.ndarray) -> np.ndarray:
+    if name == "year":
+        return dates.astype("datetime64[Y]").astype(int) + 1970
+    months = dates.astype("datetime64[M]")
+    if name == "month":
+        return months.astype(int) % 12 + 1
+    return (dates - months.astype("datetime64[D]")).astype(int) + 1
+
+
+COMPARISONS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Eq: np.equal, ast.NotEq: np.not_equal,
+    ast.Lt: np.less, ast.LtE: np.less_equal,
+    ast.Gt: np.greater, ast.GtE: np.greater_equal,
+    ast.In: lambda a, b: np.isin(a, b), ast.NotIn: lambda a, b: ~np.isin(a, b)
+}
+
+
+def _constant(value: Any) -> Any:
+    if isinstance(value, str):
+        # Rashi names stand for their ids: jupiter_rashi == "Cancer"
+        if value.lower() not in RASHI_NAMES:
+            raise QueryError(f"Unknown rashi: {value}")
+        return RASHI_NAMES.index(value.lower()) + 1
+    if isinstance(value, (bool, int, float)):
+        return value
+    raise QueryError(f"Unsupported constant: {value!r}")
+
+
+def _evaluate(node: ast.AST, column: Callable[[str], np.ndarray]) -> Any:
+    """Whitelisted subset of Python expressions: and/or/not, comparisons, columns and constants."""
+    if isinstance(node, ast.BoolOp):
+        values = [np.asarray(_evaluate(v, column), dtype=bool) for v in node.values]
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        result = values[0]
+        for value in values[1:]:
+            result = combine(result, value)
+        return result
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return ~np.asarray(_evaluate(node.operand, column), dtype=bool)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+        return -_constant(node.operand.value)
+    if isinstance(node, ast.Compare):
+        result = True
+        left = _evaluate(node.left, column)
+        for op, comparator in zip(node.ops, node.comparators):
+            if type(op) not in COMPARISONS:
+                raise QueryError(f"Unsupported comparison: {type(op).__name__}")
+            right = _evaluate(comparator, column)
+            try:
+                compared = COMPARISONS[type(op)](left, right)
+            except TypeError:
+                # e.g. date > 5: numpy cannot compare datetime64 with a number
+                raise QueryError(f"Cannot compare {ast.unparse(node.left)} with {ast.unparse(comparator)}; "
+                                 "use year, month or day for dates")
+            result = np.logical_and(result, compared)
+            left = right
+        return result
+    if isinstance(node, (ast.Tuple, ast.List)):
+        return [_evaluate(element, column) for element in node.elts]
+    if isinstance(node, ast.Name):
+        return column(node.id)
+    if isinstance(node, ast.Constant):
+        return _constant(node.value)
+    raise QueryError(f"Unsupported expression: {type(node).__name__}")
+
@@ -0,0 +1,110 @@
+import bisect
+import functools
+import heapq
+import re
+import unicodedata
+from typing import Dict, Any, List, Optional
+from config import GAZETTEER_PATH, PLACES_MAX_LIMIT
+
+# Offline place-name lookup for birthplaces (data/cities.tsv, a GeoNames
+# cities subset; tools/build_gazetteer.py regenerates it from a GeoNames
+# dump). Every name variant is normalized into one sorted key array, so a
+# prefix is a pair of binary searches; the most populous matches of every
+# prefix up to TOP_PREFIX_LENGTH letters are precomputed, so the broadest
+# queries of an autocomplete are lookups too.
+
+TOP_PREFIX_LENGTH = 3
+COLUMNS = ["name", "asciiname", "alternatenames", "country", "admin1", "latitude", "longitude", "population", "timezone"]
+
+
+def normalize(name: str) -> str:
+    """Lowercase ASCII, punctuation to spaces: "São Paulo" and "sao-paulo" share a key."""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", ascii_name.lower()).split())
+
+
+class Gazetteer:
+    def __init__(self, places: List[Dict[str, Any]]):
+        self.places = places
+        self.populations = [p["population"] for p in places]
+        entries = sorted({(key, i) for i, p in enumerate(places)
+                          for key in map(normalize, [p["name"], p["asciiname"], *p["alternatenames"]]) if key})
+        self.keys = [key for key, _ in entries]
+        self.ids = [i for _, i in entries]
+        self.top = {}
+        for prefix in {key[:n] for key in self.keys for n in range(1, TOP_PREFIX_LENGTH + 1)}:
+            self.top[prefix] = self._most_populous(*self._range(prefix), PLACES_MAX_LIMIT)
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    @classmethod
+    def load(cls, path: str = GAZETTEER_PATH) -> "Gazetteer":
+        places = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("#") or not line.strip():
+                    continue
+                row = dict(zip(COLUMNS, line.rstrip("\n").split("\t")))
+                places.append({
+                    "name": row["name"],
+                    "asciiname": row["asciiname"],
+                    "alternatenames": [a for a in row["alternatenames"].split(",") if a],
+                    "country": row["country"],
+                    "admin1": row["admin1"],
+                    "lat": float(row["latitude"]),
+                    "lon": float(row["longitude"]),
+                    "population": int(row["population"] or 0),
+                    "timezone": row["timezone"]
+                })
+        return cls(places)
+
+    def _range(self, key: str):
+        return bisect.bisect_left(self.keys, key), bisect.bisect_left(self.keys, key + "\uffff")
+
+    def _most_populous(self, lo: int, hi: int, limit: int) -> List[int]:
+        """Distinct places among key rows lo:hi, most populous first."""
+        return heapq.nlargest(limit, set(self.ids[lo:hi]), key=lambda i: (self.populations[i], -i))
+
+    def place(self, i: int) -> Dict[str, Any]:
+        p = self.places[i]
+        return {"name": p["name"], "admin1": p["admin1"], "country": p["country"],
+                "lat": p["lat"], "lon": p["lon"], "timezone": p["timezone"]}
+
+    def search(self, query: str, limit: int = 10, country: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Places with a name starting with `query`, most populous first."""
+        key = normalize(query)
+        if not key or limit <= 0:
+            return []
+        if key in self.top and limit <= PLACES_MAX_LIMIT and not country:
+            ids = self.top[key][:limit]
+        else:
+            lo, hi = self._range(key)
+            if country:
+                country = country.upper()
+                ids = heapq.nlargest(limit, {i for i in self.ids[lo:hi] if self.places[i]["country"] == country},
+                                     key=lambda i: (self.populations[i], -i))
+            else:
+                ids = self._most_populous(lo, hi, limit)
+        return [self.place(i) for i in ids]
+
+    def lookup(self, name: str, country: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        The most populous place called exactly `name` (any variant), or
+        None. Qualifiers after commas narrow the match by admin1 or country
+        code: "Pune, Maharashtra, IN" (the form autocomplete's format).
+        """
+        key, *qualifiers = [normalize(part) for part in name.split(",")]
+        lo, hi = bisect.bisect_left(self.keys, key), bisect.bisect_right(self.keys, key)
+        candidates = [i for i in set(self.ids[lo:hi]) if
+                      (not country or self.places[i]["country"] == country.upper()) and
+                      all(q in (normalize(self.places[i]["country"]), normalize(self.places[i]["admin1"])) for q in qualifiers if q)]
+        if not candidates:
+            return None
+        return self.place(max(candidates, key=lambda i: (self.populations[i], -i)))
+
+
+@functools.lru_cache(maxsize=None)
+def default_gazetteer() -> Gazetteer:
+    """The places at GAZETTEER_PATH, parsed and indexed once per process."""
+    return Gazetteer.load()
@@ -1,27 +1,35 @@
 
 import datetime
-from typing import List
-from config import ANCHOR_LOCATIONS
+from typing import Dict, List, Optional
+from config import ANCHOR_LOCATIONS, MATRIX_TIMEZONE
 from astrology.interface import AstrologyService
 from engine.models import MatrixEntry
 from utils.time_utils import generate_time_slices
+from utils.metrics import registry
 
 class MatrixGenerator:
-    def __init__(self, service: AstrologyService):
+    def __init__(self, service: AstrologyService, timezone: Optional[str] = None):
         self.service = service
+        self.timezone = timezone or MATRIX_TIMEZONE
 
-    def generate_matrix(self, dob: datetime.date) -> List[MatrixEntry]:
+    def generate_matrix(self, dob: datetime.date, ayanamsa: Optional[str] = None,
+                        timezone: Optional[str] = None) -> List[MatrixEntry]:
         """
         Phase 1: The Matrix Generation.
         Iterates 96 time-slices x 20 locations.
         Returns flattened list of 1920 Matrix/Chart entries.
+        `ayanamsa` picks the sidereal system (default: the service's own).
+        The slices cover `dob` as a local calendar day in `timezone`
+        (default: the generator's own).
         """
-        slices = generate_time_slices(dob)
+        slices = generate_time_slices(dob, timezone or self.timezone)
+        # One call per location lets the service evaluate the whole day at once
+        charts = [self.service.calculate_charts(slices, location, ayanamsa) for location in ANCHOR_LOCATIONS]
         matrix = []
 
         for t_idx, time_slice in enumerate(slices):
             for l_idx, location in enumerate(ANCHOR_LOCATIONS):
-                chart = self.service.calculate_chart(time_slice, location)
+                chart = charts[l_idx][t_idx]
                 entry = MatrixEntry(
                     time_slice_index=t_idx,
                     location_index=l_idx,
@@ -29,4 +37,33 @@ class MatrixGenerator:
                 )
                 matrix.append(entry)
         
+        registry.inc("astro_charts_computed_total", len(matrix))
         return matrix
+
+    def reference_matrix(self, dob: datetime.date, ayanamsa: Optional[str] = None,
+                         timezone: Optional[str] = None) -> List[MatrixEntry]:
+        """
+        The first entry of generate_matrix alone (first time-slice, first
+        location), for sections that read only the reference chart.
+        """
+        chart = self.service.calculate_charts(generate_time_slices(dob, timezone or self.timezone)[:1], ANCHOR_LOCATIONS[0], ayanamsa)[0]
+        registry.inc("astro_charts_computed_total", 1)
+        return [MatrixEntry(time_slice_index=0, location_index=0, chart=chart)]
+
+    def birth_matrix(self, birth_utc: datetime.datetime, lat: float, lon: float,
+                     ayanamsa: Optional[str] = None) -> List[MatrixEntry]:
+        """
+        Exact birth time mode: the one chart for a known UTC time and place,
+        as a one-entry matrix.
+        """
+        location = {"name": "Birth place", "lat": lat, "lon": lon}
+        chart = self.service.calculate_charts([birth_utc], location, ayanamsa)[0]
+        registry.inc("astro_charts_computed_total", 1)
+        return [MatrixEntry(time_slice_index=0, location_index=0, chart=chart)]
+
+    def generate_matrices(self, dob: datetime.date, ayanamsas: List[str]) -> Dict[str, List[MatrixEntry]]:
+        """
+        One matrix per ayanamsa. Services with a tropical cache evaluate the
+        ephemeris once; each extra system only re-derives the sidereal charts.
+        """
+        return {system: self.generate_matrix(dob, system) for system in ayanamsas}
@@ -1,5 +1,10 @@
 
+import datetime
+from functools import lru_cache
 from typing import Dict, List, Any
+from astrology.lunar_nodes import next_node_ingress
+from config import GOLDEN_PERCENTILE, NARRATIVE_CACHE_SIZE, TRUE_NODE, WEAK_PERCENTILE
+from utils.metrics import stage
 
 class AstrologicalInterpreter:
     """
@@ -102,7 +107,7 @@ class AstrologicalInterpreter:
     }
 
     # Current Transits (Jan 2026 Reference)
-    # Ideally this comes from a service, but for "Principles" demonstration we define the current context.
+    # Fallback only: live positions come from the transit snapshot (engine/transit_snapshot.py).
     CURRENT_TRANSITS = {
         "Saturn": 12,  # Pisces
         "Jupiter": 3,  # Gemini
@@ -116,15 +121,17 @@ class AstrologicalInterpreter:
         # Kept for compatibility but not primary anymore.
         pass
 
-    def __init__(self):
+    def __init__(self, transit_provider=None):
         # Initialize Native AI Engine (No API Key required)
         from .llm_engine import LLMEngine
         
         # Always available
         self.llm = LLMEngine()
+        # TransitSnapshot (or None): live positions and ingress dates
+        self.transit_provider = transit_provider
 
     # Future Major Transits (Hardcoded for Demo Accuracy)
-    # Source: Standard Ephemeris
+    # Source: Standard Ephemeris. Fallback when no transit snapshot is available.
     FUTURE_TRANSITS = [
         {
             "planet": "Jupiter",
@@ -139,23 +146,66 @@ class AstrologicalInterpreter:
             "next_rashi": 1,     # Aries
             "transition_date": "2028-02-23",
             "description": "Saturn moves from Pisces to Aries"
-        },
-        {
-            "planet": "Rahu",
-            "current_rashi": 11, # Aquarius
-            "next_rashi": 10,    # Capricorn (Retrograde)
-            "transition_date": "2026-10-17",
-            "description": "Rahu moves from Aquarius to Capricorn"
         }
     ]
 
-    def analyze_transit_shift(self, rashi_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    @classmethod
+    def _rashi_name(cls, rashi: int) -> str:
+        return cls.RASHI_NATURE[rashi].split(" ")[0]
+
+    def current_transits(self) -> Dict[str, int]:
+        """Today's rashi per graha from the transit snapshot; CURRENT_TRANSITS if unavailable."""
+        if self.transit_provider:
+            try:
+                return self.transit_provider.current_rashis()
+            except Exception as e:
+                print(f"Transit snapshot unavailable: {e}")
+        return dict(self.CURRENT_TRANSITS)
+
+    def future_transits(self) -> List[Dict[str, Any]]:
+        """
+        Next sign change of each transit planet, from the live snapshot.
+        Without one: FUTURE_TRANSITS plus Rahu's next sign change, computed
+        from the lunar node.
+        """
+        if self.transit_provider:
+            try:
+                return [dict(ingress, description=f"{ingress['planet']} moves from {self._rashi_name(ingress['current_rashi'])} "
+                                                  f"to {self._rashi_name(ingress['next_rashi'])}")
+                        for ingress in self.transit_provider.ingresses()]
+            except Exception as e:
+                print(f"Transit snapshot unavailable: {e}")
+
+        transits = list(self.FUTURE_TRANSITS)
+        ingress = next_node_ingress(datetime.date.today(), TRUE_NODE)
+        if ingress:
+            curr_name = self._rashi_name(ingress["current_rashi"])
+            next_name = self._rashi_name(ingress["next_rashi"])
+            transits.append({
+                "planet": "Rahu",
+                "current_rashi": ingress["current_rashi"],
+                "next_rashi": ingress["next_rashi"], # Retrograde
+                "transition_date": ingress["date"].isoformat(),
+                "description": f"Rahu moves from {curr_name} to {next_name}"
+            })
+        return transits
+
+    @staticmethod
+    def describe_percentile(percentile: float, basis: Dict[str, int]) -> str:
+        """Calibrated wording, e.g. 'top 4% of all dates since 1900'."""
+        if percentile >= 50:
+            return f"top {max(1, round(100 - percentile))}% of all dates since {basis['start_year']}"
+        return f"bottom {max(1, round(percentile))}% of all dates since {basis['start_year']}"
+
+    def analyze_transit_shift(self, rashi_data: Dict[str, Any], percentile_basis: Dict[str, int] = None) -> List[Dict[str, Any]]:
         """
         Analyzes the SHIFT in fortune.
+        Zones are graded by population percentile when the analyzer has a
+        percentile table (percentile_basis set), else by fixed score thresholds.
         """
         forecasts = []
         
-        for transit in self.FUTURE_TRANSITS:
+        for transit in self.future_transits():
             p = transit['planet']
             # Use Integers for lookup as Analyzer produces Integer keys
             curr_r = int(transit['current_rashi'])
@@ -171,18 +221,27 @@ class AstrologicalInterpreter:
                 if rid in rashi_data: return rashi_data[rid].get('mean_score', 25)
                 if str(rid) in rashi_data: return rashi_data[str(rid)].get('mean_score', 25)
                 return 25
+
+            def get_percentile(rid):
+                entry = rashi_data.get(rid, rashi_data.get(str(rid), {}))
+                return entry.get('percentile') if percentile_basis else None
                 
             curr_score = get_score(curr_r)
             next_score = get_score(next_r)
+            next_pct = get_percentile(next_r)
             
             # 1. Determine Zone Quality
-            def get_zone_type(s):
+            def get_zone_type(s, pct):
+                if pct is not None:
+                    if pct >= GOLDEN_PERCENTILE: return "GOLDEN"
+                    if pct >= WEAK_PERCENTILE: return "AVERAGE"
+                    return "WEAK"
                 if s >= 30: return "GOLDEN"
                 if s >= 25: return "AVERAGE"
                 return "WEAK"
                 
-            curr_zone = get_zone_type(curr_score)
-            next_zone = get_zone_type(next_score)
+            curr_zone = get_zone_type(curr_score, get_percentile(curr_r))
+            next_zone = get_zone_type(next_score, next_pct)
             
             # 2. Determine Trend Logic
             trend = ""
@@ -219,12 +278,16 @@ class AstrologicalInterpreter:
             else:
                 trend = "STABLE"
                 details = f"Conditions remain steady ({curr_score:.1f} -> {next_score:.1f}) for all matters of **{karaka_str}**."
+
+            if next_pct is not None:
+                details += f" The incoming zone ranks in the {self.describe_percentile(next_pct, percentile_basis)}."
                 
             forecasts.append({
                 "header": f"{transit['description']} ({transit['transition_date']})",
                 "trend": trend,
                 "current_score": curr_score,
                 "next_score": next_score,
+                "next_percentile": next_pct,
                 "analysis": details,
                 "karaka_context": karaka_info['karaka']
             })
@@ -251,30 +314,30 @@ class AstrologicalInterpreter:
         "Amavasya": "Ancestors/Void. Good for meditation and secret works."
     }
 
-    def generate_narrative(self, analysis_results: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Generates a comprehensive narrative report.
-        """
-        narrative = {
-            "universal_identity": [],  # Common Links
-            "karma_classification": [], # Phase 5: Fixed vs Variable
-            "strategic_strengths": [], # Rashi Scores (Detailed)
-            "karmic_challenges": [],   # Weak Rashis (Detailed)
-            "transit_timeline": []     # Future Forecast
-        }
-        
-        # 0. Phase 5: Karma Classification (Sanchita vs Prarabdha)
-        rashi_data = analysis_results.get("rashi_analysis", {})
-        bav_breakdown_all = analysis_results.get("bav_breakdown", {})
+    # Narrative section cache. Each section below is a pure function of a
+    # signature holding exactly the inputs it reads, so every date sharing
+    # e.g. the same universal nakshatras or the same top rashis reuses it.
+    @staticmethod
+    def section(name: str, signature: tuple) -> Any:
+        """The section built from `signature`, cached (LRU, NARRATIVE_CACHE_SIZE); a private copy."""
+        return _copy(_cached_section(name, signature))
+
+    @staticmethod
+    def cache_info():
+        return _cached_section.cache_info()
+
+    @staticmethod
+    def cache_clear():
+        _cached_section.cache_clear()
 
-        for r_id_int, stats in rashi_data.items():
-            fixed_status = stats['key_insights'].get('fixed_status', 'VARIABLE')
-            r_name = self.RASHI_NATURE.get(int(r_id_int), f"Rashi {r_id_int}").split(":")[0]
+    @classmethod
+    def _build_karma_classification(cls, signature: tuple) -> List[Dict[str, str]]:
+        entries = []
+        for r_id, fixed_status, bav_items in signature:
+            r_name = cls.RASHI_NATURE.get(r_id, f"Rashi {r_id}").split(":")[0]
             
-            # BAV Analysis
-            bav_scores = bav_breakdown_all.get(r_id_int, {})
             # Sort planets by contribution
-            top_contributors = sorted(bav_scores.items(), key=lambda x: x[1], reverse=True)
+            top_contributors = sorted(bav_items, key=lambda x: x[1], reverse=True)
             # Filter score > 0
             contributors_str = ", ".join([f"{p} ({s})" for p, s in top_contributors if s > 0])
             
@@ -293,22 +356,38 @@ class AstrologicalInterpreter:
                 classification = "**Prarabdha** (Variable/Individual)"
                 insight = f"**Variable Outcome**. While {planet_influence_desc}, the final strength of this house heavily depends on your specific Ascendant."
                 
-            narrative["karma_classification"].append({
+            entries.append({
                 "rashi": r_name,
                 "status": classification,
                 "insight": insight,
                 "bav_details": contributors_str
             })
-        
-        # 1. Full Common Links Analysis
-        common_links = analysis_results.get("common_links", {})
-        nakshatras = common_links.get("nakshatra_positions", [])
-        
-        for item in nakshatras:
-            planet = item['planet']
-            nak_id = item['nakshatra_id']
+        return entries
+
+    @classmethod
+    def build_birth_chart(cls, birth_chart: Dict[str, Any]) -> Dict[str, Any]:
+        """Named placements of an exact chart (MatrixAnalyzer.calculate_birth_chart), by house."""
+        ascendant = birth_chart["ascendant"]
+        planets = sorted(birth_chart["planets"].items(), key=lambda item: item[1]["house"])
+        return {
+            "ascendant": f"{cls._rashi_name(ascendant['rashi'])} {ascendant['degree']:.1f}°",
+            "ascendant_nakshatra": cls.NAKSHATRA_NAMES.get(ascendant["nakshatra"], ""),
+            "placements": [{
+                "planet": p_name,
+                "house": p["house"],
+                "rashi": cls._rashi_name(p["rashi"]),
+                "degree": p["degree"],
+                "nakshatra": f"{cls.NAKSHATRA_NAMES.get(p['nakshatra'], '')} (pada {p['pada']})",
+                "retrograde": p["retrograde"]
+            } for p_name, p in planets]
+        }
+
+    @classmethod
+    def _build_universal_identity(cls, signature: tuple) -> List[str]:
+        entries = []
+        for planet, nak_id in signature:
             # Get Nakshatra name, meaning, and Shakti
-            raw_nak_text = self.NAKSHATRA_MEANINGS.get(nak_id, f"Nakshatra {nak_id}")
+            raw_nak_text = cls.NAKSHATRA_MEANINGS.get(nak_id, f"Nakshatra {nak_id}")
             nak_name = raw_nak_text.split(":")[0]
             
             # Extract Shakti if present (it's in the text)
@@ -318,103 +397,171 @@ class AstrologicalInterpreter:
                 if len(parts) > 1:
                     shakti_segment = parts[1].split("\n")[0].strip()
 
-            p_nature_info = self.PLANET_NATURE.get(planet, {"karaka": "Influence", "desc": "General Energy"})
+            p_nature_info = cls.PLANET_NATURE.get(planet, {"karaka": "Influence", "desc": "General Energy"})
             
             # Concise interpretation
-            entry = (
+            entries.append(
                 f"**{planet} in {nak_name}** - {p_nature_info['karaka']}: "
                 f"{p_nature_info['desc']} Your generation channels {planet}'s energy through {shakti_segment}"
             )
-            narrative["universal_identity"].append(entry)
-                
-        # 2. Strategic Strengths & Challenges (Detailed Elaboration)
-        rashi_data = analysis_results.get("rashi_analysis", {})
-        sorted_rashis = sorted(rashi_data.items(), key=lambda x: x[1]['mean_score'], reverse=True)
-        
-        top3 = sorted_rashis[:3]
-        bot3 = sorted_rashis[-3:]
-        
-        # Helper for Detailed Explanations
-        def explain_strength(r_id, driver):
+        return entries
+
+    @staticmethod
+    def _element(r_id: int) -> str:
+        return "Fire" if r_id in [1,5,9] else "Earth" if r_id in [2,6,10] else "Air" if r_id in [3,7,11] else "Water"
+
+    @classmethod
+    def _build_strategic_strengths(cls, signature: tuple) -> List[str]:
+        entries = []
+        for r_id, score, driver, pct, basis in signature:
+            r_name = cls.RASHI_NATURE.get(r_id, f"Rashi {r_id}")
             # Dynamic text generation based on Rashi nature
-            elem = "Fire" if r_id in [1,5,9] else "Earth" if r_id in [2,6,10] else "Air" if r_id in [3,7,11] else "Water"
+            elem = cls._element(r_id)
             desc = "intuition and emotional connection." # Default for Water
             if elem == "Fire": desc = "action and initiative."
             elif elem == "Earth": desc = "tangible assets and stability."
             elif elem == "Air": desc = "ideas and networks."
             
-            return (f"This zone is a natural powerhouse for you. Because it is supported by **{driver}**, "
-                    f"efforts placed here yield maximum return with minimal friction. "
-                    f"As a {elem} sign, expect results to manifest through {desc}")
-
-        def explain_weakness(r_id, driver):
-             elem = "Fire" if r_id in [1,5,9] else "Earth" if r_id in [2,6,10] else "Air" if r_id in [3,7,11] else "Water"
-             impact = "growth/optimism" # Default
-             if driver == "Mars": impact = "confidence/startups"
-             elif driver == "Venus": impact = "money/relationships"
-             elif driver == "Mercury": impact = "communication/contracts"
-             elif driver == "Moon": impact = "emotional peace"
-             elif driver == "Sun": impact = "authority/ego"
-             elif driver == "Saturn": impact = "structure/career"
-             elif driver == "Jupiter": impact = "growth/optimism"
-             
-             return (f"This is a 'Karmic Bottleneck'. The energy here is restricted or requires double the effort. "
-                     f"Since **{driver}** is the ruler, you may face delays in matters of {impact}. "
-                     "Remedial measure: Patience and deliberate planning.")
-
-        for r_id_str, stats in top3:
-            r_id = int(r_id_str)
-            score = stats['mean_score']
-            r_name = self.RASHI_NATURE.get(r_id, f"Rashi {r_id}")
-            driver = stats['key_insights']['primary_driver']
-            
-            narrative["strategic_strengths"].append(
-                f"**{r_name} (Score: {score:.1f})**: Top-Tier Zone.\n"
-                f"> {explain_strength(r_id, driver)}"
+            tier = "Top-Tier Zone"
+            if basis and pct is not None:
+                tier += f" ({cls.describe_percentile(pct, dict(basis))})"
+            entries.append(
+                f"**{r_name} (Score: {score})**: {tier}.\n"
+                f"> This zone is a natural powerhouse for you. Because it is supported by **{driver}**, "
+                f"efforts placed here yield maximum return with minimal friction. "
+                f"As a {elem} sign, expect results to manifest through {desc}"
             )
+        return entries
 
-        for r_id_str, stats in bot3:
-            r_id = int(r_id_str)
-            score = stats['mean_score']
-            if score < 26: 
-                r_name = self.RASHI_NATURE.get(r_id, f"Rashi {r_id}")
-                driver = stats['key_insights']['primary_driver']
-                narrative["karmic_challenges"].append(
-                    f"**{r_name} (Score: {score:.1f})**: Resistance Zone.\n"
-                    f"> {explain_weakness(r_id, driver)}"
-                )
+    @classmethod
+    def _build_karmic_challenges(cls, signature: tuple) -> List[str]:
+        impacts = {
+            "Mars": "confidence/startups", "Venus": "money/relationships", "Mercury": "communication/contracts",
+            "Moon": "emotional peace", "Sun": "authority/ego", "Saturn": "structure/career", "Jupiter": "growth/optimism"
+        }
+        entries = []
+        for r_id, score, driver, pct, basis in signature:
+            r_name = cls.RASHI_NATURE.get(r_id, f"Rashi {r_id}")
+            zone = "Resistance Zone"
+            if pct is not None:
+                zone += f" ({cls.describe_percentile(pct, dict(basis))})"
+            entries.append(
+                f"**{r_name} (Score: {score})**: {zone}.\n"
+                f"> This is a 'Karmic Bottleneck'. The energy here is restricted or requires double the effort. "
+                f"Since **{driver}** is the ruler, you may face delays in matters of {impacts.get(driver, 'growth/optimism')}. "
+                "Remedial measure: Patience and deliberate planning."
+            )
+        return entries
+
+    @classmethod
+    def _build_power_rank(cls, signature: tuple) -> Dict[str, str]:
+        top_planet, top_score = signature
+        p_nature = cls.PLANET_NATURE.get(top_planet, {"karaka": "Influence", "desc": "Power"})
+        return {
+            "kingmaker": f"**{top_planet}** is the Kingmaker ({top_score} Bindus).",
+            "insight": f"It is the single biggest contributor to the chart's strength. Success comes through {p_nature['desc']}"
+        }
+
+    @staticmethod
+    def _build_elemental_analysis(signature: tuple) -> Dict[str, Any]:
+        elem_counts = dict(signature)
+        total_planets = sum(elem_counts.values())
+        dominant_elem = max(elem_counts, key=elem_counts.get)
+        percent = (elem_counts[dominant_elem] / total_planets) * 100
+        desc_map = {
+            "Fire": "Driven by action and intuition.",
+            "Earth": "Focused on results and stability.",
+            "Air": "Intellectual and social.",
+            "Water": "Emotional and sensitive."
+        }
+        return {
+            "dominant": dominant_elem,
+            "percentage": round(percent, 1),
+            "insight": f"With {percent:.1f}% planets in {dominant_elem}, the core temperament is **{dominant_elem.upper()}**. {desc_map.get(dominant_elem, '')}"
+        }
+
+    @classmethod
+    def _build_varga_signatures(cls, signature: tuple) -> List[Dict[str, Any]]:
+        return [
+            {
+                "varga": f"{key} {name}",
+                "fixed": {p_name: cls._rashi_name(rashi) for p_name, rashi, status in planets if status == "FIXED"},
+                "variable": [p_name for p_name, rashi, status in planets if status == "VARIABLE"]
+            }
+            for key, name, planets in signature
+        ]
+
+    @classmethod
+    def _build_remedies(cls, signature: tuple) -> List[Dict[str, Any]]:
+        return cls.generate_remedies(dict(signature))
+
+    @stage("narrative")
+    def generate_narrative(self, analysis_results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generates a comprehensive narrative report.
+        """
+        narrative = {
+            "universal_identity": [],  # Common Links
+            "karma_classification": [], # Phase 5: Fixed vs Variable
+            "strategic_strengths": [], # Rashi Scores (Detailed)
+            "karmic_challenges": [],   # Weak Rashis (Detailed)
+            "transit_timeline": []     # Future Forecast
+        }
+        
+        # Sections shared by many dates come from the section cache, keyed by a
+        # canonical signature of exactly the inputs each one reads
+        # 0. Phase 5: Karma Classification (Sanchita vs Prarabdha)
+        rashi_data = analysis_results.get("rashi_analysis", {})
+        bav_breakdown_all = analysis_results.get("bav_breakdown", {})
+        birth_chart = analysis_results.get("birth_chart")
+        if birth_chart:
+            # Exact birth time: the individual chart replaces the fixed/variable split
+            narrative["birth_chart"] = self.build_birth_chart(birth_chart)
+        else:
+            narrative["karma_classification"] = self.section("karma_classification", tuple(
+                (int(r_id), stats['key_insights'].get('fixed_status', 'VARIABLE'), tuple(bav_breakdown_all.get(r_id, {}).items()))
+                for r_id, stats in rashi_data.items()
+            ))
+
+        # 1. Full Common Links Analysis
+        common_links = analysis_results.get("common_links", {})
+        nakshatras = common_links.get("nakshatra_positions", [])
+        narrative["universal_identity"] = self.section("universal_identity", tuple(
+            (item['planet'], item['nakshatra_id']) for item in nakshatras
+        ))
+
+        # 2. Strategic Strengths & Challenges (Detailed Elaboration)
+        percentile_basis = analysis_results.get("percentile_basis")
+        sorted_rashis = sorted(rashi_data.items(), key=lambda x: x[1]['mean_score'], reverse=True)
+        basis = tuple(sorted(percentile_basis.items())) if percentile_basis else None
+
+        def zone_signature(r_id, stats, pct):
+            return (int(r_id), f"{stats['mean_score']:.1f}", stats['key_insights']['primary_driver'], pct, basis)
+
+        narrative["strategic_strengths"] = self.section("strategic_strengths", tuple(
+            zone_signature(r_id, stats, stats.get('percentile') if percentile_basis else None)
+            for r_id, stats in sorted_rashis[:3]
+        ))
+        challenges = []
+        for r_id, stats in sorted_rashis[-3:]:
+            pct = stats.get('percentile') if percentile_basis else None
+            if (pct < WEAK_PERCENTILE) if pct is not None else (stats['mean_score'] < 26):
+                challenges.append(zone_signature(r_id, stats, pct))
+        narrative["karmic_challenges"] = self.section("karmic_challenges", tuple(challenges))
 
         # 3. Kingmaker
         p_power = analysis_results.get("planet_power", {})
         if p_power:
-            sorted_power = sorted(p_power.items(), key=lambda x: x[1], reverse=True)
-            top_planet, top_score = sorted_power[0]
-            p_nature = self.PLANET_NATURE.get(top_planet, {"karaka": "Influence", "desc": "Power"})
-            narrative["power_rank"] = {
-                "kingmaker": f"**{top_planet}** is the Kingmaker ({top_score} Bindus).",
-                "insight": f"It is the single biggest contributor to the chart's strength. Success comes through {p_nature['desc']}"
-            }
+            narrative["power_rank"] = self.section("power_rank", max(p_power.items(), key=lambda x: x[1]))
 
         # 4. Transit Timeline
-        narrative["transit_timeline"] = self.analyze_transit_shift(rashi_data)
+        narrative["transit_timeline"] = self.analyze_transit_shift(rashi_data, percentile_basis)
+        narrative["current_transits"] = {p_name: self._rashi_name(rashi) for p_name, rashi in self.current_transits().items()}
         
         # 5. Elemental Balance
         elem_counts = analysis_results.get("elemental_balance", {})
-        total_planets = sum(elem_counts.values())
-        if total_planets > 0:
-            dominant_elem = max(elem_counts, key=elem_counts.get)
-            percent = (elem_counts[dominant_elem] / total_planets) * 100
-            desc_map = {
-                "Fire": "Driven by action and intuition.",
-                "Earth": "Focused on results and stability.",
-                "Air": "Intellectual and social.",
-                "Water": "Emotional and sensitive."
-            }
-            narrative["elemental_analysis"] = {
-                "dominant": dominant_elem,
-                "percentage": round(percent, 1),
-                "insight": f"With {percent:.1f}% planets in {dominant_elem}, the core temperament is **{dominant_elem.upper()}**. {desc_map.get(dominant_elem, '')}"
-            }
+        if sum(elem_counts.values()) > 0:
+            narrative["elemental_analysis"] = self.section("elemental_analysis", tuple(elem_counts.items()))
             
         # 6. Peak Times (Ascendant Scenarios)
         # Format as list of dicts: {asc, time, score}
@@ -435,28 +582,40 @@ class AstrologicalInterpreter:
         
         # 8. Yogas
         narrative["yogas"] = analysis_results.get("yogas", [])
+        # Yogas that depend on the birth time/place: the likelier ones, with their odds
+        narrative["probable_yogas"] = [
+            dict(yoga, probability=round(yoga["fraction"] * 100))
+            for yoga in analysis_results.get("yoga_probabilities", [])
+            if yoga["fraction"] >= 0.25 and yoga.get("category") != "dignity"
+        ][:12]
         
         # 9. Tithi
         tithi_data = analysis_results.get("tithi_info", {})
         tithi_name = tithi_data.get("tithi", "").split(" ")[0] # extract "Dwadashi"
         tithi_meaning = self.TITHI_MEANINGS.get(tithi_name, "A phase of the moon.")
         
-        tithi_data["meaning"] = tithi_meaning
-        narrative["tithi_info"] = tithi_data
+        narrative["tithi_info"] = dict(tithi_data, meaning=tithi_meaning) # Leaves the analysis section untouched
         
         # 10. Life Activation Windows
         narrative["life_activation_windows"] = analysis_results.get("life_activation_windows", [])
         
         # 11. Planetary Strength
         narrative["planetary_strength"] = analysis_results.get("planetary_strength", {})
+        narrative["retrograde_planets"] = analysis_results.get("retrograde_planets", [])
         
+        # Divisional charts: which placements hold for the whole date
+        narrative["varga_signatures"] = self.section("varga_signatures", tuple(
+            (key, varga['name'], tuple((p_name, p["rashi"], p["status"]) for p_name, p in varga["planets"].items()))
+            for key, varga in analysis_results.get("varga_analysis", {}).items()
+        ))
+
         # 12. Dasha Periods
         narrative["dasha_periods"] = analysis_results.get("dasha_periods", [])
         
         
         # 13. Personalized Remedies (based on weak planets)
         planetary_strength = analysis_results.get("planetary_strength", {})
-        narrative["remedies"] = self.generate_remedies(planetary_strength)
+        narrative["remedies"] = self.section("remedies", tuple(planetary_strength.items()))
         
         # 14. Deep Stats for Radar Chart (Shad Bala Based)
         def get_strength(planet, default=50):
@@ -485,13 +644,15 @@ class AstrologicalInterpreter:
         
         # 14. AI Deep Dive (If available)
         if self.llm:
-            narrative["ai_insight"] = self.llm.generate_insight(narrative)
+            with stage("llm"):
+                narrative["ai_insight"] = self.llm.generate_insight(narrative)
         else:
             narrative["ai_insight"] = None
 
         return narrative
     
-    def generate_remedies(self, planetary_strength: Dict[str, int]) -> List[Dict[str, Any]]:
+    @staticmethod
+    def generate_remedies(planetary_strength: Dict[str, int]) -> List[Dict[str, Any]]:
         """
         Generates personalized remedies based on weak planets (strength < 50).
         """
@@ -518,3 +679,16 @@ class AstrologicalInterpreter:
                 
         return remedies
 
+
+def _copy(value: Any) -> Any:
+    """Sections are lists/dicts of immutable leaves: copy the containers only."""
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    return value
+
+
+@lru_cache(maxsize=NARRATIVE_CACHE_SIZE)
+def _cached_section(name: str, signature: tuple) -> Any:
+    return getattr(AstrologicalInterpreter, f"_build_{name}")(signature)
@@ -0,0 +1,34 @@
+from typing import Any, Callable, Dict, Iterable, Set, Tuple
+
+# Minimal lazily evaluated dependency graph. Each node is a function plus the
+# names of the nodes it takes as arguments; a value is computed on first use,
+# at most once, together with exactly the inputs it needs.
+
+Node = Tuple[Callable[..., Any], Tuple[str, ...]]
+
+
+class LazyGraph:
+    def __init__(self, nodes: Dict[str, Node], **values):
+        self.nodes = nodes
+        self.values: Dict[str, Any] = dict(values)
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.values:
+            function, inputs = self.nodes[name]
+            self.values[name] = function(*(self[i] for i in inputs))
+        return self.values[name]
+
+    def requires(self, names: Iterable[str]) -> Set[str]:
+        """Every node `names` depend on, transitively, themselves included."""
+        seen: Set[str] = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name not in seen:
+                seen.add(name)
+                if name not in self.values:
+                    pending.extend(self.nodes[name][1])
+        return seen
+
+    def evaluate(self, names: Iterable[str]) -> Dict[str, Any]:
+        return {name: self[name] for name in names}
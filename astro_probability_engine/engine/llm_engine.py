@@ -1,5 +1,8 @@
+import html
 import random
 from typing import Dict, Any
+from engine.celebrity_index import default_index
+from config import CELEBRITY_TOP_K
 
 class LLMEngine:
     """
@@ -38,51 +41,10 @@ class LLMEngine:
         "Revati": ("The Nurturer", "Safe travel, prosperity, and completion")
     }
     
-    # Celebrity Database with Deep Stats for Matching
-    CELEBRITY_DB = [
-        # FIRE DOMINANT (High Willpower, Leadership)
-        {"name": "Steve Jobs", "trait": "The Innovator", "element": "Fire", "nakshatra": "Purva Phalguni",
-         "stats": {"willpower": 92, "intellect": 88, "intuition": 65, "leadership": 95, "wealth_iq": 85, "empathy": 55}},
-        {"name": "Virat Kohli", "trait": "The Warrior", "element": "Fire", "nakshatra": "Jyeshtha",
-         "stats": {"willpower": 95, "intellect": 70, "intuition": 60, "leadership": 88, "wealth_iq": 75, "empathy": 65}},
-        {"name": "Walt Disney", "trait": "The Dreamer", "element": "Fire", "nakshatra": "Rohini",
-         "stats": {"willpower": 85, "intellect": 78, "intuition": 80, "leadership": 82, "wealth_iq": 90, "empathy": 75}},
-        {"name": "Amitabh Bachchan", "trait": "The Star", "element": "Fire", "nakshatra": "Swati",
-         "stats": {"willpower": 88, "intellect": 75, "intuition": 72, "leadership": 85, "wealth_iq": 78, "empathy": 80}},
-        
-        # AIR DOMINANT (High Intellect)
-        {"name": "Albert Einstein", "trait": "The Genius", "element": "Air", "nakshatra": "Punarvasu",
-         "stats": {"willpower": 75, "intellect": 98, "intuition": 85, "leadership": 60, "wealth_iq": 55, "empathy": 70}},
-        {"name": "Elon Musk", "trait": "The Disruptor", "element": "Air", "nakshatra": "Ardra",
-         "stats": {"willpower": 90, "intellect": 95, "intuition": 70, "leadership": 85, "wealth_iq": 92, "empathy": 45}},
-        {"name": "Oprah Winfrey", "trait": "The Voice", "element": "Air", "nakshatra": "Shravana",
-         "stats": {"willpower": 85, "intellect": 82, "intuition": 88, "leadership": 90, "wealth_iq": 88, "empathy": 95}},
-        {"name": "APJ Abdul Kalam", "trait": "The Missile Man", "element": "Air", "nakshatra": "Ashwini",
-         "stats": {"willpower": 90, "intellect": 92, "intuition": 85, "leadership": 88, "wealth_iq": 50, "empathy": 90}},
-        
-        # EARTH DOMINANT (High Wealth IQ, Leadership)
-        {"name": "Warren Buffett", "trait": "The Oracle", "element": "Earth", "nakshatra": "Dhanishta",
-         "stats": {"willpower": 80, "intellect": 90, "intuition": 88, "leadership": 75, "wealth_iq": 98, "empathy": 65}},
-        {"name": "Ratan Tata", "trait": "The Patriarch", "element": "Earth", "nakshatra": "Magha",
-         "stats": {"willpower": 85, "intellect": 82, "intuition": 75, "leadership": 90, "wealth_iq": 92, "empathy": 88}},
-        
-        # WATER DOMINANT (High Intuition, Empathy)
-        {"name": "Mother Teresa", "trait": "The Saint", "element": "Water", "nakshatra": "Pushya",
-         "stats": {"willpower": 92, "intellect": 70, "intuition": 95, "leadership": 80, "wealth_iq": 40, "empathy": 98}},
-        {"name": "Beyoncé", "trait": "The Icon", "element": "Water", "nakshatra": "Rohini",
-         "stats": {"willpower": 88, "intellect": 75, "intuition": 85, "leadership": 82, "wealth_iq": 90, "empathy": 85}},
-        {"name": "Dalai Lama", "trait": "The Monk", "element": "Water", "nakshatra": "Uttara Bhadrapada",
-         "stats": {"willpower": 88, "intellect": 85, "intuition": 98, "leadership": 85, "wealth_iq": 45, "empathy": 95}},
-        {"name": "Rabindranath Tagore", "trait": "The Poet", "element": "Water", "nakshatra": "Mrigashira",
-         "stats": {"willpower": 70, "intellect": 92, "intuition": 95, "leadership": 65, "wealth_iq": 55, "empathy": 90}},
-        
-        # ETHER (Balanced/Mystical)
-        {"name": "Nikola Tesla", "trait": "The Mystic", "element": "Ether", "nakshatra": "Ardra",
-         "stats": {"willpower": 85, "intellect": 98, "intuition": 95, "leadership": 50, "wealth_iq": 30, "empathy": 60}},
-    ]
-
     def __init__(self, api_key: str = None):
         self.client = None
+        # Public-figure profiles (data/celebrities.json), loaded once per process
+        self.celebrities = default_index()
 
     def generate_insight(self, narrative_data: Dict[str, Any]) -> str:
         try:
@@ -175,31 +137,12 @@ class LLMEngine:
                 "leadership": leadership, "wealth_iq": wealth_iq, "empathy": empathy
             }
             
-            best_match = self.CELEBRITY_DB[0]
-            best_similarity = float('inf')
-            
-            for celeb in self.CELEBRITY_DB:
-                celeb_stats = celeb.get("stats", {})
-                if not celeb_stats:
-                    continue
-                    
-                # Euclidean distance across all 6 stats
-                distance = 0
-                for stat_name in user_stats:
-                    user_val = user_stats[stat_name]
-                    celeb_val = celeb_stats.get(stat_name, 70)
-                    distance += (user_val - celeb_val) ** 2
-                
-                # Add element bonus (favor same element)
-                if celeb["element"] == element:
-                    distance -= 500  # Significant bonus for element match
-                
-                if distance < best_similarity:
-                    best_similarity = distance
-                    best_match = celeb
-            
-            # Calculate match percentage (inverse of distance, normalized)
-            match_pct = max(0, min(99, int(100 - (best_similarity ** 0.5) / 2)))
+            matches = self.celebrities.top_k(user_stats, element, moon_nakshatra, k=CELEBRITY_TOP_K)
+            best_match = matches[0] if matches else {"name": "Unknown", "trait": archetype_name, "similarity": 0}
+            match_pct = best_match["similarity"]
+            also_like = ", ".join(f"{html.escape(m['name'])} ({m['similarity']}%)" for m in matches[1:])
+            also_like_html = (f'<p style="margin: 6px 0 0 0; font-size: 0.9rem; color: var(--text-secondary);">Also resembles: {also_like}</p>'
+                              if also_like else "")
             
             # ============= 6. DASHA-AWARE ADVICE =============
             dasha_planet = current_dasha.get("planet", "Unknown")
@@ -326,7 +269,8 @@ class LLMEngine:
 
 <div style="background: rgba(107, 70, 193, 0.15); border-radius: 12px; padding: 18px; margin-bottom: 15px;">
     <h4 style="color: var(--gold); margin: 0 0 8px 0; font-size: 1rem;">🌟 Your Cosmic Twin</h4>
-    <p style="margin: 0; font-size: 1.1rem;"><strong>{best_match['name']}</strong> <span style="color: var(--text-secondary);">({best_match['trait']})</span></p>
+    <p style="margin: 0; font-size: 1.1rem;"><strong>{html.escape(best_match['name'])}</strong> <span style="color: var(--text-secondary);">({html.escape(best_match['trait'])}, {match_pct}% match)</span></p>
+    {also_like_html}
 </div>
 
 <div style="background: rgba(255, 215, 0, 0.08); border-radius: 12px; padding: 18px; margin-bottom: 15px;">
@@ -12,6 +12,7 @@ class PlanetPosition:
     pada: int # 1-4
     kakshya: int # 1-8
     kakshya_ruler: str # Ruler of the 3.75 deg segment
+    is_retrograde: bool = False # Negative daily motion
 
 @dataclass
 class HouseData:
@@ -0,0 +1,141 @@
+import calendar
+import datetime
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from astrology.interface import AstrologyService
+from astrology.interpolation import hermite
+from engine.interpreter import AstrologicalInterpreter
+from config import PANCHANG_LOCATION, PANCHANG_UTC_OFFSET_HOURS, PANCHANG_CACHE_SIZE
+from utils.metrics import stage
+
+# Panchang (tithi, nakshatra, yoga, karana, vara) for a whole year at once.
+# Sun and Moon come from one hourly ephemeris pass; each element is a
+# fixed-width segment of a monotonic angle (elongation, Moon, Sun + Moon),
+# so its end times are the roots of angle - boundary, found by a vectorized
+# bisection on the cubic Hermite through the hourly samples.
+
+NAKSHATRA_SPAN = 360.0 / 27
+SUNRISE_HOUR = 6.0 # Local mean sunrise; elements are reported as in force at this time
+BISECTION_STEPS = 12 # 1 hour / 2^12 < 1 second
+
+TITHI_NAMES = ["Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi",
+               "Saptami", "Ashtami", "Navami", "Dashami", "Ekadashi", "Dwadashi",
+               "Trayodashi", "Chaturdashi"]
+YOGA_NAMES = ["Vishkumbha", "Priti", "Ayushman", "Saubhagya", "Shobhana", "Atiganda", "Sukarma",
+              "Dhriti", "Shula", "Ganda", "Vriddhi", "Dhruva", "Vyaghata", "Harshana", "Vajra",
+              "Siddhi", "Vyatipata", "Variyana", "Parigha", "Shiva", "Siddha", "Sadhya", "Shubha",
+              "Shukla", "Brahma", "Indra", "Vaidhriti"]
+MOVABLE_KARANAS = ["Bava", "Balava", "Kaulava", "Taitila", "Garaja", "Vanija", "Vishti"]
+VARA_NAMES = ["Somavara", "Mangalavara", "Budhavara", "Guruvara", "Shukravara", "Shanivara", "Ravivara"] # Monday first, as date.weekday()
+
+
+def tithi_name(tithi: int) -> str:
+    if tithi == 15:
+        return "Purnima Shukla"
+    if tithi == 30:
+        return "Amavasya Krishna"
+    return f"{TITHI_NAMES[(tithi - 1) % 15]} {'Shukla' if tithi < 15 else 'Krishna'}"
+
+
+def karana_name(karana: int) -> str:
+    """Karanas 1-60 of the lunar month: one fixed, 7 movable x 8, then three fixed."""
+    if karana == 1:
+        return "Kimstughna"
+    if karana >= 58:
+        return ["Shakuni", "Chatushpada", "Naga"][karana - 58]
+    return MOVABLE_KARANAS[(karana - 2) % 7]
+
+
+NAMES = {
+    "tithi": [tithi_name(i) for i in range(1, 31)],
+    "nakshatra": [AstrologicalInterpreter.NAKSHATRA_NAMES[i] for i in range(1, 28)],
+    "yoga": YOGA_NAMES,
+    "karana": [karana_name(i) for i in range(1, 61)],
+    "vara": VARA_NAMES
+}
+
+
+def segments(hours: np.ndarray, degrees: np.ndarray, span: float, at: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For an increasing angle sampled at `hours`: the 1-based segment in
+    force at each time in `at`, and the hour that segment ends (NaN if not
+    within the samples).
+    """
+    unwrapped = np.degrees(np.unwrap(np.radians(degrees % 360)))
+    rate = np.gradient(unwrapped, hours)
+    k = np.floor(unwrapped / span)
+    brackets = np.nonzero(np.diff(k) != 0)[0]
+    boundary = k[brackets + 1] * span
+    lo, hi = hours[brackets], hours[brackets + 1]
+    for _ in range(BISECTION_STEPS):
+        mid = (lo + hi) / 2
+        crossed = hermite(hours, unwrapped, rate, mid) >= boundary
+        hi = np.where(crossed, mid, hi)
+        lo = np.where(crossed, lo, mid)
+
+    current = (np.floor(hermite(hours, unwrapped, rate, at) / span) % round(360 / span)).astype(int) + 1
+    ends = np.full(len(at), np.nan)
+    following = np.searchsorted(hi, at, side="right")
+    found = following < len(hi)
+    ends[found] = hi[following[found]]
+    return current, ends
+
+
+class PanchangCalendar:
+    """
+    Yearly panchang for one place, as a compact column table cached per year.
+    Sun and Moon are geocentric, in the service's ayanamsa; `location`
+    only picks the ephemeris pass. Dates and end times are in local civil
+    time (UTC + utc_offset_hours).
+    """
+
+    def __init__(self, service: AstrologyService, location: Dict[str, Any] = PANCHANG_LOCATION,
+                 utc_offset_hours: float = PANCHANG_UTC_OFFSET_HOURS):
+        self.service = service
+        self.location = location
+        self.utc_offset_hours = utc_offset_hours
+        self._year = lru_cache(maxsize=PANCHANG_CACHE_SIZE)(self._compute_year)
+
+    def year(self, year: int) -> Dict[str, List[Any]]:
+        return self._year(year)
+
+    def month(self, year: int, month: int) -> Dict[str, List[Any]]:
+        first = (datetime.date(year, month, 1) - datetime.date(year, 1, 1)).days
+        last = first + calendar.monthrange(year, month)[1]
+        return {column: values[first:last] for column, values in self.year(year).items()}
+
+    @stage("panchang")
+    def _compute_year(self, year: int) -> Dict[str, List[Any]]:
+        first = datetime.date(year, 1, 1)
+        n_days = (datetime.date(year + 1, 1, 1) - first).days
+        local_start = datetime.datetime.combine(first, datetime.time())
+        # Hourly grid from local midnight on Jan 1; 3 spare days to find the last days' end times
+        hours = np.arange((n_days + 3) * 24, dtype=float)
+        utc_start = local_start - datetime.timedelta(hours=self.utc_offset_hours)
+        times = [utc_start + datetime.timedelta(hours=h) for h in range(len(hours))]
+        # Geocentric: tithi and the other elements are defined without lunar parallax
+        longitudes = self.service.sidereal_longitudes(times, self.location, geocentric=True)
+        sun, moon = longitudes["Sun"], longitudes["Moon"]
+
+        dates = [first + datetime.timedelta(days=i) for i in range(n_days)]
+        sunrise = np.arange(n_days) * 24.0 + SUNRISE_HOUR
+
+        def local_time(hour: float) -> Optional[str]:
+            if np.isnan(hour):
+                return None
+            return (local_start + datetime.timedelta(hours=float(hour))).isoformat(timespec="minutes")
+
+        table = {
+            "date": [d.isoformat() for d in dates],
+            "vara": [d.weekday() + 1 for d in dates]
+        }
+        elongation = moon - sun
+        for name, degrees, span in (("tithi", elongation, 12.0),
+                                    ("nakshatra", moon, NAKSHATRA_SPAN),
+                                    ("yoga", moon + sun, NAKSHATRA_SPAN),
+                                    ("karana", elongation, 6.0)):
+            current, ends = segments(hours, degrees, span, sunrise)
+            table[name] = current.tolist()
+            table[f"{name}_end"] = [local_time(h) for h in ends]
+        return table
@@ -0,0 +1,121 @@
+import json
+import os
+from typing import Dict, Any, Iterable, List, Optional
+import numpy as np
+from engine.feature_table import table_version
+from config import PERCENTILE_DIR, PERCENTILE_PATH, PLANETS
+
+# Population percentiles of report scores. The offline job
+# (tools/build_percentiles.py) maps every date of a year to fixed-width
+# histograms, saves one partial per year and reduces the partials by
+# addition; the reduced cumulative counts answer "what fraction of all
+# dates scores below x" with one binary search.
+
+# metric: (low, high, bins); values outside are clipped into the end bins
+METRICS = {
+    "fixed_sav": (0.0, 60.0, 600),       # Mean fixed SAV per rashi
+    "shodhita": (0.0, 60.0, 600),        # Mean fixed Shodhita per rashi
+    "planet_strength": (0.0, 101.0, 101)  # MatrixAnalyzer.calculate_planetary_strength, integer 0-100
+}
+
+
+def edges(metric: str) -> np.ndarray:
+    low, high, bins = METRICS[metric]
+    return np.linspace(low, high, bins + 1)
+
+
+def empty_histograms() -> Dict[str, np.ndarray]:
+    return {metric: np.zeros(bins, dtype=np.int64) for metric, (_, _, bins) in METRICS.items()}
+
+
+def date_values(results: Dict[str, Any]) -> Dict[str, List[float]]:
+    """The scored values of one date, from MatrixAnalyzer.build_analysis_results."""
+    rashis = results["rashi_analysis"].values()
+    return {
+        "fixed_sav": [r["mean_score"] for r in rashis],
+        "shodhita": [r["mean_shodhita"] for r in rashis],
+        "planet_strength": [results["planetary_strength"][p] for p in PLANETS]
+    }
+
+
+def add_values(histograms: Dict[str, np.ndarray], values: Dict[str, List[float]]):
+    for metric, metric_values in values.items():
+        low, high, bins = METRICS[metric]
+        idx = ((np.asarray(metric_values, dtype=float) - low) / (high - low) * bins).astype(int)
+        np.add.at(histograms[metric], np.clip(idx, 0, bins - 1), 1)
+
+
+def merge(parts: Iterable[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Histograms are mergeable: the reduce step is a sum."""
+    total = empty_histograms()
+    for part in parts:
+        for metric in total:
+            total[metric] += part[metric]
+    return total
+
+
+def partial_path(year: int, directory: str = PERCENTILE_DIR) -> str:
+    return os.path.join(directory, f"{year}.npz")
+
+
+def save_partial(year: int, histograms: Dict[str, np.ndarray], directory: str = PERCENTILE_DIR):
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f"{year}.{os.getpid()}.tmp.npz")
+    np.savez(tmp_path, version=table_version(), **histograms)
+    os.replace(tmp_path, partial_path(year, directory))
+
+
+def load_partial(year: int, directory: str = PERCENTILE_DIR) -> Optional[Dict[str, np.ndarray]]:
+    """A year's histograms, or None if missing or built by another engine version."""
+    try:
+        with np.load(partial_path(year, directory)) as data:
+            if str(data["version"]) != table_version():
+                return None
+            return {metric: data[metric] for metric in METRICS}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+class PercentileTable:
+    """Reduced lookup: cumulative counts per metric. percentile() is O(log bins)."""
+
+    def __init__(self, cumulative: Dict[str, np.ndarray], start_year: int, end_year: int):
+        self.cumulative = cumulative
+        self.start_year = start_year
+        self.end_year = end_year
+        self.edges = {metric: edges(metric) for metric in cumulative}
+
+    @classmethod
+    def from_histograms(cls, histograms: Dict[str, np.ndarray], start_year: int, end_year: int) -> "PercentileTable":
+        return cls({metric: np.cumsum(h) for metric, h in histograms.items()}, start_year, end_year)
+
+    def percentile(self, metric: str, value: float) -> float:
+        """Share of all scored values (%) below `value`, counting half of its own bin."""
+        cumulative = self.cumulative[metric]
+        total = cumulative[-1]
+        if not total:
+            return 50.0
+        i = int(np.clip(np.searchsorted(self.edges[metric], value, side="right") - 1, 0, len(cumulative) - 1))
+        below = cumulative[i - 1] if i else 0
+        return float(100.0 * (below + 0.5 * (cumulative[i] - below)) / total)
+
+    def save(self, path: str = PERCENTILE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        meta = json.dumps({"start_year": self.start_year, "end_year": self.end_year, "version": table_version()})
+        np.savez(tmp_path, meta=meta, **self.cumulative)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = PERCENTILE_PATH) -> Optional["PercentileTable"]:
+        """The lookup at `path`, or None when it has not been built or was built by another engine version."""
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data["meta"]))
+                cumulative = {metric: data[metric] for metric in METRICS}
+        except (OSError, KeyError, ValueError):
+            return None
+        if meta["version"] != table_version():
+            print(f"Percentile table {path} was built by another engine version; using fixed thresholds until it is rebuilt")
+            return None
+        return cls(cumulative, meta["start_year"], meta["end_year"])
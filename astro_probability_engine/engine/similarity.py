@@ -0,0 +1,104 @@
+import datetime
+from typing import Dict, Any, List, Optional
+import numpy as np
+from engine.feature_table import FeatureTable, RASHI_NAMES
+from config import GRAHAS, TWIN_NAKSHATRA_WEIGHT
+
+SAV_COLUMNS = [f"sav_{name}" for name in RASHI_NAMES]
+NAKSHATRA_COLUMNS = [f"{p_name.lower()}_nakshatra" for p_name in GRAHAS]
+
+
+class TwinIndex:
+    """
+    "Astrological twins": dates whose signature is closest to a given one.
+    Signature = the 12 mean fixed-SAV scores plus the set of universal
+    (graha, nakshatra) placements. Distance = Euclidean SAV distance +
+    TWIN_NAKSHATRA_WEIGHT x Jaccard distance of the nakshatra sets.
+    Brute force over contiguous arrays from the feature table: a full
+    1900-2100 scan is one matrix-vector product, nine column compares and
+    one argpartition.
+    """
+
+    def __init__(self, table: FeatureTable, nakshatra_weight: float = TWIN_NAKSHATRA_WEIGHT):
+        self.table = table
+        self.nakshatra_weight = nakshatra_weight
+        self.sav = np.ascontiguousarray(np.stack([table.column(c) for c in SAV_COLUMNS], axis=1), dtype=np.float32)
+        self.sav_norms = (self.sav ** 2).sum(axis=1)
+        # (grahas, dates): one contiguous row per graha keeps the compares cache-friendly
+        self.nakshatras = np.ascontiguousarray(np.stack([table.column(c) for c in NAKSHATRA_COLUMNS]))
+        self.universal_counts = (self.nakshatras > 0).sum(axis=0)
+        self.dates = np.asarray(table.column("date"))
+        self.decades = np.asarray(table.column("year")) // 10
+        self.moon_nakshatra = np.asarray(table.column("moon_ref_nakshatra"))
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def signature(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Query signature from a feature row (engine.feature_table.date_features)."""
+        return {
+            "date": row["date"],
+            "sav": np.array([row[c] for c in SAV_COLUMNS], dtype=np.float32),
+            "nakshatras": np.array([row[c] for c in NAKSHATRA_COLUMNS]),
+            "moon_nakshatra": row["moon_ref_nakshatra"]
+        }
+
+    def signature_at(self, i: int) -> Dict[str, Any]:
+        return {
+            "date": self.dates[i],
+            "sav": self.sav[i],
+            "nakshatras": self.nakshatras[:, i],
+            "moon_nakshatra": self.moon_nakshatra[i]
+        }
+
+    def distances(self, signature: Dict[str, Any]) -> np.ndarray:
+        query_sav = np.asarray(signature["sav"], dtype=np.float32)
+        # |a - q|^2 = |a|^2 - 2 a.q + |q|^2
+        sq = self.sav_norms - 2 * (self.sav @ query_sav) + query_sav @ query_sav
+        sav_dist = np.sqrt(np.maximum(sq, 0))
+
+        shared = np.zeros(len(self.dates), dtype=np.int8)
+        for row, nakshatra in zip(self.nakshatras, signature["nakshatras"]):
+            if nakshatra:
+                shared += row == nakshatra
+        union = self.universal_counts + int((np.asarray(signature["nakshatras"]) > 0).sum()) - shared
+        jaccard = 1 - np.divide(shared, union, out=np.ones(len(union)), where=union > 0)
+        return sav_dist + self.nakshatra_weight * jaccard
+
+    def top_k(self, signature: Dict[str, Any], k: int = 10, same_decade: bool = False,
+              same_moon_nakshatra: bool = False) -> List[Dict[str, Any]]:
+        dist = self.distances(signature)
+        query_date = np.datetime64(signature["date"], "D")
+        dist[self.dates == query_date] = np.inf  # Not your own twin
+        if same_decade:
+            decade = (query_date.astype("datetime64[Y]").astype(int) + 1970) // 10
+            dist[self.decades != decade] = np.inf
+        if same_moon_nakshatra:
+            dist[self.moon_nakshatra != signature["moon_nakshatra"]] = np.inf
+
+        k = min(k, int(np.isfinite(dist).sum()))
+        if k <= 0:
+            return []
+        nearest = np.argpartition(dist, k - 1)[:k]
+        nearest = nearest[np.argsort(dist[nearest])]
+        return [
+            {
+                "date": str(self.dates[i]),
+                "distance": round(float(dist[i]), 3),
+                "shared_nakshatras": [p_name for p_name, a, b in zip(GRAHAS, self.nakshatras[:, i], signature["nakshatras"])
+                                      if a and a == b]
+            }
+            for i in nearest
+        ]
+
+    def twins_of(self, day: datetime.date, k: int = 10, fallback_row: Optional[Dict[str, Any]] = None,
+                 **filters) -> List[Dict[str, Any]]:
+        """Twins of `day`; dates outside the table need its feature row (fallback_row)."""
+        i = self.table.row_index(day)
+        if i is not None:
+            signature = self.signature_at(i)
+        elif fallback_row is not None:
+            signature = self.signature(fallback_row)
+        else:
+            raise KeyError(f"{day} is not in the feature table")
+        return self.top_k(signature, k, **filters)
@@ -0,0 +1,64 @@
+import datetime
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+import numpy as np
+from astrology.interface import AstrologyService
+from config import ANCHOR_LOCATIONS, TRANSIT_CALENDAR_CACHE_SIZE, TRANSIT_CALENDAR_MAX_DAYS, TRANSIT_CALENDAR_WEIGHTS
+from utils.metrics import stage
+
+
+class TransitCalendar:
+    """
+    Day-by-day transits scored against one date's rashi strengths.
+    The daily transit rashis (shared by every user) come from one batched
+    ephemeris call per start date, over TRANSIT_CALENDAR_MAX_DAYS, and are
+    cached; any horizon is a slice of it. Scoring a DOB is then a table
+    lookup and a weighted sum over the bodies.
+    """
+
+    def __init__(self, service: AstrologyService, location: Dict[str, Any] = ANCHOR_LOCATIONS[0]):
+        self.service = service
+        self.location = location
+        self._series = lru_cache(maxsize=TRANSIT_CALENDAR_CACHE_SIZE)(self._compute_series)
+
+    @stage("transits")
+    def _compute_series(self, start: datetime.date) -> Dict[str, np.ndarray]:
+        # One sample per day at 12:00 UTC over the longest horizon, so every horizon shares it;
+        # a grid this coarse is evaluated at every day, not interpolated
+        noon = datetime.datetime.combine(start, datetime.time(12))
+        times = [noon + datetime.timedelta(days=i) for i in range(TRANSIT_CALENDAR_MAX_DAYS)]
+        longitudes = self.service.sidereal_longitudes(times, self.location)
+        series = {p_name: (lon // 30).astype(np.int8) + 1 for p_name, lon in longitudes.items()}
+        for rashis in series.values():
+            rashis.flags.writeable = False  # Shared by every caller
+        return series
+
+    def series(self, start: datetime.date, days: int) -> Dict[str, np.ndarray]:
+        """Transit rashi (1-12) per graha per day from `start` (read-only views of the cached series)."""
+        return {p_name: rashis[:days] for p_name, rashis in self._series(start).items()}
+
+    def score(self, rashi_analysis: Dict[int, Dict[str, Any]], days: int,
+              start: Optional[datetime.date] = None, weights: Dict[str, float] = TRANSIT_CALENDAR_WEIGHTS) -> Dict[str, Any]:
+        """
+        Compact calendar: daily rashis of every graha, the DOB's mean score
+        of the rashi each weighted body occupies, and their weighted mean.
+        """
+        start = start or datetime.datetime.now(datetime.timezone.utc).date()
+        rashis = self.series(start, days)
+        # Index 0 unused so transit rashis (1-12) index directly
+        table = np.zeros(13)
+        for r_id, stats in rashi_analysis.items():
+            table[int(r_id)] = stats["mean_score"]
+
+        bodies: List[str] = list(weights)
+        body_scores = np.stack([table[rashis[p_name]] for p_name in bodies])
+        w = np.array([weights[p_name] for p_name in bodies])
+        combined = w @ body_scores / w.sum()
+
+        return {
+            "start": start.isoformat(),
+            "days": days,
+            "rashis": {p_name: r.tolist() for p_name, r in rashis.items()},
+            "scores": {p_name: np.round(s, 2).tolist() for p_name, s in zip(bodies, body_scores)},
+            "combined": np.round(combined, 2).tolist()
+        }
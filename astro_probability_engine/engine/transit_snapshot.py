@@ -0,0 +1,109 @@
+import datetime
+import fcntl
+import json
+import os
+import threading
+import numpy as np
+from typing import Dict, Any, List, Optional
+from astrology.interface import AstrologyService
+from config import ANCHOR_LOCATIONS, GRAHAS, TRANSIT_SNAPSHOT_PATH, TRANSIT_PLANETS, TRANSIT_HORIZON_DAYS
+from utils.metrics import registry, stage
+
+
+class TransitSnapshot:
+    """
+    Today's sidereal positions of all grahas plus the next sign change of
+    each TRANSIT_PLANETS body. Computed lazily by the first caller after
+    UTC midnight, kept in memory for the rest of the day and published to
+    the other workers through a JSON file: the first worker to take the
+    file lock computes it, the others read the result.
+    """
+
+    def __init__(self, service: AstrologyService, path: str = TRANSIT_SNAPSHOT_PATH,
+                 location: Dict[str, Any] = ANCHOR_LOCATIONS[0]):
+        self.service = service
+        self.path = path
+        self.location = location
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def get(self, today: Optional[datetime.date] = None) -> Dict[str, Any]:
+        today = today or datetime.datetime.now(datetime.timezone.utc).date()
+        key = today.isoformat()
+        snapshot = self._snapshot
+        if snapshot and snapshot["date"] == key:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._read(key)
+            if snapshot is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(f"{self.path}.lock", "w") as lock_file:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                    # Another worker may have published it while we waited
+                    snapshot = self._read(key)
+                    if snapshot is None:
+                        snapshot = self.compute(today)
+                        self._write(snapshot)
+            self._snapshot = snapshot
+            return snapshot
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return snapshot if snapshot.get("date") == key else None
+
+    def _write(self, snapshot: Dict[str, Any]):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.path)
+
+    @stage("transits")
+    def compute(self, today: datetime.date) -> Dict[str, Any]:
+        """
+        Today's chart at 00:00 UTC for the positions, and one batched
+        ephemeris call over the daily horizon (no houses) for the ingress dates.
+        """
+        start = datetime.datetime.combine(today, datetime.time())
+        days = [start + datetime.timedelta(days=i) for i in range(TRANSIT_HORIZON_DAYS)]
+        chart = self.service.calculate_chart(start, self.location)
+        longitudes = self.service.sidereal_longitudes(days, self.location)
+        registry.inc("astro_transit_snapshots_total")
+
+        positions = {}
+        for p_name in GRAHAS:
+            p = chart.planets[p_name]
+            positions[p_name] = {
+                "longitude": round(p.longitude, 4),
+                "rashi": p.rashi,
+                "nakshatra": p.nakshatra,
+                "is_retrograde": p.is_retrograde
+            }
+
+        ingresses = []
+        for p_name in TRANSIT_PLANETS:
+            rashis = (longitudes[p_name] // 30).astype(int) + 1
+            changes = np.nonzero(rashis != rashis[0])[0]
+            if len(changes):
+                ingresses.append({
+                    "planet": p_name,
+                    "current_rashi": int(rashis[0]),
+                    "next_rashi": int(rashis[changes[0]]),
+                    "transition_date": (today + datetime.timedelta(days=int(changes[0]))).isoformat()
+                })
+
+        return {
+            "date": today.isoformat(),
+            "positions": positions,
+            "ingresses": ingresses
+        }
+
+    def current_rashis(self, today: Optional[datetime.date] = None) -> Dict[str, int]:
+        return {p_name: p["rashi"] for p_name, p in self.get(today)["positions"].items()}
+
+    def ingresses(self, today: Optional[datetime.date] = None) -> List[Dict[str, Any]]:
+        return self.get(today)["ingresses"]
@@ -0,0 +1,88 @@
+import numpy as np
+from typing import Dict, List, Sequence
+from config import VARGA_DIVISIONS
+
+# Shodashvarga (the 16 Parashari divisional charts), fully vectorized.
+# Every varga is a lookup table indexed by (rashi, part): the longitude is
+# converted once to integer arc-seconds, the part within the sign comes
+# from integer division, and the divisional rashi is a single fancy-index.
+# No per-chart Python, so all vargas over a whole matrix cost milliseconds.
+
+ARCSEC_PER_RASHI = 30 * 3600
+ARCSEC_PER_CIRCLE = 12 * ARCSEC_PER_RASHI
+
+VARGA_NAMES = {
+    1: "Rashi", 2: "Hora", 3: "Drekkana", 4: "Chaturthamsa", 7: "Saptamsa",
+    9: "Navamsa", 10: "Dashamsa", 12: "Dwadashamsa", 16: "Shodashamsa",
+    20: "Vimshamsa", 24: "Chaturvimshamsa", 27: "Bhamsa", 30: "Trimshamsa",
+    40: "Khavedamsa", 45: "Akshavedamsa", 60: "Shashtiamsa"
+}
+
+# Trimshamsa: unequal parts, (end degree, rashi index) for odd and even signs
+TRIMSHAMSA_ODD = [(5, 0), (10, 10), (18, 8), (25, 2), (30, 6)]  # Mars, Saturn, Jupiter, Mercury, Venus
+TRIMSHAMSA_EVEN = [(5, 1), (12, 5), (20, 11), (25, 9), (30, 7)]  # Venus, Mercury, Jupiter, Saturn, Mars
+
+
+def _first_rashi(n: int, s: int) -> int:
+    """0-based rashi the first part of sign `s` (0 = Aries) maps to in D`n`."""
+    odd = s % 2 == 0  # Aries, Gemini, ... are the odd signs
+    modality = s % 3  # 0 movable, 1 fixed, 2 dual
+    if n in (1, 3, 4, 12, 60):
+        return s  # D3 steps through the trines, D4 through the kendras
+    if n in (7, 10):
+        return s if odd else s + (6 if n == 7 else 8)
+    if n == 9:
+        return (0, 9, 6, 3)[s % 4]  # Fire from Aries, earth Capricorn, air Libra, water Cancer
+    if n in (16, 45):
+        return (0, 4, 8)[modality]
+    if n == 20:
+        return (0, 8, 4)[modality]
+    if n == 24:
+        return 4 if odd else 3
+    if n == 27:
+        return (0, 3, 6, 9)[s % 4]  # Fire from Aries, earth Cancer, air Libra, water Capricorn
+    if n == 40:
+        return 0 if odd else 6
+    raise ValueError(f"Unsupported varga: D{n}")
+
+
+def _build_table(n: int) -> np.ndarray:
+    """(12, parts) table of 0-based divisional rashis for D`n`."""
+    if n == 2:
+        # Parashari Hora: odd signs Sun (Leo) then Moon (Cancer), even signs the reverse
+        return np.array([[4, 3] if s % 2 == 0 else [3, 4] for s in range(12)])
+    if n == 30:
+        # One column per degree; the unequal parts all end on whole degrees
+        table = np.zeros((12, 30), dtype=int)
+        for s in range(12):
+            start = 0
+            for end, rashi in (TRIMSHAMSA_ODD if s % 2 == 0 else TRIMSHAMSA_EVEN):
+                table[s, start:end] = rashi
+                start = end
+        return table
+    step = {3: 4, 4: 3}.get(n, 1)
+    parts = np.arange(n)
+    return np.array([(_first_rashi(n, s) + step * parts) % 12 for s in range(12)])
+
+
+VARGA_TABLES = {n: _build_table(n) for n in VARGA_NAMES}
+
+
+def varga_rashis(longitudes: np.ndarray, divisions: Sequence[int] = VARGA_DIVISIONS) -> Dict[int, np.ndarray]:
+    """
+    Divisional rashis (1-12) for an array of sidereal longitudes of any
+    shape, typically (charts, bodies). Returns {division: array}.
+    """
+    arcsec = np.floor(np.asarray(longitudes, dtype=float) * 3600).astype(np.int64) % ARCSEC_PER_CIRCLE
+    sign = arcsec // ARCSEC_PER_RASHI
+    within = arcsec % ARCSEC_PER_RASHI
+    result = {}
+    for n in divisions:
+        table = VARGA_TABLES[n]
+        part = within * table.shape[1] // ARCSEC_PER_RASHI
+        result[n] = (table[sign, part] + 1).astype(np.int8)
+    return result
+
+
+def varga_label(n: int) -> str:
+    return f"D{n} {VARGA_NAMES[n]}"
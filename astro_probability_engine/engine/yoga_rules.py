@@ -0,0 +1,305 @@
+import ast
+import functools
+import itertools
+import json
+from typing import Dict, Any, Callable, List, Optional, Sequence
+import numpy as np
+from engine.models import MatrixEntry
+from config import GRAHAS, YOGA_RULES_PATH
+
+# Declarative yoga catalogue (data/yogas.json). Each rule's "when" is a
+# restricted Python expression over chart functions such as house("Mars") or
+# lord(9); it is compiled once into numpy closures that evaluate the rule for
+# every chart of a matrix at the same time. All rules share one evaluation
+# context, so a sub-expression used by many rules (lord(9), house_from("Moon",
+# TARA)) is computed once per matrix.
+
+BODIES = GRAHAS + ["Lagna"]
+LAGNA = BODIES.index("Lagna")
+RASHI_NAMES = ["aries", "taurus", "gemini", "cancer", "leo", "virgo",
+               "libra", "scorpio", "sagittarius", "capricorn", "aquarius", "pisces"]
+
+# Lord (index into BODIES) of rashi 1-12; index 0 unused
+RASHI_LORDS = np.array([-1] + [BODIES.index(p) for p in
+                               ["Mars", "Venus", "Mercury", "Moon", "Sun", "Mercury",
+                                "Venus", "Mars", "Jupiter", "Saturn", "Saturn", "Jupiter"]])
+# Exaltation rashi per body (0 for the Lagna: never); debilitation is the 7th from it
+EXALTATION = np.array([{"Sun": 1, "Moon": 2, "Mars": 10, "Mercury": 6, "Jupiter": 4, "Venus": 12,
+                        "Saturn": 7, "Rahu": 2, "Ketu": 8}.get(name, 0) for name in BODIES])
+DEBILITATION = np.where(EXALTATION > 0, (EXALTATION + 5) % 12 + 1, 0)
+
+# Graha drishti: ASPECTS[body, house counted from the body] (every graha aspects the 7th)
+SPECIAL_ASPECTS = {"Mars": (4, 8), "Jupiter": (5, 9), "Saturn": (3, 10)}
+ASPECTS = np.zeros((len(BODIES), 13), dtype=bool)
+for _i, _name in enumerate(GRAHAS):
+    ASPECTS[_i, [7, *SPECIAL_ASPECTS.get(_name, ())]] = True
+
+
+class YogaRuleError(ValueError):
+    pass
+
+
+class Charts:
+    """Columnar view of a matrix for rule evaluation, plus the shared sub-expression cache."""
+
+    def __init__(self, matrix: List[MatrixEntry]):
+        self.rashi = np.array([[entry.chart.planets[p].rashi for p in GRAHAS] + [entry.chart.houses[1].rashi_id]
+                               for entry in matrix], dtype=np.int64)
+        self.longitude = np.array([[entry.chart.planets[p].longitude for p in GRAHAS] + [entry.chart.ascendant]
+                                   for entry in matrix], dtype=float)
+        self.speed = np.array([[entry.chart.planets[p].speed for p in GRAHAS] + [0.0]
+                               for entry in matrix], dtype=float)
+        self.rows = np.arange(len(matrix))
+        self.cache: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def gather(self, table: np.ndarray, ref: Any) -> np.ndarray:
+        """table[chart, body] for a body reference: one body, a set of bodies, or per-chart bodies."""
+        if isinstance(ref, np.ndarray):
+            return table[self.rows if ref.ndim == 1 else self.rows[:, None], ref]
+        return table[:, list(ref) if isinstance(ref, (tuple, list)) else ref]
+
+
+def _align(a: np.ndarray, b: np.ndarray):
+    """Broadcasts (charts,) against (charts, k)."""
+    a, b = np.asarray(a), np.asarray(b)
+    if a.ndim < b.ndim:
+        a = a[..., None]
+    elif b.ndim < a.ndim:
+        b = b[..., None]
+    return a, b
+
+
+def _bodies(ref: Any) -> Any:
+    return np.asarray(ref) if isinstance(ref, (tuple, list)) else ref
+
+
+def _house_from(charts: Charts, base: Any, ref: Any) -> np.ndarray:
+    base_rashi, rashi = _align(charts.gather(charts.rashi, base), charts.gather(charts.rashi, ref))
+    return (rashi - base_rashi) % 12 + 1
+
+
+def _lord(charts: Charts, house: Any) -> np.ndarray:
+    lagna, house = _align(charts.rashi[:, LAGNA], _bodies(house))
+    return RASHI_LORDS[(lagna + house - 2) % 12 + 1]
+
+
+def _aspects(charts: Charts, source: Any, target: Any) -> np.ndarray:
+    distance = _house_from(charts, source, target)
+    return ASPECTS[np.broadcast_to(_align(_bodies(source), distance)[0], distance.shape), distance]
+
+
+def _dignity(charts: Charts, ref: Any, table: np.ndarray) -> np.ndarray:
+    rashi = charts.gather(charts.rashi, ref)
+    return table[np.broadcast_to(_align(_bodies(ref), rashi)[0], rashi.shape)] == rashi
+
+
+def _own(charts: Charts, ref: Any) -> np.ndarray:
+    lords = RASHI_LORDS[charts.gather(charts.rashi, ref)]
+    return lords == np.broadcast_to(_align(_bodies(ref), lords)[0], lords.shape)
+
+
+def _reduce(values: Any, reducer: Callable) -> Any:
+    values = np.asarray(values)
+    return reducer(values, axis=-1) if values.ndim == 2 else values
+
+
+def _distinct(values: Any) -> np.ndarray:
+    values = np.sort(np.asarray(values), axis=-1)
+    return 1 + (np.diff(values, axis=-1) != 0).sum(axis=-1)
+
+
+# name: (implementation(charts, *args), argument count)
+FUNCTIONS: Dict[str, Any] = {
+    "rashi": (lambda c, ref: c.gather(c.rashi, ref), 1),                      # 1-12
+    "longitude": (lambda c, ref: c.gather(c.longitude, ref), 1),              # Sidereal degrees
+    "house": (lambda c, ref: _house_from(c, LAGNA, ref), 1),                  # 1-12 from the Lagna
+    "house_from": (_house_from, 2),                                           # House of ref counted from base
+    "lord": (_lord, 1),                                                       # Lord of a house from the Lagna
+    "dispositor": (lambda c, ref: RASHI_LORDS[c.gather(c.rashi, ref)], 1),    # Lord of the sign occupied
+    "conjunct": (lambda c, a, b: np.equal(*_align(c.gather(c.rashi, a), c.gather(c.rashi, b))), 2),
+    "aspects": (_aspects, 2),
+    "own": (_own, 1),                                                         # In a sign it rules
+    "exalted": (lambda c, ref: _dignity(c, ref, EXALTATION), 1),
+    "debilitated": (lambda c, ref: _dignity(c, ref, DEBILITATION), 1),
+    "retrograde": (lambda c, ref: c.gather(c.speed, ref) < 0, 1),
+    "any": (lambda c, values: _reduce(values, np.any), 1),
+    "all": (lambda c, values: _reduce(values, np.all), 1),
+    "count": (lambda c, values: _reduce(np.asarray(values, dtype=int), np.sum), 1),
+    "distinct": (lambda c, values: _distinct(values), 1)
+}
+
+@functools.lru_cache(maxsize=None)
+def _membership(values: tuple) -> Optional[np.ndarray]:
+    """Lookup mask for a set of small non-negative ints (houses, rashis, bodies), else None."""
+    if not all(isinstance(v, int) and 0 <= v < 64 for v in values):
+        return None
+    mask = np.zeros(64, dtype=bool)
+    mask[list(values)] = True
+    return mask
+
+
+def _isin(a: Any, values: Any) -> np.ndarray:
+    # One fancy-index instead of np.isin: most rules test membership of a house or rashi
+    a = np.asarray(a)
+    mask = _membership(tuple(values)) if isinstance(values, (tuple, list)) else None
+    return np.take(mask, a, mode="clip") if mask is not None and a.dtype.kind in "iu" else np.isin(a, values)
+
+
+COMPARISONS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Eq: np.equal, ast.NotEq: np.not_equal,
+    ast.Lt: np.less, ast.LtE: np.less_equal,
+    ast.Gt: np.greater, ast.GtE: np.greater_equal,
+    ast.In: _isin, ast.NotIn: lambda a, b: ~_isin(a, b)
+}
+OPERATORS: Dict[type, Callable[[Any, Any], Any]] = {ast.Add: np.add, ast.Sub: np.subtract, ast.Mod: np.mod}
+
+Compiled = Callable[[Charts], Any]
+
+
+def _constant(value: Any) -> Any:
+    """Body names stand for their index, rashi names for their id (1-12)."""
+    if isinstance(value, str):
+        if value in BODIES:
+            return BODIES.index(value)
+        if value.lower() in RASHI_NAMES:
+            return RASHI_NAMES.index(value.lower()) + 1
+        raise YogaRuleError(f"Unknown body or rashi: {value}")
+    if isinstance(value, (bool, int, float)):
+        return value
+    raise YogaRuleError(f"Unsupported constant: {value!r}")
+
+
+def _pairwise(combine: Callable, values: List[Any]) -> Any:
+    result = values[0]
+    for value in values[1:]:
+        result = combine(*_align(result, value))
+    return result
+
+
+def _memoized(node: ast.AST, evaluate: Compiled) -> Compiled:
+    """Identical sub-expressions, in this rule or any other, are evaluated once per Charts."""
+    key = ast.dump(node)
+
+    def cached(c):
+        if key not in c.cache:
+            c.cache[key] = evaluate(c)
+        return c.cache[key]
+    return cached
+
+
+def compile_expression(node: ast.AST, sets: Dict[str, tuple]) -> Compiled:
+    """Whitelisted expression -> closure over a Charts context."""
+    if isinstance(node, ast.BoolOp):
+        parts = [compile_expression(v, sets) for v in node.values]
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        return _memoized(node, lambda c: _pairwise(combine, [np.asarray(part(c), dtype=bool) for part in parts]))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        operand = compile_expression(node.operand, sets)
+        return lambda c: ~np.asarray(operand(c), dtype=bool)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        operand = compile_expression(node.operand, sets)
+        return lambda c: np.negative(operand(c))
+    if isinstance(node, ast.BinOp) and type(node.op) in OPERATORS:
+        left, right, op = compile_expression(node.left, sets), compile_expression(node.right, sets), OPERATORS[type(node.op)]
+        return lambda c: op(*_align(left(c), right(c)))
+    if isinstance(node, ast.Compare):
+        if any(type(op) not in COMPARISONS for op in node.ops):
+            raise YogaRuleError(f"Unsupported comparison in: {ast.unparse(node)}")
+        operands = [compile_expression(v, sets) for v in [node.left] + node.comparators]
+        ops = [COMPARISONS[type(op)] for op in node.ops]
+
+        def compare(c):
+            values = [operand(c) for operand in operands]
+            results = [op(*((a, b) if isinstance(b, (list, tuple)) else _align(a, b)))
+                       for op, a, b in zip(ops, values, values[1:])]
+            return _pairwise(np.logical_and, results)
+        return _memoized(node, compare)
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        if node.func.id not in FUNCTIONS or node.keywords:
+            raise YogaRuleError(f"Unknown function: {ast.unparse(node)}")
+        impl, arity = FUNCTIONS[node.func.id]
+        if len(node.args) != arity:
+            raise YogaRuleError(f"{node.func.id}() takes {arity} argument(s): {ast.unparse(node)}")
+        args = [compile_expression(arg, sets) for arg in node.args]
+        return _memoized(node, lambda c: impl(c, *[arg(c) for arg in args]))
+    if isinstance(node, (ast.Tuple, ast.List)):
+        value = tuple(_constant(e.value) if isinstance(e, ast.Constant) else None for e in node.elts)
+        if None in value:
+            raise YogaRuleError(f"Lists may only hold constants: {ast.unparse(node)}")
+        return lambda c: value
+    if isinstance(node, ast.Name):
+        if node.id not in sets:
+            raise YogaRuleError(f"Unknown name: {node.id}")
+        value = sets[node.id]
+        return lambda c: value
+    if isinstance(node, ast.Constant):
+        value = _constant(node.value)
+        return lambda c: value
+    raise YogaRuleError(f"Unsupported expression: {type(node).__name__}")
+
+
+def expand(rule: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """A rule with "each": {"var": [values]} stands for one rule per combination, fields formatted with str.format."""
+    if "each" not in rule:
+        return [rule]
+    keys = list(rule["each"])
+    rules = []
+    for values in itertools.product(*(rule["each"][key] for key in keys)):
+        bound = dict(zip(keys, values))
+        rules.append({field: text.format(**bound) for field, text in rule.items()
+                      if field != "each" and isinstance(text, str)})
+    return rules
+
+
+class YogaRules:
+    """Compiled catalogue; evaluate() runs every rule over every chart of a matrix in one pass."""
+
+    def __init__(self, catalogue: Dict[str, Any]):
+        sets = {name: tuple(_constant(v) for v in values) for name, values in catalogue.get("sets", {}).items()}
+        self.rules: List[Dict[str, str]] = []
+        self.predicates: List[Compiled] = []
+        for rule in (r for entry in catalogue["yogas"] for r in expand(entry)):
+            try:
+                self.predicates.append(compile_expression(ast.parse(rule["when"], mode="eval").body, sets))
+            except (SyntaxError, YogaRuleError) as e:
+                raise YogaRuleError(f"Yoga '{rule.get('name')}': {e}")
+            self.rules.append({"name": rule["name"], "category": rule.get("category", "general"), "desc": rule.get("desc", "")})
+        names = [rule["name"] for rule in self.rules]
+        if len(set(names)) != len(names):
+            raise YogaRuleError("Duplicate yoga names: " + ", ".join(sorted({n for n in names if names.count(n) > 1})))
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    @classmethod
+    def load(cls, path: str = YOGA_RULES_PATH) -> "YogaRules":
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def holds(self, matrix: List[MatrixEntry]) -> np.ndarray:
+        """Boolean (rules, charts): where each yoga holds."""
+        charts = Charts(matrix)
+        result = np.empty((len(self.predicates), len(charts)), dtype=bool)
+        for i, predicate in enumerate(self.predicates):
+            value = np.asarray(predicate(charts))
+            if value.dtype != bool or value.ndim > 1:
+                raise YogaRuleError(f"Yoga '{self.rules[i]['name']}' is not a condition per chart")
+            result[i] = value
+        return result
+
+    def evaluate(self, matrix: List[MatrixEntry], categories: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Every yoga holding in at least one chart, with the fraction of (time, location) charts it holds in."""
+        fractions = self.holds(matrix).mean(axis=1)
+        found = [dict(rule, fraction=round(float(fraction), 4))
+                 for rule, fraction in zip(self.rules, fractions)
+                 if fraction > 0 and (categories is None or rule["category"] in categories)]
+        return sorted(found, key=lambda yoga: -yoga["fraction"])
+
+
+@functools.lru_cache(maxsize=None)
+def default_rules() -> YogaRules:
+    """The catalogue at YOGA_RULES_PATH, compiled once per process."""
+    return YogaRules.load()
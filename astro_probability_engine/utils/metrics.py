@@ -0,0 +1,259 @@
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from config import METRICS_DIR, STAGE_BUCKETS
+
+# Per-thread stage timings for the request (or batch job) being served.
+_local = threading.local()
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Times a pipeline stage (usable as a decorator). Durations accumulate per
+    request and are exclusive: time spent in a nested stage is only
+    reported under the nested stage.
+    """
+    timings = getattr(_local, "timings", None)
+    if timings is None:
+        yield
+        return
+    frame = [time.perf_counter(), 0.0]  # start, time spent in nested stages
+    _local.stack.append(frame)
+    try:
+        yield
+    finally:
+        _local.stack.pop()
+        elapsed = time.perf_counter() - frame[0]
+        timings[name] = timings.get(name, 0.0) + elapsed - frame[1]
+        if _local.stack:
+            _local.stack[-1][1] += elapsed
+
+
+def begin_timings():
+    _local.timings = {}
+    _local.stack = []
+
+
+def end_timings() -> Dict[str, float]:
+    """Stops collecting on this thread and feeds the stage histograms."""
+    timings = getattr(_local, "timings", None) or {}
+    _local.timings = None
+    for name, seconds in timings.items():
+        registry.observe("astro_stage_seconds", seconds, stage=name)
+    return timings
+
+
+@contextmanager
+def collect_timings():
+    begin_timings()
+    try:
+        yield
+    finally:
+        end_timings()
+
+
+def server_timing_header(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items())
+
+
+class MetricsRegistry:
+    """
+    Process-local counters, gauges and histograms.
+    Each worker snapshots its state to METRICS_DIR; render() merges every
+    worker's snapshot so any gunicorn worker can answer /metrics.
+    When a worker exits, its counters and histograms are folded into a
+    retired snapshot, so the merged totals never go down while the server
+    runs (Prometheus would read that as a counter reset). Snapshots are
+    stamped with the server's master PID, and a new server run starts
+    from zero.
+    """
+
+    HELP = {
+        "astro_stage_seconds": ("histogram", "Time spent per pipeline stage."),
+        "astro_charts_computed_total": ("counter", "Charts computed by the matrix generator."),
+        "astro_cache_hits_total": ("counter", "Engine cache hits."),
+        "astro_cache_misses_total": ("counter", "Engine cache misses."),
+        "astro_requests_in_flight": ("gauge", "Requests currently being served."),
+        "astro_transit_snapshots_total": ("counter", "Transit snapshots computed."),
+    }
+
+    def __init__(self, directory: Optional[str] = METRICS_DIR, buckets: Tuple[float, ...] = STAGE_BUCKETS):
+        self.directory = directory
+        self.buckets = tuple(buckets)
+        self.counters = {}    # (name, labels) -> value
+        self.gauges = {}      # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> {"buckets": [...], "sum": float, "count": int}
+        self.collectors: List[Callable[[], List[Tuple[str, Dict[str, str], float]]]] = []
+        self.lock = threading.Lock()
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            # A snapshot under this PID was left by an earlier process
+            self._retire(os.path.join(self.directory, f"metrics-{os.getpid()}.json"))
+            self.flush()
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> Tuple[str, tuple]:
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def add_gauge(self, name: str, amount: float, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            self.gauges[key] = self.gauges.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            hist = self.histograms.setdefault(key, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist["buckets"][i] += 1
+            hist["sum"] += value
+            hist["count"] += 1
+
+    def register_collector(self, fn: Callable[[], List[Tuple[str, Dict[str, str], float]]]):
+        """Registers a callback reporting cumulative counters (e.g. lru_cache stats) at snapshot time."""
+        self.collectors.append(fn)
+
+    def snapshot(self) -> Dict[str, Any]:
+        collected = {}
+        for fn in self.collectors:
+            for name, labels, value in fn():
+                collected[self._key(name, labels)] = value
+        with self.lock:
+            counters = {**self.counters, **collected}
+            return {
+                "pid": os.getpid(),
+                "master": os.getppid(),
+                "counters": [[n, list(l), v] for (n, l), v in counters.items()],
+                "gauges": [[n, list(l), v] for (n, l), v in self.gauges.items()],
+                "histograms": [[n, list(l), h["buckets"][:], h["sum"], h["count"]] for (n, l), h in self.histograms.items()],
+            }
+
+    def flush(self):
+        """Atomically writes this worker's snapshot for the other workers to merge."""
+        if not self.directory:
+            return
+        path = os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def _load_snapshots(self) -> List[Dict[str, Any]]:
+        if not self.directory:
+            return [self.snapshot()]
+        self.flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+            snap = self._read(path)
+            if snap is None:
+                continue  # Being replaced by its worker
+            if not self._pid_alive(snap["pid"]):
+                self._retire(path)
+                continue
+            snapshots.append(snap)
+        retired = self._read(os.path.join(self.directory, "retired.json"))
+        if retired and retired.get("master") == os.getppid():
+            snapshots.append(retired)
+        return snapshots
+
+    @staticmethod
+    def _read(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _retire(self, path: str):
+        """Folds an exited worker's snapshot into retired.json and removes it (once, across workers)."""
+        retired_path = os.path.join(self.directory, "retired.json")
+        with open(os.path.join(self.directory, "retired.lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            snap = self._read(path)
+            if snap is None:
+                return  # Already retired by another worker
+            if snap.get("master") == os.getppid():
+                retired = self._read(retired_path)
+                if not retired or retired.get("master") != os.getppid():
+                    retired = {"pid": None, "master": os.getppid(), "counters": [], "gauges": [], "histograms": []}
+                counters, _, histograms = self._merge([retired, snap])
+                retired["counters"] = [[n, list(l), v] for (n, l), v in counters.items()]
+                retired["histograms"] = [[n, list(l), h["buckets"], h["sum"], h["count"]] for (n, l), h in histograms.items()]
+                tmp_path = f"{retired_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(retired, f)
+                os.replace(tmp_path, retired_path)
+            os.remove(path)
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    @staticmethod
+    def _merge(snapshots: List[Dict[str, Any]]) -> Tuple[dict, dict, dict]:
+        """Sums snapshots into (counters, gauges, histograms) keyed by (name, labels)."""
+        counters, gauges, histograms = {}, {}, {}
+        for snap in snapshots:
+            for name, labels, value in snap["counters"]:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, value in snap["gauges"]:
+                key = (name, tuple(map(tuple, labels)))
+                gauges[key] = gauges.get(key, 0) + value
+            for name, labels, buckets, total, count in snap["histograms"]:
+                key = (name, tuple(map(tuple, labels)))
+                merged = histograms.setdefault(key, {"buckets": [0] * len(buckets), "sum": 0.0, "count": 0})
+                merged["buckets"] = [a + b for a, b in zip(merged["buckets"], buckets)]
+                merged["sum"] += total
+                merged["count"] += count
+        return counters, gauges, histograms
+
+    def render(self) -> str:
+        """Merges all worker snapshots into Prometheus text exposition format."""
+        counters, gauges, histograms = self._merge(self._load_snapshots())
+
+        def fmt_labels(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        lines = []
+        for kind, series in (("counter", counters), ("gauge", gauges), ("histogram", histograms)):
+            for name in sorted({n for n, _ in series}):
+                metric_type, help_text = self.HELP.get(name, (kind, name))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for (n, labels), value in sorted(series.items()):
+                    if n != name:
+                        continue
+                    if kind != "histogram":
+                        lines.append(f"{name}{fmt_labels(labels)} {value}")
+                        continue
+                    for bound, bucket in zip(self.buckets, value["buckets"]):
+                        lines.append(f"{name}_bucket{fmt_labels(labels, [('le', bound)])} {bucket}")
+                    lines.append(f"{name}_bucket{fmt_labels(labels, [('le', '+Inf')])} {value['count']}")
+                    lines.append(f"{name}_sum{fmt_labels(labels)} {value['sum']}")
+                    lines.append(f"{name}_count{fmt_labels(labels)} {value['count']}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
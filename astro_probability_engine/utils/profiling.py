@@ -0,0 +1,177 @@
+import cProfile
+import glob
+import hmac
+import io
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Set
+from config import PROFILE_SECRET, PROFILE_SAMPLE_RATE, PROFILE_DIR, PROFILE_INTERVAL, PROFILE_KEEP
+
+# Modules shown in the text summary; the pstats dump keeps everything
+ENGINE_MODULES_PATTERN = r"astro_probability_engine|astrology[/\\]|engine[/\\]|app\.py"
+
+ARTIFACTS = {
+    "pstats": ".pstats",
+    "collapsed": ".collapsed.txt",
+    "summary": ".summary.txt"
+}
+
+# The profile of the request this thread is serving, if any
+_local = threading.local()
+
+
+def current_profile() -> Optional["RequestProfile"]:
+    return getattr(_local, "profile", None)
+
+
+class StackSampler:
+    """
+    Statistical profiler. A daemon thread snapshots the stacks of the
+    threads it follows each `interval` seconds and counts them in
+    collapsed-stack form ("thread;module:func;module:func count"), ready
+    for flamegraph tools. Only the profiled request's thread is followed,
+    plus any worker thread that joins it with `follow_current_thread()`
+    (batch reports run in pool threads), so concurrent requests under a
+    threaded server stay out of the profile.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.counts: Dict[str, int] = {}
+        self.thread_ids: Set[int] = set()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def follow_current_thread(self):
+        self.thread_ids.add(threading.get_ident())
+
+    def start(self):
+        self.follow_current_thread()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        names = {}
+        while not self._stop.wait(self.interval):
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            frames = sys._current_frames()
+            for thread_id in list(self.thread_ids):
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue  # A pool thread that has exited
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                key = ";".join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.counts.items()))
+
+
+class RequestProfile:
+    def __init__(self, reason: str, deterministic: bool):
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.reason = reason
+        self.profiler = cProfile.Profile() if deterministic else None
+        self.sampler = StackSampler()
+
+    def start(self):
+        _local.profile = self
+        self.sampler.start()
+        if self.profiler:
+            self.profiler.enable()
+
+    def stop(self):
+        if self.profiler:
+            self.profiler.disable()
+        self.sampler.stop()
+        _local.profile = None
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile and stores their artifacts.
+    A request is profiled when it sends `X-Profile: 1` with a matching
+    `X-Profile-Token` (deterministic cProfile + stack samples), or when
+    it is picked by the 1-in-PROFILE_SAMPLE_RATE sampler (stack samples
+    only, to keep the always-on overhead low).
+    """
+
+    def __init__(self, directory: str = PROFILE_DIR, secret: Optional[str] = PROFILE_SECRET,
+                 sample_rate: int = PROFILE_SAMPLE_RATE, keep: int = PROFILE_KEEP):
+        self.directory = directory
+        self.secret = secret
+        self.sample_rate = sample_rate
+        self.keep = keep
+
+    def is_authorized(self, token: Optional[str]) -> bool:
+        return bool(self.secret) and bool(token) and hmac.compare_digest(token, self.secret)
+
+    def maybe_start(self, headers) -> Optional[RequestProfile]:
+        if headers.get("X-Profile") == "1" and self.is_authorized(headers.get("X-Profile-Token")):
+            profile = RequestProfile("requested", deterministic=True)
+        elif self.sample_rate > 0 and random.randrange(self.sample_rate) == 0:
+            profile = RequestProfile("sampled", deterministic=False)
+        else:
+            return None
+        profile.start()
+        return profile
+
+    def finish(self, profile: RequestProfile) -> str:
+        """Stops the profile, writes its artifacts and prunes old ones."""
+        profile.stop()
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, profile.id)
+
+        with open(base + ARTIFACTS["collapsed"], "w") as f:
+            f.write(profile.sampler.collapsed())
+
+        summary = io.StringIO()
+        summary.write(f"Profile {profile.id} ({profile.reason})\n\n")
+        if profile.profiler:
+            profile.profiler.dump_stats(base + ARTIFACTS["pstats"])
+            stats = pstats.Stats(profile.profiler, stream=summary)
+            stats.sort_stats("cumulative").print_stats(ENGINE_MODULES_PATTERN, 40)
+        else:
+            top = sorted(profile.sampler.counts.items(), key=lambda x: x[1], reverse=True)[:20]
+            for stack, count in top:
+                summary.write(f"{count:6d}  ...;{';'.join(stack.split(';')[-3:])}\n")
+        with open(base + ARTIFACTS["summary"], "w") as f:
+            f.write(summary.getvalue())
+
+        self._prune()
+        return profile.id
+
+    def artifact_path(self, profile_id: str, kind: str) -> Optional[str]:
+        if kind not in ARTIFACTS or os.path.basename(profile_id) != profile_id:
+            return None
+        path = os.path.join(self.directory, profile_id + ARTIFACTS[kind])
+        return path if os.path.exists(path) else None
+
+    def _prune(self):
+        summaries = sorted(glob.glob(os.path.join(self.directory, "*" + ARTIFACTS["summary"])))
+        for path in summaries[:-self.keep]:
+            profile_id = os.path.basename(path)[:-len(ARTIFACTS["summary"])]
+            for suffix in ARTIFACTS.values():
+                try:
+                    os.remove(os.path.join(self.directory, profile_id + suffix))
+                except FileNotFoundError:
+                    pass
+
+
+profiler = RequestProfiler()
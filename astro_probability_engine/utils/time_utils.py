@@ -1,13 +1,67 @@
-
 import datetime
-from typing import List
-from config import TIME_SLICES, TIME_INTERVAL_MINUTES
-
-def generate_time_slices(dob_date: datetime.date) -> List[datetime.datetime]:
-    """Generates 96 time slices for the given date starting at 00:00."""
-    start_dt = datetime.datetime.combine(dob_date, datetime.time.min)
-    slices = []
-    for i in range(TIME_SLICES):
-        delta = datetime.timedelta(minutes=i * TIME_INTERVAL_MINUTES)
-        slices.append(start_dt + delta)
-    return slices
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import numpy as np
+from config import BIRTH_TIMEZONE, MATRIX_TIMEZONE, TIME_SLICES, TIME_INTERVAL_MINUTES, ZONE_TRANSITION_CACHE_SIZE
+
+UTC_EPOCH = datetime.datetime(1970, 1, 1)
+
+def zone(tz_name: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {tz_name}")
+
+@lru_cache(maxsize=ZONE_TRANSITION_CACHE_SIZE)
+def zone_transitions(tz_name: str, year: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Offset table of `tz_name` around `year` (two days' margin either side):
+    the UTC instants (unix seconds) where the UTC offset changes, and the
+    offsets (seconds) in force before the first change and from each one.
+    Offsets are sampled daily and every change is bisected to the second;
+    zones do not change offset twice within a day.
+    """
+    tz = zone(tz_name)
+    start = int((datetime.datetime(year, 1, 1) - UTC_EPOCH).total_seconds()) - 2 * 86400
+
+    def offset(t: int) -> int:
+        return int(datetime.datetime.fromtimestamp(t, tz).utcoffset().total_seconds())
+
+    days = [start + d * 86400 for d in range(370)]
+    daily = [offset(t) for t in days]
+    instants, offsets = [], [daily[0]]
+    for d in range(1, len(days)):
+        if daily[d] != daily[d - 1]:
+            lo, hi = days[d - 1], days[d]  # offset(lo) is the old offset, offset(hi) the new one
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                lo, hi = (mid, hi) if offset(mid) == daily[d - 1] else (lo, mid)
+            instants.append(hi)
+            offsets.append(daily[d])
+    return np.array(instants, dtype=np.int64), np.array(offsets, dtype=np.int64)
+
+def local_seconds_to_utc(local_seconds: np.ndarray, tz_name: str, year: int) -> np.ndarray:
+    """
+    Wall-clock times in `tz_name` (as seconds since a naive 1970-01-01) ->
+    unix seconds, in one vectorized lookup of the cached offset table.
+    A wall-clock time skipped by a DST change gets one of the offsets around it.
+    """
+    instants, offsets = zone_transitions(tz_name, year)
+    guess = local_seconds - offsets[np.searchsorted(instants, local_seconds - offsets[0], side="right")]
+    return local_seconds - offsets[np.searchsorted(instants, guess, side="right")]
+
+def generate_time_slices(dob_date: datetime.date, tz_name: Optional[str] = None) -> List[datetime.datetime]:
+    """
+    TIME_SLICES wall-clock times of the local calendar day in `tz_name`
+    (default MATRIX_TIMEZONE), every TIME_INTERVAL_MINUTES from local
+    midnight, as the naive UTC datetimes the services expect.
+    """
+    midnight = int((datetime.datetime.combine(dob_date, datetime.time.min) - UTC_EPOCH).total_seconds())
+    local = midnight + np.arange(TIME_SLICES, dtype=np.int64) * (TIME_INTERVAL_MINUTES * 60)
+    utc = local_seconds_to_utc(local, tz_name or MATRIX_TIMEZONE, dob_date.year)
+    return [UTC_EPOCH + datetime.timedelta(seconds=int(t)) for t in utc]
+
+def local_to_utc(local_dt: datetime.datetime, tz_name: Optional[str] = None) -> datetime.datetime:
+    """Naive wall-clock time in `tz_name` (default BIRTH_TIMEZONE) -> naive UTC, as the services expect."""
+    return local_dt.replace(tzinfo=zone(tz_name or BIRTH_TIMEZONE)).astimezone(datetime.timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,224 @@
+"""
+Engine benchmark suite.
+
+Times every pipeline stage over a fixed corpus of DOBs:
+
+    python benchmarks/bench_engine.py --save benchmarks/baselines/before.json
+    python benchmarks/bench_engine.py --compare benchmarks/baselines/before.json
+
+With --compare the run exits with status 1 when any stage's median time per
+operation regresses by more than --threshold percent (BENCH_REGRESSION_PCT).
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENGINE_DIR = os.path.join(BASE_DIR, 'astro_probability_engine')
+sys.path.append(BASE_DIR)
+sys.path.append(ENGINE_DIR)
+
+from flask import Flask, render_template
+from config import ANCHOR_LOCATIONS, PLANETS, BENCH_REGRESSION_PCT
+from astrology.bav_rules import BAVCalculator
+from engine.generator import MatrixGenerator
+from engine.analyzer import MatrixAnalyzer
+from engine.interpreter import AstrologicalInterpreter
+from utils.time_utils import zone_transitions
+from astrology.factory import SERVICES, create_service
+
+# Fixed corpus: spread over the supported range, plus the repo's sample DOB
+CORPUS = [
+    datetime.date(1905, 3, 21), datetime.date(1932, 7, 4), datetime.date(1947, 8, 15),
+    datetime.date(1961, 12, 31), datetime.date(1975, 2, 28), datetime.date(1989, 10, 12),
+    datetime.date(1990, 1, 1), datetime.date(1999, 6, 15), datetime.date(2008, 2, 29),
+    datetime.date(2016, 11, 8), datetime.date(2024, 4, 8), datetime.date(2030, 9, 9)
+]
+
+# Flask app used only to render the report template outside the web server
+render_app = Flask(__name__, template_folder=os.path.join(BASE_DIR, 'templates'),
+                   static_folder=os.path.join(BASE_DIR, 'static'))
+
+
+def chart_placements(matrix) -> list:
+    """Rashi placements (incl. Lagna) as fed to the BAV calculator."""
+    placements = []
+    for entry in matrix:
+        positions = {p: data.rashi for p, data in entry.chart.planets.items() if p in PLANETS}
+        positions["Lagna"] = entry.chart.houses[1].rashi_id
+        placements.append(positions)
+    return placements
+
+
+def render_report(narrative, dob, sample_count):
+    with render_app.test_request_context():
+        return render_template('report.html', narrative=narrative, dob=dob,
+                               sample_count=sample_count, numerology={"day": dob.day, "destiny_reduced": 1, "rewards": [1, 1]})
+
+
+def clear_caches(service):
+    """Drops every per-process engine cache, like a fresh worker."""
+    BAVCalculator.cache_clear()
+    AstrologicalInterpreter.cache_clear()
+    zone_transitions.cache_clear()
+    if hasattr(service, "cache_clear"):
+        service.cache_clear()  # Tropical passes (services with a real ephemeris)
+
+
+def measure(fn, ops: int, repeat: int, warmup: int, service) -> dict:
+    """Runs fn (one pass over the corpus) and reports milliseconds per operation."""
+    for _ in range(warmup):
+        clear_caches(service)
+        fn()
+    samples = []
+    for _ in range(repeat):
+        clear_caches(service)  # Every pass starts cold, like a fresh worker
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000 / ops)
+    return {
+        "ops": ops,
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "max_ms": max(samples)
+    }
+
+
+def run_suite(service, corpus, repeat: int, warmup: int) -> dict:
+    generator = MatrixGenerator(service)
+    analyzer = MatrixAnalyzer()
+    interpreter = analyzer.interpreter
+
+    # Inputs for the downstream stages are prepared once, outside the timings
+    matrices = {dob: generator.generate_matrix(dob) for dob in corpus}
+    placements = [p for m in matrices.values() for p in chart_placements(m)]
+    analysis_inputs = {dob: analyzer.build_analysis_results(m, dob=dob) for dob, m in matrices.items()}
+    narratives = {dob: analyzer.analyze(m, dob=dob)["narrative"] for dob, m in matrices.items()}
+    noon = {dob: datetime.datetime.combine(dob, datetime.time(12)) for dob in corpus}
+
+    def bav_sav():
+        for pos in placements:
+            BAVCalculator.calculate_sarvashtakavarga(pos)
+            BAVCalculator.calculate_sarvashtakavarga(pos, exclude_list=["Lagna"])
+
+    def bav_shodhita():
+        for pos in placements:
+            BAVCalculator.calculate_shodhita_sav(pos)
+            BAVCalculator.calculate_shodhita_sav(pos, exclude_list=["Lagna"])
+
+    def calculate_chart():
+        for dob in corpus:
+            service.calculate_chart(noon[dob], ANCHOR_LOCATIONS[0])
+
+    def generate_matrix():
+        for dob in corpus:
+            generator.generate_matrix(dob)
+
+    def build_analysis():
+        for dob in corpus:
+            analyzer.build_analysis_results(matrices[dob], dob=dob)
+
+    def generate_narrative():
+        for dob in corpus:
+            interpreter.generate_narrative(analysis_inputs[dob])
+
+    def analyze():
+        for dob in corpus:
+            analyzer.analyze(matrices[dob], dob=dob)
+
+    def render():
+        for dob in corpus:
+            render_report(narratives[dob], dob, len(matrices[dob]))
+
+    def full_report():
+        for dob in corpus:
+            matrix = generator.generate_matrix(dob)
+            results = analyzer.analyze(matrix, dob=dob)
+            render_report(results["narrative"], dob, results["sample_count"])
+
+    stages = [
+        ("bav.calculate_sarvashtakavarga", bav_sav, len(placements)),
+        ("bav.calculate_shodhita_sav", bav_shodhita, len(placements)),
+        ("service.calculate_chart", calculate_chart, len(corpus)),
+        ("generator.generate_matrix", generate_matrix, len(corpus)),
+        ("analyzer.build_analysis_results", build_analysis, len(corpus)),
+        ("interpreter.generate_narrative", generate_narrative, len(corpus)),
+        ("analyzer.analyze", analyze, len(corpus)),
+        ("render.report_html", render, len(corpus)),
+        ("full_report", full_report, len(corpus))
+    ]
+    results = {}
+    for name, fn, ops in stages:
+        results[name] = measure(fn, ops, repeat, warmup, service)
+        print(f"  {name:<36} {results[name]['median_ms']:>10.3f} ms/op  (min {results[name]['min_ms']:.3f}, n={ops})")
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> bool:
+    """Prints a before/after table. Returns True when no stage regressed."""
+    ok = True
+    print(f"\n{'stage':<36} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, cur in current["stages"].items():
+        base = baseline["stages"].get(name)
+        if not base:
+            print(f"{name:<36} {'-':>10} {cur['median_ms']:>10.3f}      new")
+            continue
+        change = (cur["median_ms"] - base["median_ms"]) / base["median_ms"] * 100
+        status = ""
+        if change > threshold:
+            status = "  REGRESSION"
+            ok = False
+        print(f"{name:<36} {base['median_ms']:>10.3f} {cur['median_ms']:>10.3f} {change:>+7.1f}%{status}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--service", default="skyfield", choices=sorted(SERVICES),
+                        help="Astrology service to benchmark ('synthetic' leaves out the ephemeris cost)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes per stage")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed passes per stage")
+    parser.add_argument("--save", metavar="PATH", help="Write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=BENCH_REGRESSION_PCT,
+                        help="Allowed slowdown per stage, in percent")
+    args = parser.parse_args()
+
+    service = create_service(args.service)
+    print(f"Benchmarking {len(CORPUS)} DOBs with the '{args.service}' service ({args.repeat} passes)...")
+    current = {
+        "meta": {
+            "service": args.service,
+            "corpus": [d.isoformat() for d in CORPUS],
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created": datetime.datetime.now().isoformat(timespec="seconds")
+        },
+        "stages": run_suite(service, CORPUS, args.repeat, args.warmup)
+    }
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("service") != args.service:
+            print(f"WARNING: baseline was recorded with the '{baseline['meta'].get('service')}' service")
+        if not compare(current, baseline, args.threshold):
+            print(f"\nFAILED: at least one stage regressed by more than {args.threshold:.0f}%")
+            sys.exit(1)
+        print("\nOK: no stage regressed beyond the threshold")
+
+
+if __name__ == "__main__":
+    main()
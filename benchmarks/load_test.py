@@ -0,0 +1,234 @@
+"""
+Load generator for the web app.
+
+In-process through the Flask test client (uses the local de421.bsp, no network):
+
+    python benchmarks/load_test.py --concurrency 4 --requests 200
+
+Against a local gunicorn, sampling the workers' RSS:
+
+    gunicorn --workers 2 --bind 127.0.0.1:8000 app:app &
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --pid <gunicorn master pid>
+
+Reports throughput, p50/p95/p99 latency, error rate and RSS over time.
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, 'astro_probability_engine'))
+
+
+def dob_stream(seed: int, repeat_ratio: float, hot_set: int):
+    """
+    Yields DOBs: with probability repeat_ratio one of a small hot set
+    (warm caches), otherwise a date not requested before (cold).
+    """
+    rng = random.Random(seed)
+    start = datetime.date(1920, 1, 1)
+    span = (datetime.date(2025, 12, 31) - start).days
+    hot = [start + datetime.timedelta(days=rng.randrange(span)) for _ in range(hot_set)]
+    seen = set(hot)
+    while True:
+        if rng.random() < repeat_ratio:
+            yield rng.choice(hot), "repeat"
+            continue
+        dob = start + datetime.timedelta(days=rng.randrange(span))
+        while dob in seen:
+            dob = start + datetime.timedelta(days=rng.randrange(span))
+        seen.add(dob)
+        yield dob, "cold"
+
+
+class InProcessClient:
+    def __init__(self, endpoint: str):
+        import app as web_app
+        self.app = web_app.app
+        self.endpoint = endpoint
+        self.local = threading.local()
+
+    def post(self, dob: datetime.date) -> int:
+        if not hasattr(self.local, "client"):
+            self.local.client = self.app.test_client()
+        response = self.local.client.post(self.endpoint, data={"dob": dob.isoformat()})
+        response.close()
+        return response.status_code
+
+
+class HttpClient:
+    def __init__(self, url: str, endpoint: str, timeout: float):
+        self.url = url.rstrip("/") + endpoint
+        self.timeout = timeout
+
+    def post(self, dob: datetime.date) -> int:
+        body = urllib.parse.urlencode({"dob": dob.isoformat()}).encode()
+        try:
+            with urllib.request.urlopen(self.url, data=body, timeout=self.timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+
+def rss_mb(pids) -> float:
+    """Summed resident set size of the given processes (and their children)."""
+    total_kb = 0
+    for pid in pids:
+        for p in [pid] + child_pids(pid):
+            try:
+                with open(f"/proc/{p}/status") as f:
+                    for line in f:
+                        if line.startswith("VmRSS:"):
+                            total_kb += int(line.split()[1])
+            except OSError:
+                continue
+    return total_kb / 1024
+
+
+def child_pids(pid: int) -> list:
+    children = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                children.extend(int(c) for c in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def run(client, args, pids) -> dict:
+    stream = dob_stream(args.seed, args.repeat_ratio, args.hot_set)
+    stream_lock = threading.Lock()
+    results = []  # (finished_at, latency_s, status, kind)
+    results_lock = threading.Lock()
+    remaining = [args.requests]
+    deadline = time.perf_counter() + args.duration if args.duration else None
+
+    def worker():
+        while True:
+            with stream_lock:
+                if deadline is None and remaining[0] <= 0:
+                    return
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                remaining[0] -= 1
+                dob, kind = next(stream)
+            start = time.perf_counter()
+            try:
+                status = client.post(dob)
+            except Exception:
+                status = 0
+            end = time.perf_counter()
+            with results_lock:
+                results.append((end, end - start, status, kind))
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(args.concurrency)]
+    for t in threads:
+        t.start()
+
+    timeline = []
+    last_count = 0
+    while any(t.is_alive() for t in threads):
+        time.sleep(args.sample_interval)
+        now = time.perf_counter()
+        with results_lock:
+            count = len(results)
+        timeline.append({
+            "t": round(now - started, 2),
+            "completed": count,
+            "rps": round((count - last_count) / args.sample_interval, 2),
+            "rss_mb": round(rss_mb(pids), 1)
+        })
+        last_count = count
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    def summarize(rows):
+        latencies = sorted(r[1] * 1000 for r in rows)
+        errors = sum(1 for r in rows if not 200 <= r[2] < 300)
+        return {
+            "requests": len(rows),
+            "error_rate": round(errors / len(rows), 4) if rows else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "mean_ms": round(statistics.mean(latencies), 1) if latencies else 0.0
+        }
+
+    summary = summarize(results)
+    summary["throughput_rps"] = round(len(results) / elapsed, 2) if elapsed else 0.0
+    summary["elapsed_s"] = round(elapsed, 2)
+    return {
+        "config": {k: v for k, v in vars(args).items() if k != "json"},
+        "summary": summary,
+        "by_kind": {kind: summarize([r for r in results if r[3] == kind]) for kind in ("cold", "repeat")},
+        "timeline": timeline
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process test client)")
+    parser.add_argument("--endpoint", default="/generate")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=100, help="Total requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, help="Run for this many seconds instead of a request count")
+    parser.add_argument("--repeat-ratio", type=float, default=0.5, help="Share of requests for already-seen DOBs")
+    parser.add_argument("--hot-set", type=int, default=20, help="Number of distinct repeat DOBs")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--pid", type=int, action="append", default=[],
+                        help="Process to track RSS for, children included (default: this process in-process)")
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--json", metavar="PATH", help="Also write the full report as JSON")
+    args = parser.parse_args()
+
+    if args.url:
+        client = HttpClient(args.url, args.endpoint, args.timeout)
+        pids = args.pid
+    else:
+        client = InProcessClient(args.endpoint)
+        pids = args.pid or [os.getpid()]
+
+    report = run(client, args, pids)
+
+    print("\nRSS / throughput over time")
+    print(f"{'t (s)':>8} {'done':>7} {'req/s':>8} {'RSS MB':>8}")
+    for row in report["timeline"]:
+        print(f"{row['t']:>8} {row['completed']:>7} {row['rps']:>8} {row['rss_mb']:>8}")
+
+    s = report["summary"]
+    print(f"\n{s['requests']} requests in {s['elapsed_s']}s at concurrency {args.concurrency}")
+    print(f"Throughput: {s['throughput_rps']} req/s   Errors: {s['error_rate'] * 100:.2f}%")
+    print(f"Latency ms: p50 {s['p50_ms']}  p95 {s['p95_ms']}  p99 {s['p99_ms']}  mean {s['mean_ms']}")
+    for kind, k in report["by_kind"].items():
+        if k["requests"]:
+            print(f"  {kind:<7} n={k['requests']:<5} p50 {k['p50_ms']}  p95 {k['p95_ms']}  p99 {k['p99_ms']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,3 +12,37 @@ document.getElementById('reportForm').addEventListener('submit', function (e) {
 
     // The browser will now navigate to /generate
 });
+
+// Birthplace autocomplete (offline gazetteer): choosing a suggestion fills in
+// its coordinates and time zone; a typed name is resolved by the server
+const placeInput = document.getElementById('place');
+if (placeInput) {
+    const placeOptions = document.getElementById('placeOptions');
+    let suggestions = {};
+    let pending = null;
+
+    placeInput.addEventListener('input', function () {
+        const match = suggestions[placeInput.value];
+        document.getElementById('lat').value = match ? match.lat : '';
+        document.getElementById('lon').value = match ? match.lon : '';
+        document.getElementById('tz').value = match ? match.timezone : '';
+        if (match || placeInput.value.trim().length < 2) return;
+
+        clearTimeout(pending);
+        pending = setTimeout(function () {
+            fetch('/api/v1/places?q=' + encodeURIComponent(placeInput.value))
+                .then(function (response) { return response.json(); })
+                .then(function (data) {
+                    suggestions = {};
+                    placeOptions.innerHTML = '';
+                    (data.places || []).forEach(function (place) {
+                        const label = [place.name, place.admin1, place.country].filter(Boolean).join(', ');
+                        suggestions[label] = place;
+                        const option = document.createElement('option');
+                        option.value = label;
+                        placeOptions.appendChild(option);
+                    });
+                });
+        }, 150);
+    });
+}
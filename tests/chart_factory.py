@@ -0,0 +1,24 @@
+from typing import Dict, List
+
+from astrology.chart_builder import build_planet
+from config import GRAHAS
+from engine.models import ChartData, HouseData, MatrixEntry
+
+# Default placement: every graha in its own rashi, away from the yogas under test
+DEFAULT_RASHIS = {"Sun": 5, "Moon": 4, "Mars": 1, "Mercury": 3, "Jupiter": 9,
+                  "Venus": 2, "Saturn": 10, "Rahu": 11, "Ketu": 5}
+
+
+def chart_entry(lagna: int = 1, speeds: Dict[str, float] = None, index: int = 0, **rashis: int) -> MatrixEntry:
+    """A matrix entry with each graha mid-rashi: chart_entry(lagna=4, Moon=4, Jupiter=7)."""
+    placement = dict(DEFAULT_RASHIS, **rashis)
+    speeds = speeds or {}
+    planets = {name: build_planet(name, (placement[name] - 1) * 30 + 15, speeds.get(name, 1.0)) for name in GRAHAS}
+    houses = {h: HouseData(house_num=h, rashi_id=(lagna + h - 2) % 12 + 1, bav_scores={}, sav_score=0) for h in range(1, 13)}
+    chart = ChartData(timestamp=0.0, location_name="Test", lat=0.0, lon=0.0,
+                      ascendant=(lagna - 1) * 30 + 15, planets=planets, houses=houses)
+    return MatrixEntry(time_slice_index=index, location_index=0, chart=chart)
+
+
+def matrix(*entries: MatrixEntry) -> List[MatrixEntry]:
+    return list(entries)
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Same import paths as app.py and the tools: engine modules import each other as top-level packages
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, 'astro_probability_engine'))
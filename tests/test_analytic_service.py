@@ -0,0 +1,26 @@
+import datetime
+
+import numpy as np
+
+from astrology.analytic_service import AnalyticAstrologyService
+
+# The Moon's geocentric daily motion stays between about 11.75 and 15.4 deg/day
+MOON_SPEED_RANGE = (11.7, 15.5)
+LOCATIONS = [{"lat": 28.6, "lon": 77.2}, {"lat": -33.9, "lon": 151.2}, {"lat": 64.1, "lon": -21.9}]
+
+
+def day_slices(day: datetime.datetime):
+    return [day + datetime.timedelta(hours=h) for h in range(24)]
+
+
+def test_moon_speed_has_no_parallax_swing():
+    service = AnalyticAstrologyService()
+    start = datetime.datetime(2024, 1, 1)
+    for offset in range(0, 60, 3):
+        times = day_slices(start + datetime.timedelta(days=offset))
+        for location in LOCATIONS:
+            speeds = service.tropical(times, location).speeds["Moon"]
+            assert MOON_SPEED_RANGE[0] < speeds.min() and speeds.max() < MOON_SPEED_RANGE[1]
+            # Within one day the speed changes smoothly, not by the diurnal parallax swing
+            assert np.ptp(speeds) < 0.5
+
@@ -0,0 +1,55 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from engine.feature_table import COLUMNS, FeatureTable, QueryError, write_year
+
+
+def rows_for(year):
+    rows = []
+    day = datetime.date(year, 1, 1)
+    while day.year == year:
+        row = {column: 0 for column in COLUMNS}
+        row.update(date=np.datetime64(day, "D"), jupiter_rashi=4 if day.month <= 6 else 5,
+                   yoga_gajakesari=day.day == 1, sav_aries=float(day.day))
+        rows.append(row)
+        day += datetime.timedelta(days=1)
+    return rows
+
+
+@pytest.fixture
+def table(tmp_path):
+    for year in (1990, 1991):
+        write_year(year, rows_for(year), str(tmp_path))
+    return FeatureTable(str(tmp_path))
+
+
+def test_query_spans_years(table):
+    result = table.query('yoga_gajakesari and jupiter_rashi == "Cancer"', limit=3)
+    assert result["count"] == 12
+    assert result["dates"] == ["1990-01-01", "1990-02-01", "1990-03-01"]
+    assert table.query("year == 1991 and month == 7 and day > 29")["dates"] == ["1991-07-30", "1991-07-31"]
+
+
+def test_row_index(table):
+    assert table.row_index(datetime.date(1991, 1, 2)) == 366
+    assert table.row_index(datetime.date(1992, 1, 1)) is None
+
+
+@pytest.mark.parametrize("expression", ["date > 5", "unknown_column == 1", "sav_aries", "__import__('os')"])
+def test_invalid_queries_raise_query_error(table, expression):
+    with pytest.raises(QueryError):
+        table.query(expression)
+
+
+def test_stale_years_are_skipped(tmp_path, monkeypatch):
+    write_year(1990, rows_for(1990), str(tmp_path))
+    monkeypatch.setattr("engine.feature_table.table_version", lambda: "older")
+    write_year(1991, rows_for(1991), str(tmp_path))
+    monkeypatch.undo()
+    table = FeatureTable(str(tmp_path))
+    assert table.years == [1990]
+    assert table.stale_years == [1991]
+    assert table.query("year == 1991")["count"] == 0
+    assert table.row_index(datetime.date(1991, 1, 2)) is None
@@ -0,0 +1,62 @@
+import numpy as np
+
+from astrology.interpolation import (boundary_distance, central_speeds, hermite, interpolate_longitudes,
+                                     node_indices)
+
+
+def test_node_indices_always_include_the_last_slice():
+    assert node_indices(10, 4).tolist() == [0, 4, 8, 9]
+    assert node_indices(9, 4).tolist() == [0, 4, 8]
+    assert node_indices(3, 0).tolist() == [0, 1, 2]
+
+
+def test_hermite_is_exact_for_a_cubic():
+    def f(t):
+        return 2 * t ** 3 - t ** 2 + 3 * t - 5
+
+    def df(t):
+        return 6 * t ** 2 - 2 * t + 3
+    nodes = np.array([0.0, 0.7, 2.0])
+    t = np.linspace(0, 2, 41)
+    assert np.allclose(hermite(nodes, f(nodes), df(nodes), nodes[:1]), f(nodes[:1]))
+    # One segment is exact for a cubic; the piecewise curve is exact everywhere
+    assert np.allclose(hermite(nodes, f(nodes), df(nodes), t), f(t))
+
+
+def test_boundary_distance():
+    assert np.allclose(boundary_distance(np.array([30.0, 31.0, 359.5, -0.25])), [0.0, 1.0, 0.5, 0.25], atol=1e-4)
+    # The pada boundary at 16.667 deg is closer than the kakshya one at 18.75
+    assert np.isclose(boundary_distance(np.array([17.0]))[0], 1 / 3, atol=1e-4)
+
+
+def test_central_speeds_unwrap_across_zero():
+    longitudes = np.array([358.0, 359.0, 0.0, 1.0])
+    days = np.array([0.0, 1.0, 2.0, 3.0])
+    assert np.allclose(central_speeds(longitudes, days), [1.0, 1.0])
+
+
+def test_interpolation_matches_direct_evaluation_away_from_boundaries():
+    days = np.linspace(0, 1, 97)
+    calls = []
+
+    def evaluate(indices):
+        calls.append(len(indices))
+        t = days[indices]
+        return (355 + 13.2 * t + 0.4 * np.sin(4 * t)) % 360, 13.2 + 1.6 * np.cos(4 * t)
+    direct, _ = evaluate(np.arange(len(days)))
+    calls.clear()
+
+    lon, evaluations = interpolate_longitudes(days, evaluate, 8, np.zeros(len(days)), 0.05)
+    assert evaluations == sum(calls) < len(days)
+    error = (lon - direct + 180) % 360 - 180
+    assert np.abs(error).max() < 1e-4
+    # Near a boundary the value is the direct one, not the interpolated one
+    near = boundary_distance(direct) < 0.05
+    assert near.any() and np.array_equal(lon[near], direct[near])
+
+
+def test_every_slice_a_node_is_direct():
+    days = np.linspace(0, 1, 5)
+    lon, evaluations = interpolate_longitudes(days, lambda i: (days[i] * 10 + 365, np.full(len(i), 10.0)), 1,
+                                              np.zeros(5), 0.05)
+    assert evaluations == 5 and np.allclose(lon, days * 10 + 5)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from astrology.analytic_service import AnalyticAstrologyService
+from engine.panchang import PanchangCalendar, karana_name, segments, tithi_name
+
+
+@pytest.fixture(scope="module")
+def calendar():
+    return PanchangCalendar(AnalyticAstrologyService())
+
+
+@pytest.fixture(scope="module")
+def year_2024(calendar):
+    return calendar.year(2024)
+
+
+def day(table, date):
+    i = table["date"].index(date)
+    return {column: values[i] for column, values in table.items()}
+
+
+@pytest.mark.parametrize("date, tithi, end", [
+    ("2024-01-25", 15, "2024-01-25T23:24"), # Full moon 17:54 UTC
+    ("2024-04-08", 30, "2024-04-08T23:51")  # New moon (total solar eclipse) 18:21 UTC
+])
+def test_purnima_and_amavasya_end_at_the_geocentric_syzygy(year_2024, date, tithi, end):
+    row = day(year_2024, date)
+    assert row["tithi"] == tithi
+    assert row["tithi_end"] == end
+
+
+def test_tithi_and_karana_names():
+    assert [tithi_name(t) for t in (1, 14, 15, 16, 30)] == [
+        "Pratipada Shukla", "Chaturdashi Shukla", "Purnima Shukla", "Pratipada Krishna", "Amavasya Krishna"]
+    assert [karana_name(k) for k in (1, 2, 8, 9, 57, 58, 60)] == [
+        "Kimstughna", "Bava", "Vishti", "Bava", "Vishti", "Shakuni", "Naga"]
+
+
+def test_segments_on_a_linear_angle():
+    hours = np.arange(0.0, 100.0)
+    # 5 deg/hour from 350: the 12 deg segments end at 360 (2 h), 372 (4.4 h), ...
+    current, ends = segments(hours, 350 + 5 * hours, 12.0, np.array([0.0, 1.0, 3.0, 99.0]))
+    assert current.tolist() == [30, 30, 1, 11]  # 845 deg is 125 deg into the third circle
+    assert np.allclose(ends[:3], [2.0, 2.0, 4.4], atol=1e-3)
+    assert np.isnan(ends[3])
+
+
+def test_month_slices_the_year(calendar, year_2024):
+    february = calendar.month(2024, 2)
+    assert len(february["date"]) == 29
+    assert february["date"][0] == "2024-02-01" and february["date"][-1] == "2024-02-29"
+    assert february["tithi"] == year_2024["tithi"][31:60]
+    assert day(year_2024, "2024-01-01")["vara"] == 1  # Monday
+
+
+def test_karana_is_a_half_of_the_tithi(year_2024):
+    for tithi, karana in zip(year_2024["tithi"], year_2024["karana"]):
+        assert karana in (2 * tithi - 1, 2 * tithi)
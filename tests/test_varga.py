@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from engine.varga import VARGA_NAMES, VARGA_TABLES, varga_label, varga_rashis
+
+
+def rashi(n, sign, degree):
+    """Divisional rashi (1-12) of `degree` within `sign` (1 = Aries)."""
+    return int(varga_rashis(np.array([(sign - 1) * 30 + degree]), [n])[n][0])
+
+
+@pytest.mark.parametrize("n, sign, degree, expected", [
+    (1, 5, 12.0, 5),
+    (2, 1, 10.0, 5), (2, 1, 20.0, 4), (2, 2, 10.0, 4),          # Hora: Sun then Moon in odd signs
+    (3, 1, 15.0, 5), (3, 1, 25.0, 9),                           # Drekkana: the trines
+    (4, 1, 10.0, 4), (4, 1, 25.0, 10),                          # Chaturthamsa: the kendras
+    (7, 2, 1.0, 8), (10, 2, 1.0, 10),                           # Even signs start from the 7th / 9th
+    (9, 1, 1.0, 1), (9, 1, 29.0, 9), (9, 2, 1.0, 10),           # Navamsa
+    (9, 3, 1.0, 7), (9, 4, 1.0, 4), (9, 5, 15.0, 5),            # Leo's 5th navamsa is vargottama
+    (12, 1, 29.0, 12),
+    (30, 1, 3.0, 1), (30, 1, 7.0, 11), (30, 1, 29.0, 7),        # Trimshamsa, odd sign
+    (30, 2, 3.0, 2), (30, 2, 27.0, 8),                          # Trimshamsa, even sign
+])
+def test_known_divisional_rashis(n, sign, degree, expected):
+    assert rashi(n, sign, degree) == expected
+
+
+def test_navamsa_boundaries_are_exact_to_the_arcsecond():
+    assert rashi(9, 1, 10 / 3 - 1 / 3600) == 1
+    assert rashi(9, 1, 10 / 3 + 1 / 3600) == 2
+
+
+def test_shape_and_wraparound_are_preserved():
+    longitudes = np.array([[-1.0, 361.0], [359.0, 0.0]])
+    result = varga_rashis(longitudes, [1, 9])
+    assert result[1].shape == (2, 2)
+    assert result[1].tolist() == [[12, 1], [12, 1]]
+    assert result[9].tolist() == [[12, 1], [12, 1]]
+
+
+def test_every_table_has_one_column_per_part():
+    for n, table in VARGA_TABLES.items():
+        assert table.shape == (12, n) and table.min() >= 0 and table.max() <= 11
+    assert varga_label(9) == "D9 Navamsa" and len(VARGA_NAMES) == 16
@@ -0,0 +1,95 @@
+import pytest
+
+from chart_factory import chart_entry
+from engine.analyzer import MatrixAnalyzer
+from engine.yoga_rules import YogaRuleError, YogaRules, default_rules, expand
+
+
+def holds(rule_name, *entries):
+    rules = default_rules()
+    i = [rule["name"] for rule in rules.rules].index(rule_name)
+    return rules.holds(list(entries))[i].tolist()
+
+
+def expression(when, *entries):
+    return YogaRules({"yogas": [{"name": "test", "when": when}], "sets": {"KENDRA": [1, 4, 7, 10]}}).holds(list(entries))[0].tolist()
+
+
+def test_catalogue_compiles_with_unique_names():
+    assert len(default_rules()) == 166
+
+
+def test_gajakesari_needs_jupiter_in_a_kendra_from_the_moon():
+    assert holds("Gajakesari Yoga", chart_entry(Moon=4, Jupiter=4),   # 1st
+                 chart_entry(Moon=4, Jupiter=7),                       # 4th
+                 chart_entry(Moon=4, Jupiter=1),                       # 10th
+                 chart_entry(Moon=4, Jupiter=5),                       # 2nd
+                 chart_entry(Moon=4, Jupiter=12)) == [True, True, True, False, False]
+
+
+def test_budhaditya_needs_sun_and_mercury_in_one_sign():
+    assert holds("Budhaditya Yoga", chart_entry(Sun=6, Mercury=6), chart_entry(Sun=6, Mercury=7)) == [True, False]
+
+
+def test_raja_yoga_joins_lords_of_an_angle_and_a_trine():
+    # Aries Lagna: Mars lords the 1st, the Sun (Leo) the 5th
+    name = "Raja Yoga (lords of 1 & 5)"
+    assert holds(name, chart_entry(lagna=1, Mars=3, Sun=3)) == [True]   # Conjunct
+    assert holds(name, chart_entry(lagna=1, Mars=1, Sun=7)) == [True]   # Mutual 7th aspect
+    assert holds(name, chart_entry(lagna=1, Mars=1, Sun=4)) == [False]  # Mars aspects the Sun (4th), not back
+    # Scorpio Lagna: Mars lords the 1st, Jupiter (Pisces) the 5th
+    assert holds(name, chart_entry(lagna=8, Mars=2, Jupiter=2)) == [True]
+    assert holds(name, chart_entry(lagna=8, Mars=2, Jupiter=3)) == [False]
+
+
+def test_house_from_counts_inclusively():
+    entry = chart_entry(Moon=4, Jupiter=4, Mars=10)
+    assert expression("house_from('Moon', 'Jupiter') == 1", entry) == [True]
+    assert expression("house_from('Moon', 'Mars') == 7", entry) == [True]
+    assert expression("house('Moon') == 4 and lord(4) == 'Moon'", entry) == [True]
+
+
+@pytest.mark.parametrize("body, houses", [("Sun", {7}), ("Mars", {4, 7, 8}), ("Jupiter", {5, 7, 9}), ("Saturn", {3, 7, 10})])
+def test_aspects_follow_graha_drishti(body, houses):
+    # Moon placed in every house counted from the body
+    entries = [chart_entry(**{body: 1, "Moon": house}) for house in range(1, 13)]
+    result = expression(f"aspects('{body}', 'Moon')", *entries)
+    assert {house for house, aspected in zip(range(1, 13), result) if aspected} == houses
+
+
+def test_each_expands_one_rule_per_value():
+    rules = expand({"name": "Test ({p})", "each": {"p": ["Sun", "Moon"]}, "when": "exalted('{p}')"})
+    assert rules == [{"name": "Test (Sun)", "when": "exalted('Sun')"}, {"name": "Test (Moon)", "when": "exalted('Moon')"}]
+
+
+@pytest.mark.parametrize("when", [
+    "__import__('os')",
+    "house('Mars').real",
+    "house('Mars') * 2",
+    "lambda: 1",
+    "[x for x in KENDRA]",
+    "house(Mars) == 1",
+    "house('Mars', 'Moon') == 1",
+    "house('Pluto') == 1",
+    "open('x') == 1",
+    "house('Mars') is 1"
+])
+def test_non_whitelisted_expressions_are_rejected(when):
+    with pytest.raises(YogaRuleError):
+        YogaRules({"yogas": [{"name": "bad", "when": when}]})
+
+
+def test_duplicate_names_are_rejected():
+    with pytest.raises(YogaRuleError):
+        YogaRules({"yogas": [{"name": "x", "when": "conjunct('Sun', 'Moon')"}] * 2})
+
+
+def test_universal_and_partial_yogas_are_split_by_fraction():
+    entries = [chart_entry(Sun=6, Mercury=6, Moon=4, Jupiter=7, index=0),
+               chart_entry(Sun=6, Mercury=6, Moon=4, Jupiter=5, index=1)]
+    sections = MatrixAnalyzer().analysis_graph(matrix=entries).evaluate(["yogas", "yoga_probabilities"])
+    universal = {yoga["name"]: yoga["fraction"] for yoga in sections["yogas"]}
+    partial = {yoga["name"]: yoga["fraction"] for yoga in sections["yoga_probabilities"]}
+    assert universal["Budhaditya Yoga"] == 1.0
+    assert partial["Gajakesari Yoga"] == 0.5
+    assert "Gajakesari Yoga" not in universal
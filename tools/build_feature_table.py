@@ -0,0 +1,75 @@
+"""
+Builds the per-date feature table queried by tools/query_features.py and
+/api/v1/dates.
+
+    ASTRO_SERVICE=skyfield python tools/build_feature_table.py --start-year 1900 --end-year 2100 --workers 8
+
+One job per year runs the full matrix + analysis for every date and writes
+that year's columns under FEATURE_TABLE_DIR. Incremental: years already
+built with the current table version (ENGINE_VERSION, service, ayanamsa,
+node type) are skipped, so bumping ENGINE_VERSION or switching backends
+rebuilds exactly the stale years. --force rebuilds everything.
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, 'astro_probability_engine'))
+
+from config import FEATURE_TABLE_DIR
+from engine.feature_table import date_features, table_version, write_year, year_meta
+
+_pipeline = None
+
+
+def _init_worker():
+    global _pipeline
+    from astrology.factory import create_service
+    from engine.generator import MatrixGenerator
+    from engine.analyzer import MatrixAnalyzer
+    _pipeline = (MatrixGenerator(create_service()), MatrixAnalyzer())
+
+
+def build_year(year: int, directory: str) -> float:
+    generator, analyzer = _pipeline
+    start = time.perf_counter()
+    day = datetime.date(year, 1, 1)
+    rows = []
+    while day.year == year:
+        matrix = generator.generate_matrix(day)
+        rows.append(date_features(day, analyzer.build_analysis_results(matrix), matrix))
+        day += datetime.timedelta(days=1)
+    write_year(year, rows, directory)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start-year", type=int, default=1900)
+    parser.add_argument("--end-year", type=int, default=2100, help="Inclusive")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--dir", default=FEATURE_TABLE_DIR)
+    parser.add_argument("--force", action="store_true", help="Rebuild years that are up to date")
+    args = parser.parse_args()
+
+    version = table_version()
+    years = [year for year in range(args.start_year, args.end_year + 1)
+             if args.force or (year_meta(year, args.dir) or {}).get("version") != version]
+    print(f"Table version {version}: {len(years)} year(s) to build in {args.dir}")
+    if not years:
+        return
+
+    os.makedirs(args.dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(build_year, year, args.dir): year for year in years}
+        for done, future in enumerate(as_completed(futures), start=1):
+            print(f"[{done}/{len(years)}] {futures[future]} built in {future.result():.1f}s")
+
+
+if __name__ == "__main__":
+    main()
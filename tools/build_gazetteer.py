@@ -0,0 +1,85 @@
+"""
+Builds the birthplace gazetteer (data/cities.tsv) from a GeoNames dump.
+
+    curl -O https://download.geonames.org/export/dump/cities15000.zip && unzip cities15000.zip
+    curl -O https://download.geonames.org/export/dump/admin1CodesASCII.txt
+    python tools/build_gazetteer.py cities15000.txt --admin1 admin1CodesASCII.txt --min-population 15000
+
+Keeps populated places (feature class P) at or above --min-population,
+optionally only --countries, and writes the columns engine/gazetteer.py
+reads. Alternate names are limited to Latin-script variants, which is
+what the autocomplete normalizes to anyway.
+"""
+import argparse
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, 'astro_probability_engine'))
+
+from config import GAZETTEER_PATH
+from engine.gazetteer import COLUMNS, Gazetteer, normalize
+
+MAX_ALTERNATE_NAMES = 8
+
+
+def read_admin1(path: str) -> dict:
+    """"IN.16" -> "Maharashtra" (admin1CodesASCII.txt)."""
+    names = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            code, name, *_ = line.rstrip("\n").split("\t")
+            names[code] = name
+    return names
+
+
+def read_cities(path: str, admin1: dict, min_population: int, countries: set) -> list:
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            name, asciiname, alternates = fields[1], fields[2], fields[3]
+            feature_class, country, admin1_code = fields[6], fields[8], fields[10]
+            population, timezone = int(fields[14] or 0), fields[17]
+            if feature_class != "P" or population < min_population or (countries and country not in countries):
+                continue
+            keys = {normalize(name), normalize(asciiname)}
+            latin = []
+            for alternate in alternates.split(","):
+                key = normalize(alternate)
+                # Other scripts normalize to nothing; skip them and duplicate spellings
+                if key and key not in keys and len(latin) < MAX_ALTERNATE_NAMES:
+                    keys.add(key)
+                    latin.append(alternate)
+            rows.append([name, asciiname, ",".join(latin), country, admin1.get(f"{country}.{admin1_code}", ""),
+                         fields[4], fields[5], str(population), timezone])
+    rows.sort(key=lambda row: -int(row[7]))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cities", help="GeoNames cities dump (cities500/1000/5000/15000.txt)")
+    parser.add_argument("--admin1", help="GeoNames admin1CodesASCII.txt, for state/province names")
+    parser.add_argument("--min-population", type=int, default=15000)
+    parser.add_argument("--countries", default="", help="Comma-separated ISO codes, e.g. IN,NP,LK (default: all)")
+    parser.add_argument("--output", default=GAZETTEER_PATH)
+    args = parser.parse_args()
+
+    admin1 = read_admin1(args.admin1) if args.admin1 else {}
+    countries = {code.strip().upper() for code in args.countries.split(",") if code.strip()}
+    rows = read_cities(args.cities, admin1, args.min_population, countries)
+
+    tmp_path = f"{args.output}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("# " + "\t".join(COLUMNS) + "\n")
+        for row in rows:
+            f.write("\t".join(field.replace("\t", " ") for field in row) + "\n")
+    gazetteer = Gazetteer.load(tmp_path)  # Fails here, not in the app, if a row is malformed
+    os.replace(tmp_path, args.output)
+    print(f"Wrote {args.output} ({len(gazetteer)} places, {len(gazetteer.keys)} names)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Builds the population percentile lookup used by the analyzer.
+
+    python tools/build_percentiles.py --start-year 1900 --end-year 2100 --workers 8
+
+Map: one job per year runs the matrix + analysis for every date and
+histograms its fixed SAV, Shodhita and planetary-strength values (see
+engine/percentiles.py); each year's partial is saved under PERCENTILE_DIR.
+Reduce: the partials of the requested range are summed into
+PERCENTILE_PATH. Years whose partial is current are not recomputed, so
+extending the range only maps the new years.
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, 'astro_probability_engine'))
+
+from config import PERCENTILE_DIR, PERCENTILE_PATH
+from engine.feature_table import table_version
+from engine.percentiles import PercentileTable, add_values, date_values, empty_histograms, load_partial, merge, save_partial
+
+_pipeline = None
+
+
+def _init_worker():
+    global _pipeline
+    from astrology.factory import create_service
+    from engine.generator import MatrixGenerator
+    from engine.analyzer import MatrixAnalyzer
+    _pipeline = (MatrixGenerator(create_service()), MatrixAnalyzer())
+
+
+def map_year(year: int, directory: str) -> float:
+    generator, analyzer = _pipeline
+    start = time.perf_counter()
+    histograms = empty_histograms()
+    day = datetime.date(year, 1, 1)
+    while day.year == year:
+        add_values(histograms, date_values(analyzer.build_analysis_results(generator.generate_matrix(day))))
+        day += datetime.timedelta(days=1)
+    save_partial(year, histograms, directory)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start-year", type=int, default=1900)
+    parser.add_argument("--end-year", type=int, default=2100, help="Inclusive")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--dir", default=PERCENTILE_DIR, help="Yearly partials")
+    parser.add_argument("--output", default=PERCENTILE_PATH)
+    args = parser.parse_args()
+
+    years = range(args.start_year, args.end_year + 1)
+    missing = [year for year in years if load_partial(year, args.dir) is None]
+    print(f"Table version {table_version()}: {len(missing)} of {len(years)} year(s) to map")
+    if missing:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+            futures = {pool.submit(map_year, year, args.dir): year for year in missing}
+            for done, future in enumerate(as_completed(futures), start=1):
+                print(f"[{done}/{len(missing)}] {futures[future]} mapped in {future.result():.1f}s")
+
+    table = PercentileTable.from_histograms(merge(load_partial(year, args.dir) for year in years),
+                                            args.start_year, args.end_year)
+    table.save(args.output)
+    print(f"Wrote {args.output} ({int(table.cumulative['fixed_sav'][-1])} rashi scores)")
+
+
+if __name__ == "__main__":
+    main()
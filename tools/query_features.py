@@ -0,0 +1,63 @@
+"""
+Queries the per-date feature table (see tools/build_feature_table.py).
+
+    python tools/query_features.py 'yoga_gajakesari and jupiter_rashi == "Cancer" and sav_aries > 30 and 1960 <= year <= 2010'
+
+Predicates combine columns with and/or/not, comparisons (chains like
+1960 <= year <= 2010 allowed) and `in` lists. Rashi names stand for their
+ids. --columns lists what can be queried.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, 'astro_probability_engine'))
+
+from config import FEATURE_TABLE_DIR
+from engine.feature_table import COLUMNS, DERIVED_COLUMNS, FeatureTable, QueryError
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("query", nargs="?")
+    parser.add_argument("--dir", default=FEATURE_TABLE_DIR)
+    parser.add_argument("--limit", type=int, help="Print at most this many dates")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    parser.add_argument("--columns", action="store_true", help="List the queryable columns")
+    args = parser.parse_args()
+
+    if args.columns:
+        for column, dtype in COLUMNS.items():
+            print(f"{column}\t{dtype}")
+        for column in DERIVED_COLUMNS:
+            print(f"{column}\tint (from date)")
+        return
+    if not args.query:
+        parser.error("a query is required")
+
+    table = FeatureTable(args.dir)
+    if table.stale_years:
+        print(f"Warning: skipping {len(table.stale_years)} year(s) built with an older table version", file=sys.stderr)
+    if not table.years:
+        sys.exit(f"No current feature table in {args.dir}; run tools/build_feature_table.py first")
+
+    start = time.perf_counter()
+    try:
+        result = table.query(args.query, args.limit)
+    except QueryError as e:
+        sys.exit(f"Query error: {e}")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps(dict(result, elapsed_ms=round(elapsed_ms, 2))))
+        return
+    print("\n".join(result["dates"]))
+    print(f"{result['count']} matching date(s) of {len(table)} in {elapsed_ms:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Validates the analytic ephemeris against SkyfieldAstrologyService (DE421).
+
+    python tools/validate_ephemeris.py --start 1925-01-01 --end 2025-01-01 --step-days 7
+
+Samples one chart every --step-days (at a seeded random UTC time, cycling
+through the anchor locations) and reports, per body and for the Lagna, the
+maximum and mean longitude error and how many charts put it in a different
+rashi or nakshatra. Also times both engines. With --max-error the run exits
+with status 1 when any body exceeds that error in degrees.
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, 'astro_probability_engine'))
+
+from config import ANCHOR_LOCATIONS, PLANETS
+from astrology.analytic_ephemeris import tropical_longitudes
+from astrology.analytic_service import AnalyticAstrologyService
+from astrology.real_service import SkyfieldAstrologyService
+
+
+def sample_times(start: datetime.date, end: datetime.date, step_days: int, seed: int):
+    rng = random.Random(seed)
+    day = datetime.datetime.combine(start, datetime.time())
+    stop = datetime.datetime.combine(end, datetime.time())
+    while day < stop:
+        yield day + datetime.timedelta(seconds=rng.randrange(86400))
+        day += datetime.timedelta(days=step_days)
+
+
+def angular_error(a: float, b: float) -> float:
+    return abs((a - b + 180) % 360 - 180)
+
+
+def compare(times, reference, candidate) -> dict:
+    bodies = PLANETS + ["Lagna"]
+    stats = {b: {"max_error_deg": 0.0, "sum_error": 0.0, "rashi_mismatches": 0,
+                 "nakshatra_mismatches": 0, "worst_at": None} for b in bodies}
+
+    for i, dt in enumerate(times):
+        location = ANCHOR_LOCATIONS[i % len(ANCHOR_LOCATIONS)]
+        ref = reference.calculate_chart(dt, location)
+        cand = candidate.calculate_chart(dt, location)
+        for body in bodies:
+            if body == "Lagna":
+                ref_lon, cand_lon = ref.ascendant, cand.ascendant
+                ref_rashi, cand_rashi = ref.houses[1].rashi_id, cand.houses[1].rashi_id
+                ref_nak, cand_nak = int(ref_lon / (360 / 27)), int(cand_lon / (360 / 27))
+            else:
+                rp, cp = ref.planets[body], cand.planets[body]
+                ref_lon, cand_lon = rp.longitude, cp.longitude
+                ref_rashi, cand_rashi = rp.rashi, cp.rashi
+                ref_nak, cand_nak = rp.nakshatra, cp.nakshatra
+            err = angular_error(ref_lon, cand_lon)
+            s = stats[body]
+            s["sum_error"] += err
+            if err > s["max_error_deg"]:
+                s["max_error_deg"] = err
+                s["worst_at"] = f"{dt.isoformat()} {location['name']}"
+            s["rashi_mismatches"] += ref_rashi != cand_rashi
+            s["nakshatra_mismatches"] += ref_nak != cand_nak
+
+    for s in stats.values():
+        s["mean_error_deg"] = s.pop("sum_error") / len(times)
+    return stats
+
+
+def time_engines(times, reference, candidate) -> dict:
+    location = ANCHOR_LOCATIONS[0]
+    subset = times[:200]
+    start = time.perf_counter()
+    for dt in subset:
+        reference.calculate_chart(dt, location)
+    skyfield_ms = (time.perf_counter() - start) * 1000 / len(subset)
+
+    start = time.perf_counter()
+    for dt in subset:
+        candidate.calculate_chart(dt, location)
+    analytic_ms = (time.perf_counter() - start) * 1000 / len(subset)
+
+    stamps = np.array([dt.replace(tzinfo=datetime.timezone.utc).timestamp() for dt in times])
+    start = time.perf_counter()
+    tropical_longitudes(stamps, location['lat'], location['lon'])
+    vector_us = (time.perf_counter() - start) * 1e6 / len(stamps)
+
+    return {
+        "skyfield_chart_ms": round(skyfield_ms, 3),
+        "analytic_chart_ms": round(analytic_ms, 3),
+        "analytic_vectorized_us_per_time": round(vector_us, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=datetime.date.fromisoformat, default=datetime.date(1925, 1, 1))
+    parser.add_argument("--end", type=datetime.date.fromisoformat, default=datetime.date(2025, 1, 1))
+    parser.add_argument("--step-days", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-error", type=float, help="Fail when any body's error exceeds this (deg)")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    times = list(sample_times(args.start, args.end, args.step_days, args.seed))
+    reference = SkyfieldAstrologyService()
+    candidate = AnalyticAstrologyService()
+    print(f"Comparing {len(times)} charts, {args.start} to {args.end}...")
+
+    stats = compare(times, reference, candidate)
+    timing = time_engines(times, reference, candidate)
+
+    print(f"\n{'body':<9} {'max err':>9} {'mean err':>9} {'rashi':>7} {'naksh.':>7}  worst at")
+    for body, s in stats.items():
+        print(f"{body:<9} {s['max_error_deg']:>9.4f} {s['mean_error_deg']:>9.4f} "
+              f"{s['rashi_mismatches']:>7} {s['nakshatra_mismatches']:>7}  {s['worst_at']}")
+    print(f"\nSkyfield: {timing['skyfield_chart_ms']} ms/chart   Analytic: {timing['analytic_chart_ms']} ms/chart, "
+          f"{timing['analytic_vectorized_us_per_time']} us/time vectorized")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"charts": len(times), "bodies": stats, "timing": timing}, f, indent=2)
+
+    if args.max_error is not None:
+        worst = max(s["max_error_deg"] for body, s in stats.items() if body != "Lagna")
+        if worst > args.max_error:
+            print(f"\nFAILED: maximum error {worst:.4f} deg exceeds {args.max_error} deg")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -26,7 +26,7 @@ try:
     dob = datetime.date(1990, 1, 1)
     matrix = generator.generate_matrix(dob)
     print("Matrix generation successful.")
-    print(f"Matrix keys: {list(matrix.keys())}")
+    print(f"Matrix entries: {len(matrix)}")
 
 except Exception as e:
     print(f"Verification FAILED: {e}")